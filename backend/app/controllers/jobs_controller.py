@@ -0,0 +1,177 @@
+from app.schemas.api_response import APIResponse
+from app.schemas.monte_carlo_request import BacktestMonteCarloRequest
+from app.schemas.portfolio_request import (
+    BacktestRequest,
+    PortfolioMonteCarloRequest,
+    PortfolioSweepRequest,
+    PortfolioWalkForwardRequest,
+)
+from app.schemas.probability_request import BacktestProbabilityRequest
+from app.services.backtest_service import (
+    calculate_portfolio_backtest,
+    calculate_portfolio_sweep,
+    calculate_portfolio_walk_forward,
+)
+from app.services.monte_carlo_service import (
+    calculate_monte_carlo,
+    calculate_portfolio_monte_carlo,
+)
+from app.services.probability_service import calculate_probability
+from app.core.jobs import DONE, FAILED, job_manager
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/jobs")
+
+
+def accepted(job: dict) -> JSONResponse:
+    response = APIResponse(success=True, message=f"Job {job['status']}", data=job)
+    return JSONResponse(status_code=202, content=response.model_dump())
+
+
+async def find_job(job_id: str) -> dict:
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+# 작업 이름은 결과 캐시 namespace 와 같게 두어, 동기 엔드포인트가 계산한 결과를 함께 씁니다
+@router.post("/backtest/portfolio", status_code=202)
+async def submit_portfolio_backtest(request: BacktestRequest):
+    job = await job_manager.submit(
+        "portfolio",
+        request,
+        calculate_portfolio_backtest,
+        symbols=list(request.assets.keys()),
+        weights=request.assets,
+        initial_balance=request.initial_balance,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        rebalance_period=request.rebalance_period,
+        rebalance=request.rebalance,
+        fee_rate=request.fee_rate,
+        slippage=request.slippage,
+    )
+    return accepted(job)
+
+
+@router.post("/backtest/portfolio/sweep", status_code=202)
+async def submit_portfolio_sweep(request: PortfolioSweepRequest):
+    job = await job_manager.submit(
+        "portfolio-sweep",
+        request,
+        calculate_portfolio_sweep,
+        initial_balance=request.initial_balance,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        combinations=[c.model_dump() for c in request.combinations],
+        top_n=request.top_n,
+    )
+    return accepted(job)
+
+
+@router.post("/backtest/portfolio/walk-forward", status_code=202)
+async def submit_portfolio_walk_forward(request: PortfolioWalkForwardRequest):
+    job = await job_manager.submit(
+        "portfolio-walk-forward",
+        request,
+        calculate_portfolio_walk_forward,
+        symbols=list(request.assets.keys()),
+        weights=request.assets,
+        initial_balance=request.initial_balance,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        rebalance_period=request.rebalance_period,
+        rebalance=request.rebalance,
+        fee_rate=request.fee_rate,
+        slippage=request.slippage,
+        window=request.window,
+        step=request.step,
+    )
+    return accepted(job)
+
+
+@router.post("/backtest/probability", status_code=202)
+async def submit_probability(request: BacktestProbabilityRequest):
+    job = await job_manager.submit(
+        "probability",
+        request,
+        calculate_probability,
+        symbol=request.symbol,
+        timeframe=request.timeframe,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        initial_balance=request.initial_balance,
+        target_return=request.target_return,
+    )
+    return accepted(job)
+
+
+@router.post("/backtest/monte-carlo", status_code=202)
+async def submit_monte_carlo(request: BacktestMonteCarloRequest):
+    job = await job_manager.submit(
+        "monte-carlo",
+        request,
+        calculate_monte_carlo,
+        symbol=request.symbol,
+        timeframe=request.timeframe,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        target_return=request.target_return,
+        days=request.days,
+        simulations=request.simulations,
+        antithetic=request.antithetic,
+        control_variate=request.control_variate,
+        sampling=request.sampling,
+        confidence_level=request.confidence_level,
+        method=request.method,
+        block_size=request.block_size,
+        seed=request.seed,
+    )
+    return accepted(job)
+
+
+@router.post("/backtest/portfolio/monte-carlo", status_code=202)
+async def submit_portfolio_monte_carlo(request: PortfolioMonteCarloRequest):
+    job = await job_manager.submit(
+        "portfolio-monte-carlo",
+        request,
+        calculate_portfolio_monte_carlo,
+        symbols=list(request.assets.keys()),
+        weights=request.assets,
+        initial_balance=request.initial_balance,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        rebalance_period=request.rebalance_period,
+        rebalance=request.rebalance,
+        fee_rate=request.fee_rate,
+        slippage=request.slippage,
+        target_return=request.target_return,
+        days=request.days,
+        simulations=request.simulations,
+        confidence_level=request.confidence_level,
+        seed=request.seed,
+    )
+    return accepted(job)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    job = await find_job(job_id)
+    return APIResponse(success=True, message=f"Job {job['status']}", data=job)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await find_job(job_id)
+    if job["status"] == FAILED:
+        error = job["error"]
+        raise HTTPException(status_code=error["status_code"], detail=error["detail"])
+    if job["status"] != DONE:
+        return accepted(job)
+
+    result = await job_manager.get_result(job_id)
+    if result is None:
+        raise HTTPException(status_code=410, detail="Job result has expired")
+    return APIResponse(success=True, message="Job done", data=result)
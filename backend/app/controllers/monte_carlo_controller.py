@@ -1,20 +1,34 @@
 from app.schemas.api_response import APIResponse
 from app.schemas.monte_carlo_request import BacktestMonteCarloRequest
 from app.services.monte_carlo_service import calculate_monte_carlo
+from app.core.cache import result_cache
+from app.core.executor import executor
 from fastapi import APIRouter
 
 router = APIRouter(prefix="/backtest")
 
 @router.post("/monte-carlo")
 async def get_monte_carlo(request: BacktestMonteCarloRequest):
-        data = calculate_monte_carlo(
-            symbol=request.symbol,
-            timeframe=request.timeframe,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            target_return=request.target_return,
-            days=request.days,
-            simulations=request.simulations
+        data = await result_cache.get_or_compute(
+            "monte-carlo",
+            request,
+            lambda: executor.run_cpu(
+                calculate_monte_carlo,
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                target_return=request.target_return,
+                days=request.days,
+                simulations=request.simulations,
+                antithetic=request.antithetic,
+                control_variate=request.control_variate,
+                sampling=request.sampling,
+                confidence_level=request.confidence_level,
+                method=request.method,
+                block_size=request.block_size,
+                seed=request.seed,
+            ),
         )
         return APIResponse(
             success=True,
@@ -1,16 +1,32 @@
-from app.schemas.portfolio_request import BacktestRequest
+from app.schemas.portfolio_request import (
+    BacktestRequest,
+    PortfolioMonteCarloRequest,
+    PortfolioSweepRequest,
+    PortfolioWalkForwardRequest,
+)
 from app.services.backtest_service import (
     calculate_portfolio_backtest,
+    calculate_portfolio_sweep,
+    calculate_portfolio_walk_forward,
+    run_portfolio_backtest as run_backtest,
 )
+from app.services.monte_carlo_service import calculate_portfolio_monte_carlo
 from app.schemas.api_response import APIResponse
-from fastapi import APIRouter
+from app.core.cache import result_cache
+from app.core.executor import executor
+from app.core.encoding import encoded, negotiate
+from app.core.streaming import NDJSON_MEDIA_TYPE, ndjson_response
+from fastapi import APIRouter, Header, Response
+from typing import Optional
 
 router = APIRouter(prefix="/backtest")
 
 
 @router.post("/portfolio")
-async def run_portfolio_backtest(request: BacktestRequest):
-    data = calculate_portfolio_backtest(
+async def run_portfolio_backtest(
+    request: BacktestRequest, accept: Optional[str] = Header(None)
+):
+    params = dict(
         symbols=list(request.assets.keys()),
         weights=request.assets,
         initial_balance=request.initial_balance,
@@ -22,6 +38,110 @@ async def run_portfolio_backtest(request: BacktestRequest):
         slippage=request.slippage,
     )
 
+    message = "Calculated Portfolio Backtest Result"
+    media_type = negotiate(accept)
+
+    # Accept: application/x-ndjson 이면 요약 지표 후 히스토리를 나눠 스트리밍합니다
+    if media_type == NDJSON_MEDIA_TYPE:
+        summary, history = await executor.run_cpu(run_backtest, **params)
+        return ndjson_response(summary, {"portfolio_value_history": history})
+
+    # 열 형식 JSON / MessagePack / Arrow 는 워커에서 인코딩한 본문을 그대로 캐시합니다
+    if media_type is not None:
+        body = await result_cache.get_or_compute_raw(
+            f"portfolio:{media_type}",
+            request,
+            lambda: executor.run_cpu(
+                encoded(media_type, message, run_backtest, ("portfolio_value_history",)), **params
+            ),
+        )
+        return Response(body, media_type=media_type, headers={"Vary": "Accept"})
+
+    data = await result_cache.get_or_compute(
+        "portfolio",
+        request,
+        lambda: executor.run_cpu(calculate_portfolio_backtest, **params),
+    )
+
+    return APIResponse(success=True, message=message, data=data)
+
+
+@router.post("/portfolio/sweep")
+async def run_portfolio_sweep(request: PortfolioSweepRequest):
+    data = await result_cache.get_or_compute(
+        "portfolio-sweep",
+        request,
+        lambda: executor.run_cpu(
+            calculate_portfolio_sweep,
+            initial_balance=request.initial_balance,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            combinations=[c.model_dump() for c in request.combinations],
+            top_n=request.top_n,
+        ),
+    )
+
     return APIResponse(
-        success=True, message="Calculated Portfolio Backtest Result", data=data
-    )
\ No newline at end of file
+        success=True,
+        message=f"Calculated {len(request.combinations)} Portfolio Backtests",
+        data=data,
+    )
+
+
+@router.post("/portfolio/walk-forward")
+async def run_portfolio_walk_forward(request: PortfolioWalkForwardRequest):
+    data = await result_cache.get_or_compute(
+        "portfolio-walk-forward",
+        request,
+        lambda: executor.run_cpu(
+            calculate_portfolio_walk_forward,
+            symbols=list(request.assets.keys()),
+            weights=request.assets,
+            initial_balance=request.initial_balance,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalance_period=request.rebalance_period,
+            rebalance=request.rebalance,
+            fee_rate=request.fee_rate,
+            slippage=request.slippage,
+            window=request.window,
+            step=request.step,
+        ),
+    )
+
+    return APIResponse(
+        success=True,
+        message=f"Calculated {data['count']} Walk-Forward Portfolio Backtests",
+        data=data,
+    )
+
+
+@router.post("/portfolio/monte-carlo")
+async def run_portfolio_monte_carlo(request: PortfolioMonteCarloRequest):
+    data = await result_cache.get_or_compute(
+        "portfolio-monte-carlo",
+        request,
+        lambda: executor.run_cpu(
+            calculate_portfolio_monte_carlo,
+            symbols=list(request.assets.keys()),
+            weights=request.assets,
+            initial_balance=request.initial_balance,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalance_period=request.rebalance_period,
+            rebalance=request.rebalance,
+            fee_rate=request.fee_rate,
+            slippage=request.slippage,
+            target_return=request.target_return,
+            days=request.days,
+            simulations=request.simulations,
+            confidence_level=request.confidence_level,
+            seed=request.seed,
+        ),
+    )
+
+    return APIResponse(
+        success=True,
+        message=f"Calculated Portfolio Monte Carlo Simulation Result for {request.days} days",
+        data=data,
+    )
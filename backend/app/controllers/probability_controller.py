@@ -1,13 +1,20 @@
 from app.schemas.probability_request import BacktestProbabilityRequest
-from app.services.probability_service import calculate_probability
+from app.services.probability_service import calculate_probability, run_probability
 from app.schemas.api_response import APIResponse
-from fastapi import APIRouter
+from app.core.cache import result_cache
+from app.core.executor import executor
+from app.core.encoding import encoded, negotiate
+from app.core.streaming import NDJSON_MEDIA_TYPE, ndjson_response
+from fastapi import APIRouter, Header, Response
+from typing import Optional
 
 router = APIRouter(prefix="/backtest")
 
 @router.post("/probability")
-async def get_probability(request: BacktestProbabilityRequest):
-    data = calculate_probability(
+async def get_probability(
+    request: BacktestProbabilityRequest, accept: Optional[str] = Header(None)
+):
+    params = dict(
         symbol=request.symbol,
         timeframe=request.timeframe,
         start_date=request.start_date,
@@ -15,4 +22,31 @@ async def get_probability(request: BacktestProbabilityRequest):
         initial_balance=request.initial_balance,
         target_return=request.target_return
     )
-    return APIResponse(success=True, message="Calculated Probability Result", data=data)
\ No newline at end of file
+
+    message = "Calculated Probability Result"
+    media_type = negotiate(accept)
+
+    # Accept: application/x-ndjson 이면 요약 지표 후 히스토리를 나눠 스트리밍합니다
+    if media_type == NDJSON_MEDIA_TYPE:
+        summary, daily_returns, value_history = await executor.run_cpu(run_probability, **params)
+        return ndjson_response(
+            summary, {"daily_returns": daily_returns, "value_history": value_history}
+        )
+
+    # 열 형식 JSON / MessagePack / Arrow 는 워커에서 인코딩한 본문을 그대로 캐시합니다
+    if media_type is not None:
+        body = await result_cache.get_or_compute_raw(
+            f"probability:{media_type}",
+            request,
+            lambda: executor.run_cpu(
+                encoded(media_type, message, run_probability, ("daily_returns", "value_history")), **params
+            ),
+        )
+        return Response(body, media_type=media_type, headers={"Vary": "Accept"})
+
+    data = await result_cache.get_or_compute(
+        "probability",
+        request,
+        lambda: executor.run_cpu(calculate_probability, **params),
+    )
+    return APIResponse(success=True, message=message, data=data)
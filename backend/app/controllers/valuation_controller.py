@@ -1,14 +1,57 @@
+import asyncio
+
 from app.schemas.api_response import APIResponse
 from app.services.valuation_service import valuate_coin
-from app.schemas.valuation_request import ValuationRequest
-from fastapi import APIRouter
+from app.schemas.valuation_request import ValuationBatchRequest, ValuationRequest
+from app.core.cache import result_cache
+from app.core.config import settings
+from fastapi import APIRouter, HTTPException
 
 router = APIRouter(prefix="/valuation")
 
+
+async def _valuate_cached(coin_id: str, request: ValuationRequest):
+    return await result_cache.get_or_compute(
+        "valuation",
+        {"coin_id": coin_id, **request.model_dump()},
+        lambda: valuate_coin(coin_id, request),
+    )
+
+
+# /{coin_id} 보다 먼저 등록해야 "batch" 가 코인 ID 로 해석되지 않습니다
+@router.post("/batch")
+async def run_valuation_batch(request: ValuationBatchRequest):
+    """여러 코인을 한 번에 평가합니다. 코인별 결과는 요청 순서대로, 실패한 코인은 오류와 함께 돌려줍니다."""
+    semaphore = asyncio.Semaphore(settings.VALUATION_BATCH_CONCURRENCY)
+
+    async def valuate(item):
+        async with semaphore:
+            try:
+                data = await _valuate_cached(
+                    item.coin_id, ValuationRequest(**item.model_dump(exclude={"coin_id"}))
+                )
+            except HTTPException as e:
+                return {
+                    "coin_id": item.coin_id,
+                    "success": False,
+                    "error": {"status_code": e.status_code, "detail": e.detail},
+                }
+            return {"coin_id": item.coin_id, "success": True, "data": data}
+
+    results = await asyncio.gather(*(valuate(item) for item in request.coins))
+    succeeded = sum(result["success"] for result in results)
+
+    return APIResponse(
+        success=succeeded > 0,
+        message=f"valuation done for {succeeded}/{len(results)} coins",
+        data=results,
+    )
+
+
 @router.post("/{coin_id}")
 async def run_valuation_coin(coin_id: str, request: ValuationRequest):
-    data = valuate_coin(coin_id, request)
+    data = await _valuate_cached(coin_id, request)
 
     return APIResponse(
         success=True, message="valuation done", data=data
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import numpy as np
+import redis
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger()
+
+
+def json_default(value):
+    # 서비스 결과에 섞여 있는 NumPy 스칼라/배열을 JSON 으로 변환
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def make_cache_key(namespace: str, payload: Any) -> str:
+    """검증된 요청을 정렬된 JSON 으로 정규화한 뒤 해시해 캐시 키를 만듭니다."""
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json")
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{settings.app_name}:cache:{namespace}:{digest}"
+
+
+class LocalLRUCache:
+    """Redis 에 연결할 수 없을 때 사용하는 프로세스 내 LRU 캐시.
+
+    항목 수가 아니라 저장된 바이트 합계가 max_bytes 를 넘지 않도록 오래된 항목부터 제거합니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                self._pop(key)
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int) -> bool:
+        if len(value) > self.max_bytes:
+            return False
+        with self._lock:
+            self._pop(key)
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._size -= len(evicted)
+        return True
+
+    def add(self, key: str, value: bytes, ttl: int) -> bool:
+        """키가 없을 때만 저장합니다 (Redis SET NX)."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] >= time.monotonic():
+                return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size -= len(item[1])
+
+
+class ResultCache:
+    """요청 해시를 키로 계산 결과를 저장하는 캐시 (Redis 우선, 장애 시 프로세스 내 LRU)."""
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._client = client
+        self.local = LocalLRUCache(settings.CACHE_LOCAL_MAX_BYTES)
+        self._redis_down_until = 0.0
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+                socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.CACHE_SOCKET_TIMEOUT,
+            )
+        return self._client
+
+    @client.setter
+    def client(self, client: redis.Redis) -> None:
+        self._client = client
+        self._redis_down_until = 0.0
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        # 장애 중에는 매 요청마다 연결 타임아웃을 기다리지 않도록 잠시 Redis 를 건너뜁니다
+        logger.warning(f"Redis unavailable, using local cache: {error}")
+        self._redis_down_until = time.monotonic() + settings.CACHE_REDIS_RETRY_SECONDS
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        if self._redis_available():
+            try:
+                return self.client.get(key)
+            except redis.RedisError as e:
+                self._mark_redis_down(e)
+        return self.local.get(key)
+
+    def set_raw(
+        self,
+        key: str,
+        value: bytes,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> bool:
+        """값을 저장하고 실제로 저장했는지 반환합니다."""
+        ttl = ttl or settings.CACHE_TTL
+        # 너무 큰 결과는 캐시 메모리를 독점하지 않도록 저장하지 않습니다
+        if len(value) > (max_bytes or settings.CACHE_MAX_ITEM_BYTES):
+            return False
+        if self._redis_available():
+            try:
+                self.client.set(key, value, ex=ttl)
+                return True
+            except redis.RedisError as e:
+                self._mark_redis_down(e)
+        return self.local.set(key, value, ttl)
+
+    def add_raw(self, key: str, value: bytes, ttl: int) -> bool:
+        """키가 없을 때만 저장하고 저장했는지 반환합니다. 여러 워커 중 하나만 선점해야 하는 값에 씁니다."""
+        if self._redis_available():
+            try:
+                return bool(self.client.set(key, value, ex=ttl, nx=True))
+            except redis.RedisError as e:
+                self._mark_redis_down(e)
+        return self.local.add(key, value, ttl)
+
+    def delete_raw(self, key: str) -> None:
+        if self._redis_available():
+            try:
+                self.client.delete(key)
+            except redis.RedisError as e:
+                self._mark_redis_down(e)
+        self.local.delete(key)
+
+    def get(self, namespace: str, payload: Any) -> Optional[Any]:
+        raw = self.get_raw(make_cache_key(namespace, payload))
+        return json.loads(raw) if raw is not None else None
+
+    def set(
+        self, namespace: str, payload: Any, value: Any, ttl: Optional[int] = None
+    ) -> None:
+        raw = json.dumps(value, default=json_default).encode("utf-8")
+        self.set_raw(make_cache_key(namespace, payload), raw, ttl)
+
+    # 이벤트 루프에서 쓰는 비동기 버전. Redis 왕복은 스레드로 넘기고, Redis 가 내려가
+    # 로컬 LRU 만 쓰는 동안에는 스레드 전환 없이 바로 처리합니다.
+    # 워커 프로세스처럼 루프 밖에서는 위의 동기 메서드를 그대로 씁니다
+
+    async def _offload(self, fn: Callable, *args, **kwargs):
+        if self._redis_available():
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    async def get_raw_async(self, key: str) -> Optional[bytes]:
+        return await self._offload(self.get_raw, key)
+
+    async def set_raw_async(
+        self,
+        key: str,
+        value: bytes,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> bool:
+        return await self._offload(self.set_raw, key, value, ttl, max_bytes)
+
+    async def add_raw_async(self, key: str, value: bytes, ttl: int) -> bool:
+        return await self._offload(self.add_raw, key, value, ttl)
+
+    async def delete_raw_async(self, key: str) -> None:
+        await self._offload(self.delete_raw, key)
+
+    async def get_async(self, namespace: str, payload: Any) -> Optional[Any]:
+        raw = await self.get_raw_async(make_cache_key(namespace, payload))
+        return json.loads(raw) if raw is not None else None
+
+    async def set_async(
+        self, namespace: str, payload: Any, value: Any, ttl: Optional[int] = None
+    ) -> None:
+        raw = json.dumps(value, default=json_default).encode("utf-8")
+        await self.set_raw_async(make_cache_key(namespace, payload), raw, ttl)
+
+    async def get_or_compute(
+        self, namespace: str, payload: Any, compute: Callable[[], Awaitable[Any]]
+    ):
+        cached = await self.get_async(namespace, payload)
+        result = "hit" if cached is not None else "miss"
+        metrics.inc("cache_requests_total", {"namespace": namespace, "result": result})
+        if cached is not None:
+            return cached
+        value = await compute()
+        await self.set_async(namespace, payload, value)
+        return value
+
+    async def get_or_compute_raw(
+        self, namespace: str, payload: Any, compute: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """get_or_compute 와 같지만 이미 인코딩된 응답 본문(bytes)을 그대로 저장/반환합니다."""
+        key = make_cache_key(namespace, payload)
+        cached = await self.get_raw_async(key)
+        result = "hit" if cached is not None else "miss"
+        metrics.inc("cache_requests_total", {"namespace": namespace, "result": result})
+        if cached is not None:
+            return cached
+        value = await compute()
+        await self.set_raw_async(key, value)
+        return value
+
+
+result_cache = ResultCache()
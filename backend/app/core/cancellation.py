@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# 실행 중인 작업마다 한 칸씩 배정되는 공유 배열 (취소 플래그, 진행률).
+# 프로세스 풀 워커는 initializer 로 받습니다
+_flags = None
+_progress = None
+# (취소 플래그 배열, 진행률 배열, 칸 번호). 스레드에서 실행되는 작업은 배열을 직접 받습니다
+_current: ContextVar[Optional[tuple]] = ContextVar("cancel_slot", default=None)
+
+
+class TaskCancelled(Exception):
+    """요청이 타임아웃 등으로 취소되어 계산을 중단했을 때 발생합니다."""
+
+
+def init_flags(flags, progress=None) -> None:
+    global _flags, _progress
+    _flags = flags
+    _progress = progress
+
+
+@contextmanager
+def cancel_scope(slot: int, flags=None, progress=None):
+    """이 블록 안의 check_cancelled() / report_progress() 가 slot 번 칸을 쓰도록 합니다.
+
+    배열을 넘기지 않으면 워커 프로세스의 공유 배열을 사용합니다.
+    """
+    token = _current.set((flags, progress, slot))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def is_cancelled() -> bool:
+    current = _current.get()
+    if current is None:
+        return False
+    flags, _, slot = current
+    flags = flags if flags is not None else _flags
+    return flags is not None and bool(flags[slot])
+
+
+def check_cancelled() -> None:
+    """현재 작업이 취소되었으면 TaskCancelled 를 발생시킵니다.
+
+    계산 루프의 반복 사이처럼 중단해도 안전한 지점에서 호출합니다.
+    executor 밖에서 직접 호출된 경우에는 아무 일도 하지 않습니다.
+    """
+    if is_cancelled():
+        raise TaskCancelled()
+
+
+def report_progress(fraction: float) -> None:
+    """현재 작업의 진행률 (0~1) 을 기록합니다. executor 밖에서는 아무 일도 하지 않습니다."""
+    current = _current.get()
+    if current is None:
+        return
+    _, progress, slot = current
+    progress = progress if progress is not None else _progress
+    if progress is not None:
+        progress[slot] = min(max(fraction, 0.0), 1.0)
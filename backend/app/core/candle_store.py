@@ -0,0 +1,128 @@
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# 저장 컬럼 순서: timestamp(ms), open, high, low, close, volume
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+class CandleStore:
+    """심볼/타임프레임별 OHLCV 캔들을 메모리 맵 NumPy 파일로 보관하는 로컬 저장소.
+
+    `{root}/{BASE_QUOTE}/{timeframe}.npy` 에 타임스탬프 오름차순 (n, 6) float64 배열을,
+    같은 위치의 `.json` 에 업스트림에서 확인된 구간(coverage)을 기록합니다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def data_path(self, symbol: str, timeframe: str) -> str:
+        return self._paths(symbol, timeframe)[0]
+
+    def _paths(self, symbol: str, timeframe: str) -> tuple[str, str]:
+        # 대소문자를 구분하지 않는 파일시스템에서 1m / 1M 이 겹치지 않도록 변환
+        name = timeframe.replace("M", "mo")
+        directory = os.path.join(self.root, symbol.replace("/", "_"))
+        base = os.path.join(directory, name)
+        return f"{base}.npy", f"{base}.json"
+
+    @contextmanager
+    def _locked(self, data_path: str):
+        """같은 심볼/타임프레임을 병합하는 다른 프로세스(uvicorn 워커)와 배타 잠금을 잡습니다."""
+        with open(f"{os.path.splitext(data_path)[0]}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def coverage(self, symbol: str, timeframe: str) -> Optional[tuple[int, int]]:
+        """업스트림에서 빠짐없이 가져온 캔들 구간 [since, until] (ms) 을 반환합니다."""
+        _, meta_path = self._paths(symbol, timeframe)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return int(meta["since"]), int(meta["until"])
+
+    def missing_ranges(
+        self, symbol: str, timeframe: str, since: int, until: int
+    ) -> list[tuple[int, int]]:
+        """[since, until] 중 저장소에 없는 구간을 coverage 에 이어 붙일 수 있는 형태로 반환합니다."""
+        covered = self.coverage(symbol, timeframe)
+        if covered is None:
+            return [(since, until)]
+
+        lo, hi = covered
+        ranges = []
+        if since < lo:
+            ranges.append((since, lo - 1))
+        if until > hi:
+            ranges.append((hi + 1, until))
+        return ranges
+
+    def load(self, symbol: str, timeframe: str) -> np.ndarray:
+        """저장된 캔들 전체를 읽기 전용 메모리 맵으로 반환합니다 (없으면 빈 배열)."""
+        data_path, _ = self._paths(symbol, timeframe)
+        try:
+            return np.load(data_path, mmap_mode="r")
+        except FileNotFoundError:
+            return np.empty((0, len(OHLCV_COLUMNS)))
+
+    def read(self, symbol: str, timeframe: str, since: int, until: int) -> np.ndarray:
+        """타임스탬프가 [since, until] 에 속하는 캔들을 반환합니다."""
+        rows = self.load(symbol, timeframe)
+        timestamps = rows[:, 0]
+        lo = np.searchsorted(timestamps, since, side="left")
+        hi = np.searchsorted(timestamps, until, side="right")
+        return np.array(rows[lo:hi])
+
+    def merge(
+        self,
+        symbol: str,
+        timeframe: str,
+        rows: np.ndarray,
+        covered: Optional[tuple[int, int]] = None,
+    ) -> None:
+        """가져온 캔들을 병합하고, 주어진 경우 coverage 를 covered 구간만큼 확장합니다.
+
+        같은 타임스탬프는 새로 받은 캔들이 우선합니다 (진행 중이던 캔들 갱신).
+        기존 캔들 읽기부터 coverage 기록까지 잠금 안에서 하므로 동시에 병합해도 서로 덮어쓰지 않습니다.
+        """
+        data_path, meta_path = self._paths(symbol, timeframe)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+        with self._locked(data_path):
+            rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+            merged = np.concatenate([rows, self.load(symbol, timeframe)])
+            _, first = np.unique(merged[:, 0], return_index=True)
+            merged = merged[first]
+
+            # 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = f"{data_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, merged)
+            os.replace(tmp_path, data_path)
+
+            if covered is None:
+                return
+
+            since, until = covered
+            current = self.coverage(symbol, timeframe)
+            if current is not None and since <= current[1] + 1 and until >= current[0] - 1:
+                since, until = min(current[0], since), max(current[1], until)
+
+            tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({"since": since, "until": until}, f)
+            os.replace(tmp_meta, meta_path)
+
+
+candle_store = CandleStore(settings.CANDLE_STORE_DIR)
@@ -9,6 +9,14 @@ class Settings(BaseSettings):
     # 로그
     LOG_LEVEL: str = "INFO"
     LOG_DIR: str = "./logs"
+    LOG_QUEUE_SIZE: int = 10000  # 요청 경로와 기록 스레드 사이 큐 크기 (넘치면 버림)
+    LOG_FLUENT_HOST: str = os.getenv("LOG_FLUENT_HOST", "localhost")
+    LOG_FLUENT_PORT: int = int(os.getenv("LOG_FLUENT_PORT", 24224))
+    LOG_FLUENT_BATCH_SIZE: int = 100  # Fluent 로 한 번에 보내는 로그 수
+    LOG_FLUENT_FLUSH_SECONDS: float = 1.0  # 배치가 덜 찼어도 보내는 주기
+    LOG_FLUENT_MAX_BUFFER: int = 10000  # 전송 대기 최대 로그 수 (넘치면 오래된 것부터 버림)
+    LOG_FLUENT_TIMEOUT: float = 1.0  # 수집기 연결/전송 대기 시간 (초)
+    LOG_FLUENT_RETRY_SECONDS: float = 30.0  # 수집기 장애 시 전송을 쉬는 시간
 
     # 레디스
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
@@ -16,8 +24,69 @@ class Settings(BaseSettings):
     REDIS_DB: int = int(os.getenv("REDIS_DB", 0))
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "1q2w3e4r!")
     CACHE_TTL: int = 3600  # 캐시 유효 시간 1시간 (초 단위)
+    CACHE_SOCKET_TIMEOUT: float = 0.5  # 레디스 응답 대기 시간 (초 단위)
+    CACHE_REDIS_RETRY_SECONDS: int = 30  # 레디스 장애 시 로컬 캐시만 쓰는 시간
+    CACHE_MAX_ITEM_BYTES: int = 8 * 1024 * 1024  # 이보다 큰 결과는 캐시하지 않음
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024  # 로컬 LRU 캐시 최대 크기
     ETHERSCAN_API_KEY: str = os.getenv("ETHERSCAN_API_KEY", "")
 
+    # 캔들 저장소
+    CANDLE_STORE_DIR: str = "./data/candles"
+    OHLCV_FETCH_CONCURRENCY: int = 5  # 거래소 동시 요청 수 (페이지/심볼 공통)
+    RETURN_INDEX_MAX_SERIES: int = 64  # 프로세스당 메모리에 두는 심볼/타임프레임별 수익률 누적합 수
+
+    # 작업 실행
+    EXECUTOR_THREAD_WORKERS: int = 16  # I/O 작업용 스레드 수
+    EXECUTOR_PROCESS_WORKERS: int = os.cpu_count() or 1  # 계산 작업용 프로세스 수 (0 이면 스레드 사용)
+    EXECUTOR_MAX_PENDING: int = 64  # 실행 중 + 대기 중 작업 최대 수
+
+    # 비동기 작업 (/jobs)
+    JOB_CONCURRENCY: int = 2  # HTTP 워커당 동시에 실행하는 작업 수 (나머지는 대기)
+    JOB_MAX_QUEUED: int = 100  # 실행 중 + 대기 중 작업 최대 수
+    JOB_RESULT_MAX_BYTES: int = 16 * 1024 * 1024  # 작업 결과 최대 크기 (넘으면 작업을 실패 처리)
+    JOB_PROGRESS_POLL_SECONDS: float = 0.5  # 워커 진행률을 확인하는 주기
+    JOB_PROGRESS_SAVE_SECONDS: float = 1.0  # 바뀐 상태/진행률을 저장소에 기록하는 최소 간격
+    JOB_HEARTBEAT_SECONDS: float = 10.0  # 실행 중인 작업의 소유권(lease)을 갱신하는 주기
+    JOB_LEASE_SECONDS: int = 30  # 갱신이 끊긴 작업을 다른 워커가 다시 실행할 수 있게 되기까지의 시간
+
+    # 외부 API 공용 HTTP 클라이언트
+    HTTP_TIMEOUT: float = 10.0  # 외부 API 응답 대기 시간 (초)
+    HTTP_MAX_CONNECTIONS: int = 100  # 워커당 최대 동시 연결 수
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # 재사용을 위해 열어 두는 최대 연결 수
+    HTTP_KEEPALIVE_SECONDS: float = 30.0  # 쓰지 않는 연결을 닫기까지의 시간
+
+    # 가치평가
+    COINGECKO_API_URL: str = "https://api.coingecko.com/api/v3"
+    VALUATION_BATCH_MAX_COINS: int = 50  # /valuation/batch 한 번에 받는 최대 코인 수
+    VALUATION_BATCH_CONCURRENCY: int = 5  # 배치 요청 하나에서 동시에 평가하는 코인 수
+
+    # DeFi Llama 프로토콜 카탈로그 (가치평가 TVL)
+    DEFILLAMA_PROTOCOLS_URL: str = "https://api.llama.fi/protocols"
+    PROTOCOL_CATALOG_REFRESH_SECONDS: float = 600  # 백그라운드 갱신 주기, 이보다 오래되면 뒤에서 갱신
+    PROTOCOL_CATALOG_MAX_STALE_SECONDS: float = 6 * 3600  # 이보다 오래된 목록은 쓰지 않고 다시 받음
+    PROTOCOL_CATALOG_TIMEOUT: float = 10.0  # 목록 다운로드 대기 시간 (초)
+
+    # 포트폴리오 파라미터 스윕
+    PORTFOLIO_SWEEP_MAX_COMBINATIONS: int = 1000
+    PORTFOLIO_SWEEP_MAX_HISTORIES: int = 20  # 전체 히스토리를 돌려주는 상위 조합 최대 수
+
+    # 포트폴리오 walk-forward
+    PORTFOLIO_WALK_FORWARD_MAX_WINDOWS: int = 10_000  # walk-forward 한 번에 계산하는 최대 창 수
+    PORTFOLIO_WALK_FORWARD_CHUNK_ELEMENTS: int = 2_000_000  # 창 × 행 × 자산 임시 배열 최대 원소 수
+
+    # 스트리밍 응답
+    STREAM_BATCH_ROWS: int = 5000  # NDJSON 한 줄에 담는 히스토리 행 수
+
+    # 메트릭
+    METRICS_DIR: str = "./data/metrics"  # 프로세스별 메트릭 파일 위치 (워커 간 공유)
+    METRICS_FLUSH_SECONDS: float = 5.0  # 메트릭을 파일로 내보내는 주기
+
+    # 몬테카를로
+    MONTE_CARLO_MAX_SIMULATIONS: int = 1_000_000
+    MONTE_CARLO_MAX_DAYS: int = 3650
+    MONTE_CARLO_CHUNK_ELEMENTS: int = 2_000_000  # 한 번에 생성하는 난수 수 (float64 기준 약 16MB)
+    MONTE_CARLO_SOBOL_REPLICATES: int = 8  # Sobol 표준오차 계산용 독립 스크램블 반복 수
+
     # 브릿지 자산 패턴
     BRIDGED_PATTERNS: list[str] = [
         "wrapped",
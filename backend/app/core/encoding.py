@@ -0,0 +1,177 @@
+import json
+import math
+from functools import partial
+from typing import Callable, Optional, Sequence
+
+import msgpack
+import numpy as np
+import pandas as pd
+
+from app.core.cache import json_default
+from app.core.executor import Staged
+from app.core.streaming import NDJSON_MEDIA_TYPE
+
+try:
+    import orjson
+except ImportError:  # 없으면 표준 json 으로 인코딩합니다 (형식은 같고 느릴 뿐)
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow 응답은 pyarrow 가 설치된 경우에만 제공합니다
+    pa = None
+
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.backtest.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Accept 에 쓸 수 있는 별칭
+_ALIASES = {"application/msgpack": MSGPACK_MEDIA_TYPE}
+
+
+def supported_media_types() -> tuple:
+    types = (NDJSON_MEDIA_TYPE, COLUMNAR_JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
+    return types + (ARROW_MEDIA_TYPE,) if pa is not None else types
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """Accept 헤더에서 q 값이 가장 높은 (같으면 먼저 나온) 지원 형식을 고릅니다.
+
+    기본 JSON 응답(application/json, */*)을 고르거나 지원하는 형식이 없으면 None 을 반환합니다.
+    """
+    if not accept:
+        return None
+    candidates = []
+    for order, part in enumerate(accept.split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        media_type = _ALIASES.get(media_type.lower(), media_type.lower())
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, order, media_type))
+
+    supported = supported_media_types()
+    for _, _, media_type in sorted(candidates):
+        if media_type in ("application/json", "*/*", "application/*"):
+            return None
+        if media_type in supported:
+            return media_type
+    return None
+
+
+def epoch_millis(index: pd.DatetimeIndex) -> np.ndarray:
+    """날짜 인덱스를 캔들 저장소와 같은 epoch 밀리초 (int64) 배열로 바꿉니다."""
+    return index.as_unit("ms").asi8
+
+
+def _columns(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    return epoch_millis(values.index), np.ascontiguousarray(values.to_numpy(dtype=np.float64))
+
+
+def _encode_columnar_json(body: dict, series: dict) -> bytes:
+    data = body["data"]
+    for name, values in series.items():
+        t, v = _columns(values)
+        data[name] = {"t": t, "v": v}
+    if orjson is not None:
+        # NumPy 배열을 파이썬 리스트로 바꾸지 않고 바로 씁니다 (NaN 은 null)
+        return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    # orjson 과 같은 본문: NaN/inf 는 null, 공백 없음, UTF-8 그대로
+    # (아주 작은 수의 지수 표기만 1e-07 / 1e-7 처럼 다르고 값은 같습니다)
+    return json.dumps(
+        _finite(body), separators=(",", ":"), ensure_ascii=False, allow_nan=False
+    ).encode("utf-8")
+
+
+def _finite(value):
+    """NumPy 값을 파이썬 값으로 바꾸고 NaN/inf 를 None 으로 바꿉니다 (orjson 이 없을 때만 사용)."""
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_finite(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _encode_msgpack(body: dict, series: dict) -> bytes:
+    # 배열은 리틀 엔디언 원시 바이트 (t: int64, v: float64) 로 복사 없이 담습니다.
+    # 클라이언트는 np.frombuffer(t, "<i8") / np.frombuffer(v, "<f8") 로 읽습니다
+    data = body["data"]
+    for name, values in series.items():
+        t, v = _columns(values)
+        data[name] = {
+            "t": memoryview(t.astype("<i8", copy=False)).cast("B"),
+            "v": memoryview(v.astype("<f8", copy=False)).cast("B"),
+        }
+    return msgpack.packb(body, default=json_default)
+
+
+def _encode_arrow(body: dict, series: dict) -> bytes:
+    # 길이가 다른 시계열을 한 스트림에 담기 위해 (series, t, v) 긴 형식 테이블로 보내고,
+    # 요약 지표와 메시지는 스키마 메타데이터에 JSON 으로 넣습니다
+    names = list(series)
+    lengths = [len(values) for values in series.values()]
+    columns = [_columns(values) for values in series.values()]
+    t = np.concatenate([c[0] for c in columns]) if columns else np.empty(0, np.int64)
+    v = np.concatenate([c[1] for c in columns]) if columns else np.empty(0, np.float64)
+    codes = np.repeat(np.arange(len(names), dtype=np.int32), lengths)
+
+    metadata = {
+        "success": json.dumps(body["success"]),
+        "message": body["message"],
+        "summary": json.dumps(body["data"], default=json_default),
+    }
+    table = pa.table(
+        {
+            "series": pa.DictionaryArray.from_arrays(codes, names),
+            "t": pa.array(t.view("datetime64[ms]")),
+            "v": pa.array(v),
+        }
+    ).replace_schema_metadata(metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+_ENCODERS = {
+    COLUMNAR_JSON_MEDIA_TYPE: _encode_columnar_json,
+    MSGPACK_MEDIA_TYPE: _encode_msgpack,
+    ARROW_MEDIA_TYPE: _encode_arrow,
+}
+
+
+def encode(media_type: str, message: str, summary: dict, series: dict) -> bytes:
+    """요약 지표와 {이름: pd.Series} 시계열을 media_type 형식의 응답 본문으로 인코딩합니다.
+
+    JSON/MessagePack 은 기존 응답과 같은 {success, message, data} 구조이고,
+    data 의 각 시계열만 {"t": [epoch ms], "v": [값]} 열 형식으로 바뀝니다.
+    """
+    body = {"success": True, "message": message, "data": dict(summary)}
+    return _ENCODERS[media_type](body, series)
+
+
+def compute_encoded(
+    media_type: str, message: str, compute: Callable, names: Sequence[str], data, **kwargs
+) -> bytes:
+    """compute(data, **kwargs) 가 돌려준 (요약, 시계열...) 을 인코딩합니다."""
+    summary, *values = compute(data, **kwargs)
+    return encode(media_type, message, summary, dict(zip(names, values)))
+
+
+def encoded(media_type: str, message: str, fn: Staged, names: Sequence[str]) -> Staged:
+    """fn 과 같은 로드 단계를 쓰고, 계산 결과를 워커에서 바로 인코딩하는 Staged 를 만듭니다.
+
+    인코딩 비용과 큰 시계열 전송을 이벤트 루프 밖에서 처리합니다.
+    """
+    return Staged(fn.load, partial(compute_encoded, media_type, message, fn.compute, names))
@@ -0,0 +1,202 @@
+import asyncio
+import inspect
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+from app.core.cancellation import cancel_scope, init_flags
+from app.core.config import settings
+from app.core.metrics import metrics
+
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+class _RemoteHTTPException(Exception):
+    """프로세스 경계를 넘기기 위한 HTTPException 대체 (HTTPException 은 pickle 되지 않습니다)."""
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class Staged:
+    """데이터 로드(load)와 계산(compute)으로 나뉜 서비스 함수.
+
+    executor 는 load(**kwargs) 를 메인 프로세스의 I/O 스레드에서, compute(data, **kwargs) 만 프로세스 풀에서
+    실행합니다. 캔들 조회는 이 프로세스의 공용 시세 클라이언트 (rate limit, 중복 요청 합치기) 와
+    캔들 저장소 쓰기를 거치고, 워커 프로세스는 거래소나 저장소를 건드리지 않습니다.
+    직접 호출하면 둘을 차례로 실행합니다. 위치 인자는 compute 의 (data 다음) 매개변수 이름으로 바꿔 넘깁니다.
+    """
+
+    def __init__(self, load: Callable, compute: Callable):
+        self.load = load
+        self.compute = compute
+        self.__name__ = _name(compute)
+        self._params = list(inspect.signature(compute).parameters)[1:]
+
+    def keywords(self, args: tuple, kwargs: dict) -> dict:
+        return {**dict(zip(self._params, args)), **kwargs}
+
+    def __call__(self, *args, **kwargs):
+        kwargs = self.keywords(args, kwargs)
+        return self.compute(self.load(**kwargs), **kwargs)
+
+
+def _name(fn: Callable) -> str:
+    fn = getattr(fn, "func", fn)  # functools.partial
+    return getattr(fn, "__name__", type(fn).__name__)
+
+
+def _invoke(fn: Callable, args: tuple, kwargs: dict, slot: int, shared=None):
+    # 워커 프로세스 안에서 기록되며, 프로세스별 메트릭 파일로 합쳐집니다
+    name = _name(fn)
+    try:
+        with cancel_scope(slot, *(shared or ())), metrics.timer(
+            "service_compute_seconds", {"function": name}
+        ):
+            return fn(*args, **kwargs)
+    except HTTPException as e:
+        raise _RemoteHTTPException(e.status_code, e.detail) from None
+
+
+class TaskExecutor:
+    """동기 서비스 함수를 이벤트 루프 밖에서 실행합니다.
+
+    I/O 위주 작업은 스레드 풀, 계산 위주 작업은 프로세스 풀에서 실행하고,
+    대기 중인 작업이 EXECUTOR_MAX_PENDING 을 넘으면 503 으로 바로 거절합니다.
+    EXECUTOR_PROCESS_WORKERS 가 0 이면 계산 작업도 스레드 풀에서 실행합니다.
+
+    작업마다 공유 취소 플래그 한 칸을 배정하고, 기다리던 요청이 취소(타임아웃)되면 플래그를 세워
+    워커가 check_cancelled() 지점에서 계산을 멈추게 합니다. 칸은 워커가 실제로 끝난 뒤 반납됩니다.
+    같은 칸의 진행률 배열로 워커가 report_progress() 한 값을 on_progress 콜백에 전달합니다.
+    """
+
+    def __init__(self):
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._flags = None
+        self._progress = None
+        self._free_slots: list[int] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def flags(self):
+        if self._flags is None:
+            self._flags = _MP_CONTEXT.RawArray("b", settings.EXECUTOR_MAX_PENDING)
+            self._progress = _MP_CONTEXT.RawArray("d", settings.EXECUTOR_MAX_PENDING)
+            self._free_slots = list(range(settings.EXECUTOR_MAX_PENDING))
+        return self._flags
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=settings.EXECUTOR_THREAD_WORKERS,
+                thread_name_prefix="io-worker",
+            )
+        return self._threads
+
+    @property
+    def processes(self) -> Executor:
+        if settings.EXECUTOR_PROCESS_WORKERS <= 0:
+            return self.threads
+        if self._processes is None:
+            # 이벤트 루프/시세 클라이언트 스레드를 가진 프로세스를 fork 하지 않도록 spawn 사용
+            self._processes = ProcessPoolExecutor(
+                max_workers=settings.EXECUTOR_PROCESS_WORKERS,
+                mp_context=_MP_CONTEXT,
+                initializer=init_flags,
+                initargs=(self.flags, self._progress),
+            )
+        return self._processes
+
+    async def _submit(
+        self,
+        pool: Executor,
+        fn: Callable,
+        args: tuple,
+        kwargs: dict,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ):
+        flags = self.flags
+        progress = self._progress
+        with self._lock:
+            if self._pending >= settings.EXECUTOR_MAX_PENDING or not self._free_slots:
+                raise HTTPException(
+                    status_code=503, detail="Server is busy. Please retry shortly."
+                )
+            self._pending += 1
+            slot = self._free_slots.pop()
+        flags[slot] = 0
+        progress[slot] = 0.0
+
+        def release(_):
+            with self._lock:
+                self._pending -= 1
+                self._free_slots.append(slot)
+
+        # 스레드에서 실행하는 작업은 플래그 배열을 직접 넘기고, 프로세스 워커는 initializer 로 받은 배열을 씁니다
+        shared = None if isinstance(pool, ProcessPoolExecutor) else (flags, progress)
+        try:
+            future = pool.submit(_invoke, fn, args, kwargs, slot, shared)
+        except BaseException:
+            release(None)
+            raise
+        future.add_done_callback(release)
+
+        wrapped = asyncio.wrap_future(future)
+        try:
+            if on_progress is None:
+                return await wrapped
+
+            reported = 0.0
+            while True:
+                done, _ = await asyncio.wait(
+                    {wrapped}, timeout=settings.JOB_PROGRESS_POLL_SECONDS
+                )
+                if progress[slot] != reported:
+                    reported = progress[slot]
+                    on_progress(reported)
+                if done:
+                    return wrapped.result()
+        except asyncio.CancelledError:
+            wrapped.cancel()
+            flags[slot] = 1
+            raise
+        except _RemoteHTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    async def run_io(self, fn: Callable, *args, **kwargs):
+        return await self._submit(self.threads, fn, args, kwargs)
+
+    async def _run_cpu(self, fn: Callable, args: tuple, kwargs: dict, on_progress=None):
+        if isinstance(fn, Staged):
+            kwargs = fn.keywords(args, kwargs)
+            data = await self._submit(self.threads, fn.load, (), kwargs)
+            return await self._submit(self.processes, fn.compute, (data,), kwargs, on_progress)
+        return await self._submit(self.processes, fn, args, kwargs, on_progress)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs):
+        """fn 이 Staged 면 load 는 I/O 스레드에서, compute 만 프로세스 풀에서 실행합니다."""
+        return await self._run_cpu(fn, args, kwargs)
+
+    async def run_cpu_with_progress(
+        self, on_progress: Callable[[float], None], fn: Callable, *args, **kwargs
+    ):
+        return await self._run_cpu(fn, args, kwargs, on_progress)
+
+    def shutdown(self) -> None:
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+
+
+executor = TaskExecutor()
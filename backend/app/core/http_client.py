@@ -0,0 +1,42 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+
+class SharedHttpClient:
+    """외부 API 호출에 함께 쓰는 httpx.AsyncClient.
+
+    연결 풀과 keep-alive 를 공유하므로 요청마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    httpx 의 연결은 만든 이벤트 루프에 묶여 있어, 다른 루프에서 호출되면 클라이언트를 새로 만듭니다
+    (운영에서는 워커당 루프가 하나라 한 번만 만들어집니다).
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=settings.HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+http_client = SharedHttpClient()
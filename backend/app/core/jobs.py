@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import time
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.core.cache import ResultCache, json_default, make_cache_key, result_cache
+from app.core.config import settings
+from app.core.executor import executor
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobManager:
+    """오래 걸리는 계산을 HTTP 요청과 분리해 실행하고 상태/결과를 결과 캐시(Redis 우선)에 저장합니다.
+
+    작업 ID 는 결과 캐시 키와 같은 방식으로 정규화한 요청의 해시이므로, 같은 요청을 다시 제출하면
+    진행 중이거나 끝난 기존 작업을 그대로 돌려줍니다 (실패한 작업은 다시 실행).
+    작업은 제출받은 HTTP 워커의 이벤트 루프에서 관리되고 계산은 executor 프로세스 풀에서 실행되며,
+    상태는 공유 저장소에 있으므로 어느 워커에서든 조회할 수 있습니다.
+
+    작업을 실행하는 워커는 `job-owner` 키를 SET NX 로 선점하고 JOB_HEARTBEAT_SECONDS 마다 만료 시간을
+    연장합니다. 워커가 죽어 키가 만료되면 queued/running 으로 남은 작업도 다시 제출할 수 있습니다.
+    """
+
+    def __init__(self, cache: ResultCache):
+        self.cache = cache
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.JOB_CONCURRENCY)
+        return self._semaphore
+
+    @staticmethod
+    def job_id(namespace: str, payload: Any) -> str:
+        return hashlib.sha256(
+            make_cache_key(namespace, payload).encode("utf-8")
+        ).hexdigest()[:32]
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{settings.app_name}:job:{job_id}"
+
+    @staticmethod
+    def _result_key(job_id: str) -> str:
+        return f"{settings.app_name}:job-result:{job_id}"
+
+    @staticmethod
+    def _owner_key(job_id: str) -> str:
+        return f"{settings.app_name}:job-owner:{job_id}"
+
+    @staticmethod
+    def owner() -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    async def _claim(self, job_id: str) -> bool:
+        return await self.cache.add_raw_async(
+            self._owner_key(job_id), self.owner().encode("utf-8"), settings.JOB_LEASE_SECONDS
+        )
+
+    async def _is_alive(self, job: dict) -> bool:
+        """다른 워커가 lease 를 갱신하고 있는 작업인지 (이 워커의 작업은 실행 중인 태스크로 판단)."""
+        if job["id"] in self._tasks:
+            return True
+        if job.get("owner") == self.owner():
+            return False
+        return await self.cache.get_raw_async(self._owner_key(job["id"])) is not None
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self.cache.get_raw_async(self._job_key(job_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def get_result(self, job_id: str) -> Optional[Any]:
+        raw = await self.cache.get_raw_async(self._result_key(job_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def _save(self, job: dict, **changes) -> dict:
+        job.update(changes, updated_at=time.time())
+        await self.cache.set_raw_async(self._job_key(job["id"]), json.dumps(job).encode("utf-8"))
+        return job
+
+    async def _store_result(self, job: dict, result: Any) -> dict:
+        """결과를 저장하고 완료 처리합니다. 저장하지 못하면 결과를 잃지 않도록 413 으로 실패 처리합니다."""
+        raw = json.dumps(result, default=json_default).encode("utf-8")
+        if await self.cache.set_raw_async(
+            self._result_key(job["id"]), raw, max_bytes=settings.JOB_RESULT_MAX_BYTES
+        ):
+            return await self._save(job, status=DONE, progress=1.0)
+
+        logger.warning(f"Job {job['id']} result was not stored ({len(raw)} bytes)")
+        return await self._save(
+            job,
+            status=FAILED,
+            error={
+                "status_code": 413,
+                "detail": (
+                    f"Job result is too large to store ({len(raw)} bytes, "
+                    f"limit {settings.JOB_RESULT_MAX_BYTES} bytes). Narrow the request."
+                ),
+            },
+        )
+
+    async def submit(
+        self, namespace: str, payload: Any, fn: Callable, **kwargs
+    ) -> dict:
+        """작업을 등록하고 곧바로 상태를 반환합니다. fn(**kwargs) 는 백그라운드에서 실행됩니다."""
+        job_id = self.job_id(namespace, payload)
+        existing = await self.get(job_id)
+        if existing is not None and (
+            existing["status"] == DONE
+            or (existing["status"] != FAILED and await self._is_alive(existing))
+        ):
+            return existing
+
+        now = time.time()
+        job = {
+            "id": job_id,
+            "type": namespace,
+            "status": QUEUED,
+            "progress": 0.0,
+            "error": None,
+            "owner": self.owner(),
+            "created_at": now,
+        }
+
+        # 동기 엔드포인트가 이미 계산해 둔 결과가 있으면 바로 완료 처리합니다
+        cached = await self.cache.get_async(namespace, payload)
+        if cached is not None:
+            return await self._store_result(job, cached)
+
+        if len(self._tasks) >= settings.JOB_MAX_QUEUED:
+            raise HTTPException(
+                status_code=503, detail="Too many jobs in progress. Please retry later."
+            )
+
+        if not await self._claim(job_id):
+            # 다른 워커가 방금 같은 작업을 선점했습니다
+            return await self.get(job_id) or job
+        if existing is not None and existing["status"] != FAILED:
+            logger.warning(
+                f"Job {job_id} ({namespace}) lost its owner {existing.get('owner')}, resubmitting"
+            )
+
+        await self._save(job)
+        task = asyncio.ensure_future(self._run(job, namespace, payload, fn, kwargs))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        return job
+
+    async def _keep_alive(self, job: dict, stop: asyncio.Event) -> None:
+        """실행 중인 작업의 상태를 기록하는 유일한 곳입니다.
+
+        상태/진행률이 바뀌었으면 JOB_PROGRESS_SAVE_SECONDS 마다, 바뀌지 않아도
+        JOB_HEARTBEAT_SECONDS 마다 기록하고 lease 를 연장합니다. 쓰는 곳이 하나라서
+        스레드에서 끝나는 순서가 뒤바뀌어 오래된 상태가 덮어쓰는 일이 없습니다.
+        """
+        saved = (job["status"], job["progress"])
+        renewed = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), settings.JOB_PROGRESS_SAVE_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            if time.monotonic() - renewed >= settings.JOB_HEARTBEAT_SECONDS:
+                await self.cache.set_raw_async(
+                    self._owner_key(job["id"]),
+                    self.owner().encode("utf-8"),
+                    ttl=settings.JOB_LEASE_SECONDS,
+                )
+                renewed = time.monotonic()
+            elif (job["status"], job["progress"]) == saved:
+                continue
+            saved = (job["status"], job["progress"])
+            await self._save(job)
+
+    async def _run(
+        self, job: dict, namespace: str, payload: Any, fn: Callable, kwargs: dict
+    ) -> None:
+        try:
+            stop = asyncio.Event()
+            keeper = asyncio.ensure_future(self._keep_alive(job, stop))
+            try:
+                result, error = await self._execute(job, namespace, fn, kwargs)
+            finally:
+                # 마지막 상태를 쓰기 전에 진행 중인 기록이 끝나기를 기다립니다
+                stop.set()
+                await keeper
+
+            if error is not None:
+                await self._save(job, status=FAILED, error=error)
+            else:
+                await self.cache.set_async(namespace, payload, result)
+                await self._store_result(job, result)
+        finally:
+            await self.cache.delete_raw_async(self._owner_key(job["id"]))
+
+    async def _execute(
+        self, job: dict, namespace: str, fn: Callable, kwargs: dict
+    ) -> tuple[Any, Optional[dict]]:
+        """fn 을 실행하고 (결과, 오류) 를 반환합니다. 상태/진행률은 메모리에서만 바꾸고 _keep_alive 가 기록합니다."""
+
+        def on_progress(progress: float) -> None:
+            job["progress"] = progress
+
+        async with self.semaphore:
+            job["status"] = RUNNING
+            try:
+                return await executor.run_cpu_with_progress(on_progress, fn, **kwargs), None
+            except HTTPException as e:
+                return None, {"status_code": e.status_code, "detail": e.detail}
+            except Exception as e:
+                logger.error(f"Job {job['id']} ({namespace}) failed: {e}")
+                return None, {"status_code": 500, "detail": "Internal Server Error"}
+
+
+job_manager = JobManager(result_cache)
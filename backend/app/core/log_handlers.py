@@ -0,0 +1,144 @@
+import logging
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import msgpack
+
+from app.core.metrics import metrics
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 새 로그를 버리는 QueueHandler.
+
+    요청 경로에서는 큐에 넣기만 하므로 파일/소켓 I/O 가 응답 시간에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc("log_records_dropped_total", {"handler": "queue"})
+
+
+class LogListener(QueueListener):
+    """종료 신호는 큐가 가득 차 있어도 버리지 않고 자리가 날 때까지 기다려 넣는 QueueListener."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class BatchingFluentHandler(logging.Handler):
+    """로그를 모아 Fluent Forward 모드 메시지 하나로 보내는 핸들러 (QueueListener 스레드에서 사용).
+
+    batch_size 개가 모이거나 flush_interval 초가 지나면 전송하고, 보내지 못한 로그는
+    최대 max_buffer 개까지만 보관합니다 (넘치면 오래된 것부터 버림).
+    수집기에 연결할 수 없으면 retry_interval 초 동안 연결을 시도하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        tag: str,
+        host: str,
+        port: int,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        timeout: float = 1.0,
+        retry_interval: float = 30.0,
+    ):
+        super().__init__()
+        self.tag = tag
+        self.address = (host, port)
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.hostname = socket.gethostname()
+        self.dropped = 0
+        self._buffer: deque = deque()
+        self._socket: Optional[socket.socket] = None
+        self._down_until = 0.0
+        self._closed = threading.Event()
+        threading.Thread(
+            target=self._flush_loop, args=(flush_interval,), name="fluent-flush", daemon=True
+        ).start()
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        entry = [
+            int(record.created),
+            {
+                "level": record.levelname,
+                "message": record.getMessage(),
+                "logger": record.name,
+                "module": record.module,
+                "host": self.hostname,
+            },
+        ]
+        with self.lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.popleft()
+                self._drop(1)
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            while self._buffer:
+                if time.monotonic() < self._down_until:
+                    return
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                if not self._send(msgpack.packb([self.tag, batch])):
+                    self._drop(len(batch))
+                    return
+
+    def _send(self, packet: bytes) -> bool:
+        try:
+            if self._socket is None:
+                self._socket = socket.create_connection(self.address, self.timeout)
+            self._socket.sendall(packet)
+            return True
+        except OSError:
+            # 수집기가 없거나 느리면 잠시 전송을 멈춥니다 (요청 처리에는 영향 없음)
+            self._close_socket()
+            self._down_until = time.monotonic() + self.retry_interval
+            return False
+
+    def _drop(self, count: int) -> None:
+        self.dropped += count
+        metrics.inc("log_records_dropped_total", {"handler": "fluent"}, count)
+
+    def _close_socket(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        with self.lock:
+            # 종료 시점까지 보내지 못한 로그도 버린 것으로 셉니다
+            self._drop(len(self._buffer))
+            self._buffer.clear()
+            self._close_socket()
+        super().close()
@@ -1,9 +1,15 @@
+import atexit
 import logging
+import queue
 import sys
 import os
-from fluent import handler as fluent_handler
 from logging.handlers import TimedRotatingFileHandler
 from app.core.config import settings
+from app.core.log_handlers import (
+    BatchingFluentHandler,
+    DroppingQueueHandler,
+    LogListener,
+)
 
 # 로그 폴더 생성
 LOG_DIR = settings.LOG_DIR
@@ -17,11 +23,16 @@ LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 
-# Fluent 핸들러
-fluent_handler = fluent_handler.FluentHandler(
+# Fluent 핸들러 (배치 전송)
+fluent_handler = BatchingFluentHandler(
     tag="discord_bot.backend",
-    host="localhost",
-    port=24224,
+    host=settings.LOG_FLUENT_HOST,
+    port=settings.LOG_FLUENT_PORT,
+    batch_size=settings.LOG_FLUENT_BATCH_SIZE,
+    flush_interval=settings.LOG_FLUENT_FLUSH_SECONDS,
+    max_buffer=settings.LOG_FLUENT_MAX_BUFFER,
+    timeout=settings.LOG_FLUENT_TIMEOUT,
+    retry_interval=settings.LOG_FLUENT_RETRY_SECONDS,
 )
 
 # INFO 핸들러
@@ -52,11 +63,22 @@ error_handler.setLevel(logging.ERROR)
 logger = logging.getLogger("app_logger")
 logger.setLevel(getattr(logging, settings.LOG_LEVEL, logging.INFO))
 
+# 요청 경로에서는 큐에 넣기만 하고, 콘솔/Fluent/파일 기록은 백그라운드 리스너 스레드가 처리합니다
+log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+listener = LogListener(
+    log_queue,
+    console_handler,
+    fluent_handler,
+    info_handler,
+    error_handler,
+    respect_handler_level=True,
+)
+listener.start()
+atexit.register(listener.stop)
+
 # 핸들러 추가
-logger.addHandler(console_handler)
-logger.addHandler(fluent_handler)
-logger.addHandler(info_handler)
-logger.addHandler(error_handler)
+logger.addHandler(queue_handler)
 
 
 def get_logger():
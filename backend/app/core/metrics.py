@@ -0,0 +1,331 @@
+import atexit
+import bisect
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from app.core.config import settings
+
+# 지연 시간 히스토그램 버킷 (초). 계산 작업이 타임아웃(60초) 근처까지 갈 수 있어 상단을 넓게 둡니다
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 이름: (타입, 설명)
+METRICS = {
+    "http_request_duration_seconds": (
+        "histogram",
+        "HTTP request latency by route template, method and status code.",
+    ),
+    "http_requests_in_flight": ("gauge", "HTTP requests currently being served."),
+    "upstream_request_duration_seconds": (
+        "histogram",
+        "Latency of calls to upstream APIs (binance, coingecko, defillama).",
+    ),
+    "upstream_requests_total": ("counter", "Calls to upstream APIs by outcome."),
+    "cache_requests_total": ("counter", "Result cache lookups by namespace and result."),
+    "candle_requests_total": (
+        "counter",
+        "OHLCV range requests by where the candles came from (store, resampled, upstream, index).",
+    ),
+    "log_records_dropped_total": (
+        "counter",
+        "Log records dropped because the log queue or the Fluent buffer was full.",
+    ),
+    "service_compute_seconds": (
+        "histogram",
+        "Execution time of service functions run by the task executor.",
+    ),
+}
+
+
+def _key(name: str, labels: Optional[dict]) -> tuple:
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra: tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# 종료된 프로세스의 카운터/히스토그램을 모아 두는 파일 (게이지는 버림)
+ARCHIVE_NAME = "archive.json"
+
+
+@contextmanager
+def _locked(directory: str, operation: int):
+    """디렉터리 단위 잠금. 파일을 archive 로 옮기는 동안 collect 가 중간 상태를 읽지 않도록 합니다."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, ".lock"), "a") as lock:
+        fcntl.flock(lock, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _merge(paths: list, stale_before: Optional[float] = None) -> tuple[dict, dict, dict]:
+    """스냅숏 파일들을 합칩니다. 게이지는 stale_before 이후 갱신된 살아 있는 프로세스의 것만 합칩니다."""
+    counters, gauges, histograms = {}, {}, {}
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            modified = os.path.getmtime(path)
+        except (OSError, ValueError):
+            continue
+
+        for name, labels, value in snapshot["counters"]:
+            key = _key(name, labels)
+            counters[key] = counters.get(key, 0) + value
+        if (
+            snapshot["gauges"]
+            and stale_before is not None
+            and modified >= stale_before
+            and _pid_alive(snapshot["pid"])
+        ):
+            for name, labels, value in snapshot["gauges"]:
+                key = _key(name, labels)
+                gauges[key] = gauges.get(key, 0) + value
+        for name, labels, buckets, total in snapshot["histograms"]:
+            key = _key(name, labels)
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0.0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+    return counters, gauges, histograms
+
+
+def _archive(directory: str, paths: list) -> None:
+    """paths 의 카운터/히스토그램을 archive 에 더하고 파일을 지웁니다. 배타 잠금 안에서 호출합니다."""
+    if not paths:
+        return
+    archive_path = os.path.join(directory, ARCHIVE_NAME)
+    counters, _, histograms = _merge([archive_path] + paths)
+    snapshot = {
+        "pid": None,
+        "counters": [[n, dict(l), v] for (n, l), v in counters.items()],
+        "gauges": [],
+        "histograms": [[n, dict(l), b, t] for (n, l), (b, t) in histograms.items()],
+    }
+    tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, archive_path)
+    for path in paths:
+        _remove(path)
+
+
+class MetricsRegistry:
+    """프로세스 내 카운터/게이지/히스토그램 저장소.
+
+    기록은 잠금 하나 아래의 dict 갱신이라 요청 경로에 부담이 거의 없고, 값은 주기적으로
+    `{directory}/{pid}.json` 에 기록됩니다. /metrics 를 받은 워커가 모든 파일을 합쳐 응답하므로
+    uvicorn 워커가 여러 개이거나 계산이 프로세스 풀에서 실행되어도 한 번에 수집됩니다.
+
+    파일과 기록 스레드는 그 프로세스가 처음 값을 기록할 때 만들어집니다. 프로세스가 종료하면
+    카운터/히스토그램은 archive 파일에 더해 두므로 (prometheus_client multiprocess 모드처럼)
+    워커가 교체되어도 합계가 줄어들지 않습니다. 게이지는 살아 있고 최근에 기록한 프로세스의 값만
+    합칩니다 (비정상 종료 후 pid 가 재사용된 경우 제외).
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._pid = None
+        self._path: Optional[str] = None
+        self._counters: dict[tuple, float] = {}
+        self._gauges: dict[tuple, float] = {}
+        self._histograms: dict[tuple, list] = {}
+
+    @property
+    def directory(self) -> str:
+        """기록 위치. 생성 시 지정하지 않았으면 기록할 때마다 현재 설정(METRICS_DIR)을 읽습니다."""
+        return self._directory or settings.METRICS_DIR
+
+    def _ensure_process(self) -> None:
+        # fork 된 프로세스는 부모 값을 버리고 자기 파일과 기록 스레드를 따로 가집니다
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._path = None
+        self._counters, self._gauges, self._histograms = {}, {}, {}
+        threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+        atexit.register(self.close)
+
+    def _flush_loop(self) -> None:
+        pid = self._pid
+        while pid == os.getpid():
+            time.sleep(settings.METRICS_FLUSH_SECONDS)
+            self.flush()
+
+    def inc(self, name: str, labels: Optional[dict] = None, amount: float = 1) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._ensure_process()
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def add(self, name: str, labels: Optional[dict] = None, amount: float = 1) -> None:
+        """게이지를 amount 만큼 바꿉니다 (음수 가능)."""
+        key = _key(name, labels)
+        with self._lock:
+            self._ensure_process()
+            self._gauges[key] = self._gauges.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        key = _key(name, labels)
+        index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+        with self._lock:
+            self._ensure_process()
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # 버킷별 개수 (+Inf 포함), 합계
+                histogram = self._histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0]
+            histogram[0][index] += 1
+            histogram[1] += value
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[dict] = None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def remove_dead(self) -> None:
+        """비정상 종료한 프로세스가 남긴 파일을 archive 로 합치고 지웁니다 (앱 시작 시 사용)."""
+        directory = self.directory
+        with _locked(directory, fcntl.LOCK_EX):
+            dead = []
+            for path in glob.glob(os.path.join(directory, "*.json")):
+                name = os.path.splitext(os.path.basename(path))[0]
+                if name.isdigit() and not _pid_alive(int(name)):
+                    dead.append(path)
+            _archive(directory, dead)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "counters": [[n, dict(l), v] for (n, l), v in self._counters.items()],
+                "gauges": [[n, dict(l), v] for (n, l), v in self._gauges.items()],
+                "histograms": [
+                    [n, dict(l), list(buckets), total]
+                    for (n, l), (buckets, total) in self._histograms.items()
+                ],
+            }
+
+    def flush(self) -> None:
+        if self._pid != os.getpid():
+            return
+        directory = self.directory
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self._pid}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+        if self._path not in (None, path):
+            # 설정이 바뀌어 위치가 옮겨졌으면 이전 파일은 그 위치의 archive 로 합칩니다
+            previous = os.path.dirname(self._path)
+            with _locked(previous, fcntl.LOCK_EX):
+                _archive(previous, [self._path])
+        self._path = path
+
+    def close(self) -> None:
+        """마지막 값을 archive 에 더하고 이 프로세스의 파일을 지웁니다 (종료 시 호출)."""
+        if self._pid != os.getpid():
+            return
+        self.flush()
+        self._pid = None
+        directory = os.path.dirname(self._path)
+        with _locked(directory, fcntl.LOCK_EX):
+            _archive(directory, [self._path])
+
+    def collect(self) -> tuple[dict, dict, dict]:
+        """모든 프로세스의 기록을 합쳐 (카운터, 게이지, 히스토그램) 을 반환합니다."""
+        self.flush()
+        directory = self.directory
+        # 기록 스레드가 멈춘 지 오래된 파일은 pid 가 살아 있어도 (재사용) 죽은 프로세스의 것입니다
+        stale_before = time.time() - 3 * settings.METRICS_FLUSH_SECONDS
+        with _locked(directory, fcntl.LOCK_SH):
+            return _merge(glob.glob(os.path.join(directory, "*.json")), stale_before)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4) 으로 출력합니다."""
+        counters, gauges, histograms = self.collect()
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for (metric, labels), (buckets, total) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(DEFAULT_BUCKETS + ("+Inf",), buckets):
+                        cumulative += count
+                        le = (("le", bound if bound == "+Inf" else _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+            else:
+                values = counters if kind == "counter" else gauges
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def track_upstream(service: str):
+    """외부 API 호출 한 번의 지연 시간과 성공/실패 여부를 기록합니다."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        labels = {"service": service}
+        metrics.observe(
+            "upstream_request_duration_seconds", time.perf_counter() - started, labels
+        )
+        metrics.inc("upstream_requests_total", {**labels, "outcome": outcome})
@@ -1,19 +1,34 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 import time
 
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.core.logger import get_logger
 
 logger = get_logger()
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
+class LoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        logger.info(
-            f"Request: {request.method} {request.url} - {response.status_code} - {process_time:.2f}s"
-        )
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                f"Request: {scope['method']} {URL(scope=scope)} - {status_code} - {process_time:.2f}s"
+            )
@@ -0,0 +1,46 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+
+class MetricsMiddleware:
+    """요청별 지연 시간 히스토그램과 처리 중인 요청 수 게이지를 기록합니다.
+
+    응답 본문(스트리밍 포함)을 다 보낼 때까지를 재고, 라벨에는 실제 경로 대신
+    라우트 템플릿 (예: /valuation/{coin_id}) 을 사용해 시계열 수가 늘어나지 않도록 합니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.add("http_requests_in_flight", {"method": method})
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.add("http_requests_in_flight", {"method": method}, -1)
+            route = scope.get("route")
+            metrics.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                {
+                    "method": method,
+                    "route": route.path if route is not None else "unmatched",
+                    "status": str(status_code),
+                },
+            )
@@ -1,26 +1,49 @@
 import asyncio
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, HTTPException
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logger import get_logger
 
 logger = get_logger()
 
 
-class TimeoutMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, timeout: int):
-        super().__init__(app)
+class TimeoutMiddleware:
+    """timeout 초 안에 끝나지 않은 요청을 취소하고 408 을 반환합니다.
+
+    요청 처리 코루틴이 취소되면 executor 가 해당 작업의 취소 플래그를 세우므로,
+    프로세스/스레드 풀에서 돌던 계산도 다음 check_cancelled() 지점에서 멈춥니다.
+    응답을 이미 보내기 시작했다면 (스트리밍) 연결만 끊습니다.
+    """
+
+    def __init__(self, app: ASGIApp, timeout: int):
+        self.app = app
         self.timeout = timeout
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await asyncio.wait_for(call_next(request), timeout=self.timeout)
+            await asyncio.wait_for(
+                self.app(scope, receive, send_wrapper), timeout=self.timeout
+            )
         except asyncio.TimeoutError:
-            endpoint = str(request.url)
-            method = request.method
-
-            logger.warning(f"Timeout: {method} {endpoint}")
+            logger.warning(f"Timeout: {scope['method']} {URL(scope=scope)}")
+            if response_started:
+                return
 
-            return HTTPException(
-                status_code=408, detail="Request Timeout: The request took too long."
+            response = JSONResponse(
+                status_code=408,
+                content={"detail": "Request Timeout: The request took too long."},
             )
+            await response(scope, receive, send)
@@ -0,0 +1,87 @@
+import numpy as np
+
+from app.core.candle_store import OHLCV_COLUMNS
+
+MINUTE = 60 * 1000
+DAY = 24 * 60 * MINUTE
+
+# 월봉(1M)을 제외한 고정 길이 타임프레임의 캔들 길이 (ms)
+TIMEFRAME_MILLIS = {
+    "1m": MINUTE,
+    "5m": 5 * MINUTE,
+    "15m": 15 * MINUTE,
+    "1h": 60 * MINUTE,
+    "4h": 240 * MINUTE,
+    "1d": DAY,
+    "1w": 7 * DAY,
+}
+
+# 1970-01-01 은 목요일이므로 바이낸스 주봉 시작(월요일 00:00 UTC)까지 4일을 밀어 줍니다
+WEEK_OFFSET = 4 * DAY
+
+
+def bin_starts(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+    """각 타임스탬프(ms)가 속한 timeframe 캔들의 시작 시각(ms)을 계산합니다."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if timeframe == "1M":
+        months = timestamps.astype("datetime64[ms]").astype("datetime64[M]")
+        return months.astype("datetime64[ms]").astype(np.int64)
+
+    duration = TIMEFRAME_MILLIS[timeframe]
+    offset = WEEK_OFFSET if timeframe == "1w" else 0
+    return timestamps - (timestamps - offset) % duration
+
+
+def bin_end(start: int, timeframe: str) -> int:
+    """start 에서 시작하는 timeframe 캔들 다음 캔들의 시작 시각(ms)."""
+    if timeframe == "1M":
+        month = np.datetime64(int(start), "ms").astype("datetime64[M]") + 1
+        return int(month.astype("datetime64[ms]").astype(np.int64))
+    return int(start) + TIMEFRAME_MILLIS[timeframe]
+
+
+def resample_sources(timeframe: str) -> list[str]:
+    """timeframe 캔들을 경계 어긋남 없이 합성할 수 있는 더 짧은 타임프레임 (긴 것부터).
+
+    긴 타임프레임일수록 합칠 행이 적으므로 먼저 시도합니다.
+    """
+    if timeframe == "1M":
+        # 월 경계는 일 단위로만 맞으므로 하루를 나누어떨어지게 하는 타임프레임만 사용
+        target = DAY
+    elif timeframe in TIMEFRAME_MILLIS:
+        target = TIMEFRAME_MILLIS[timeframe]
+    else:
+        return []
+
+    sources = [
+        base
+        for base, duration in TIMEFRAME_MILLIS.items()
+        if duration < TIMEFRAME_MILLIS.get(timeframe, 31 * DAY)
+        and target % duration == 0
+        and DAY % duration == 0
+    ]
+    return sources[::-1]
+
+
+def resample_ohlcv(rows: np.ndarray, timeframe: str) -> np.ndarray:
+    """타임스탬프 오름차순 (n, 6) OHLCV 배열을 timeframe 캔들로 합칩니다.
+
+    시가는 첫 캔들, 고가/저가는 최댓값/최솟값, 종가는 마지막 캔들, 거래량은 합계이며,
+    정렬된 구간 시작 인덱스에 reduceat 을 적용해 반복문 없이 한 번에 계산합니다.
+    """
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+    if len(rows) == 0:
+        return rows
+
+    labels, first = np.unique(bin_starts(rows[:, 0], timeframe), return_index=True)
+    last = np.append(first[1:], len(rows)) - 1
+    return np.column_stack(
+        [
+            labels,
+            rows[first, 1],
+            np.maximum.reduceat(rows[:, 2], first),
+            np.minimum.reduceat(rows[:, 3], first),
+            rows[last, 4],
+            np.add.reduceat(rows[:, 5], first),
+        ]
+    )
@@ -0,0 +1,217 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.candle_store import CandleStore, candle_store
+from app.core.config import settings
+
+# 캔들 저장소 컬럼 위치
+TIMESTAMP, CLOSE = 0, 4
+
+
+def _accumulate(values: np.ndarray, previous: Optional[np.ndarray], start: int) -> np.ndarray:
+    """values 의 누적합. previous 의 앞 start 개는 그대로 쓰고 그 뒤만 이어서 더합니다."""
+    out = np.empty(len(values))
+    if start:
+        out[:start] = previous[:start]
+        out[start:] = previous[start - 1] + np.cumsum(values[start:])
+    else:
+        np.cumsum(values, out=out)
+    return out
+
+
+class ReturnSeries:
+    """종가 수익률의 누적합 배열 (읽기 전용).
+
+    i 번째 캔들까지의 Σr, Σr², Σlog(1+r) 을 들고 있어 어떤 구간의 평균/표준편차/누적 수익률도
+    두 원소의 차로 구합니다. r[0] 은 이전 캔들이 없으므로 0 입니다.
+    """
+
+    def __init__(self, timestamps: np.ndarray, closes: np.ndarray, previous=None, start: int = 0):
+        """previous 의 앞 start 개 캔들이 그대로이면 그 뒤만 새로 누적합니다."""
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+        self.closes = np.array(closes, dtype=np.float64)
+        n = len(self.closes)
+
+        returns = np.zeros(n)
+        first = max(start, 1)
+        returns[first:] = self.closes[first:] / self.closes[first - 1 : -1] - 1
+        if start:
+            returns[:start] = previous.returns[:start]
+        self.returns = returns
+        self.sums = _accumulate(returns, previous.sums if start else None, start)
+        self.squares = _accumulate(returns * returns, previous.squares if start else None, start)
+        self.logs = _accumulate(np.log1p(returns), previous.logs if start else None, start)
+        for array in (self.timestamps, self.closes, self.returns, self.sums, self.squares, self.logs):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_arrays(cls, timestamps, closes, returns, sums, squares, logs) -> "ReturnSeries":
+        """이미 계산된 배열 (다른 ReturnSeries 의 일부) 로 누적 없이 만듭니다."""
+        series = cls.__new__(cls)
+        series.timestamps, series.closes, series.returns = timestamps, closes, returns
+        series.sums, series.squares, series.logs = sums, squares, logs
+        return series
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    def first_difference(self, timestamps: np.ndarray, closes: np.ndarray) -> int:
+        """새 캔들 배열에서 이 누적합과 달라지는 첫 위치 (모두 같으면 둘 중 짧은 길이)."""
+        n = min(len(self), len(closes))
+        changed = (self.timestamps[:n] != timestamps[:n]) | (self.closes[:n] != closes[:n])
+        return int(np.argmax(changed)) if changed.any() else n
+
+    def window(self, since: int, until: int) -> Optional["ReturnWindow"]:
+        lo = int(np.searchsorted(self.timestamps, since, side="left"))
+        hi = int(np.searchsorted(self.timestamps, until, side="right"))
+        return ReturnWindow(self, lo, hi) if hi > lo else None
+
+
+class ReturnWindow:
+    """캔들 [lo, hi) 구간의 수익률 통계. 모든 통계는 누적합의 차로 O(1) 에 계산합니다.
+
+    수익률은 구간 안의 캔들끼리만 계산하므로 candles - 1 개입니다 (pct_change().dropna() 와 같음).
+    """
+
+    def __init__(self, series: ReturnSeries, lo: int, hi: int):
+        self.series = series
+        self.lo = lo
+        self.hi = hi
+
+    def __reduce__(self):
+        # 프로세스 풀 워커로 넘길 때 전체 이력이 아니라 구간 부분 배열만 복사합니다.
+        # 누적합은 구간 안에서 차로만 쓰므로 잘라도 같은 통계가 나옵니다
+        series, part = self.series, slice(self.lo, self.hi)
+        arrays = tuple(
+            getattr(series, name)[part]
+            for name in ("timestamps", "closes", "returns", "sums", "squares", "logs")
+        )
+        return _restore_window, (arrays,)
+
+    @property
+    def candles(self) -> int:
+        return self.hi - self.lo
+
+    @property
+    def count(self) -> int:
+        return self.hi - self.lo - 1
+
+    def _diff(self, prefix: np.ndarray) -> float:
+        return float(prefix[self.hi - 1] - prefix[self.lo])
+
+    @property
+    def sum(self) -> float:
+        return self._diff(self.series.sums)
+
+    @property
+    def sum_of_squares(self) -> float:
+        return self._diff(self.series.squares)
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else float("nan")
+
+    def std(self, ddof: int = 0) -> float:
+        if self.count <= ddof:
+            return float("nan")
+        variance = (self.sum_of_squares - self.sum**2 / self.count) / (self.count - ddof)
+        return float(np.sqrt(max(variance, 0.0)))
+
+    @property
+    def total_return(self) -> float:
+        """첫 캔들 종가 대비 마지막 캔들 종가 수익률 (누적 로그 수익률로 계산)."""
+        return float(np.expm1(self._diff(self.series.logs)))
+
+    @property
+    def first_price(self) -> float:
+        return float(self.series.closes[self.lo])
+
+    @property
+    def last_price(self) -> float:
+        return float(self.series.closes[self.hi - 1])
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.series.closes[self.lo : self.hi]
+
+    @property
+    def returns(self) -> np.ndarray:
+        """구간 수익률 배열 (복사하지 않은 읽기 전용 뷰)."""
+        return self.series.returns[self.lo + 1 : self.hi]
+
+    def index(self, start: int = 0, stop: Optional[int] = None) -> pd.DatetimeIndex:
+        """구간 캔들 [start, stop) 의 시각을 to_frame 과 같은 DatetimeIndex 로 반환합니다."""
+        stop = self.candles if stop is None else stop
+        millis = self.series.timestamps[self.lo + start : self.lo + stop].astype("int64")
+        return pd.DatetimeIndex(pd.to_datetime(millis, unit="ms"))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> Optional["ReturnWindow"]:
+        """저장소에 없는 (합성된) 캔들 DataFrame 으로 같은 통계를 만듭니다."""
+        if df.empty:
+            return None
+        timestamps = df.index.as_unit("ms").asi8
+        return cls(ReturnSeries(timestamps, df["close"].to_numpy()), 0, len(df))
+
+
+def _restore_window(arrays: tuple) -> ReturnWindow:
+    return ReturnWindow(ReturnSeries.from_arrays(*arrays), 0, len(arrays[0]))
+
+
+class ReturnIndex:
+    """심볼/타임프레임별 ReturnSeries 를 메모리에 두고 캔들 저장소가 바뀌면 뒤쪽만 갱신합니다.
+
+    저장소 파일의 (inode, 수정 시각, 크기) 로 변경을 알아채므로 다른 프로세스가 병합한 캔들도 반영되고,
+    새 캔들이 뒤에 붙거나 진행 중이던 마지막 캔들이 바뀐 경우 바뀐 위치부터만 다시 누적합니다.
+    프로세스마다 따로 두며, 최근에 쓴 max_series 개만 유지합니다.
+    """
+
+    def __init__(self, store: CandleStore, max_series: int):
+        self.store = store
+        self.max_series = max_series
+        self._series: OrderedDict[str, tuple[tuple, ReturnSeries]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def series(self, symbol: str, timeframe: str) -> Optional[ReturnSeries]:
+        key = self.store.data_path(symbol, timeframe)
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._series.get(key)
+            if entry is not None:
+                self._series.move_to_end(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        rows = self.store.load(symbol, timeframe)
+        timestamps, closes = rows[:, TIMESTAMP], rows[:, CLOSE]
+        previous = entry[1] if entry is not None else None
+        start = previous.first_difference(timestamps, closes) if previous is not None else 0
+        series = ReturnSeries(timestamps, closes, previous, start)
+
+        with self._lock:
+            self._series[key] = (version, series)
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        return series
+
+    def window(self, symbol: str, timeframe: str, since: int, until: int) -> Optional[ReturnWindow]:
+        """저장소 캔들 중 타임스탬프가 [since, until] 인 구간. 캔들이 없으면 None."""
+        series = self.series(symbol, timeframe)
+        return series.window(since, until) if series is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+return_index = ReturnIndex(candle_store, settings.RETURN_INDEX_MAX_SERIES)
@@ -0,0 +1,49 @@
+import json
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import StreamingResponse
+
+from app.core.cache import json_default
+from app.core.config import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _line(record: dict) -> bytes:
+    return (
+        json.dumps(record, default=json_default, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+
+
+def date_unit(dates: pd.DatetimeIndex) -> str:
+    # 모두 자정이면 기존 응답과 같은 YYYY-MM-DD, 분/시간봉이면 초 단위 ISO 형식
+    return "D" if (dates.normalize() == dates).all() else "s"
+
+
+def iter_ndjson(summary: dict, series: dict, batch_rows: int) -> Iterator[bytes]:
+    """요약 지표 한 줄을 먼저 보내고, 시계열을 batch_rows 개씩 [날짜, 값] 행으로 나눠 보냅니다.
+
+    series 는 {이름: pd.Series} 이며, 한 배치에 해당하는 문자열만 만들기 때문에
+    전체 구간 길이와 상관없이 메모리 사용량이 일정합니다.
+    """
+    yield _line({"type": "summary", "data": summary})
+
+    for name, values in series.items():
+        unit = date_unit(values.index)
+        for start in range(0, len(values), batch_rows):
+            batch = values.iloc[start : start + batch_rows]
+            dates = np.datetime_as_string(
+                batch.index.to_numpy(dtype="datetime64[s]"), unit=unit
+            )
+            yield _line({"type": name, "rows": list(zip(dates.tolist(), batch.tolist()))})
+
+    yield _line({"type": "end", "rows": {name: len(v) for name, v in series.items()}})
+
+
+def ndjson_response(summary: dict, series: dict) -> StreamingResponse:
+    return StreamingResponse(
+        iter_ndjson(summary, series, settings.STREAM_BATCH_ROWS),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
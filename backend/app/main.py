@@ -1,5 +1,6 @@
 from app.core.middleware.logging_middleware import LoggingMiddleware
 from app.core.middleware.timeout_middleware import TimeoutMiddleware
+from app.core.middleware.metrics_middleware import MetricsMiddleware
 from app.core.exception.api_exception import (
     internal_error_handler,
     not_found_handler,
@@ -10,10 +11,32 @@ from app.controllers import valuation_controller
 from app.controllers import check_controller
 from app.controllers import probability_controller
 from app.controllers import monte_carlo_controller
+from app.controllers import metrics_controller
+from app.controllers import jobs_controller
+from app.services import market_data_service
+from app.services.protocol_catalog import protocol_catalog
+from app.core.executor import executor
+from app.core.http_client import http_client
+from app.core.metrics import metrics
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 거래소 마켓 정보는 시작 시 한 번만 불러옵니다
+    await market_data_service.startup()
+    metrics.remove_dead()
+    protocol_catalog.start()
+    yield
+    protocol_catalog.stop()
+    await http_client.close()
+    await market_data_service.shutdown()
+    executor.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Controller
 app.include_router(check_controller.router)
@@ -21,6 +44,8 @@ app.include_router(valuation_controller.router)
 app.include_router(portfolio_controller.router)
 app.include_router(probability_controller.router)
 app.include_router(monte_carlo_controller.router)
+app.include_router(metrics_controller.router)
+app.include_router(jobs_controller.router)
 
 # Middleware
 app.add_middleware(
@@ -30,8 +55,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(LoggingMiddleware)
 app.add_middleware(TimeoutMiddleware, timeout=60)  # API 타임아웃 60초 설정
+app.add_middleware(LoggingMiddleware)  # 타임아웃(408) 응답까지 로그에 남도록 바깥에 둡니다
+app.add_middleware(MetricsMiddleware)  # 가장 바깥에서 타임아웃 응답까지 포함해 측정
 
 # Exception
 app.add_exception_handler(404, not_found_handler)
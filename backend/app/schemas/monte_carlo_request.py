@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
+
+from app.core.config import settings
 
 class BacktestMonteCarloRequest(BaseModel):
     symbol: str = "BTC/USDT"
@@ -6,5 +9,25 @@ class BacktestMonteCarloRequest(BaseModel):
     start_date: str
     end_date: str
     target_return: float = 0.10
-    days: int = 30
-    simulations: int = 1000
\ No newline at end of file
+    days: int = Field(30, gt=0, le=settings.MONTE_CARLO_MAX_DAYS)
+    simulations: int = Field(1000, gt=0, le=settings.MONTE_CARLO_MAX_SIMULATIONS)
+    # 분산 감소 (함께 사용 가능)
+    antithetic: bool = False  # Z / -Z 짝 경로
+    control_variate: bool = False  # GBM 닫힌 해를 대조 변수로 사용
+    sampling: Literal["random", "sobol"] = "random"  # sobol: 스크램블 준난수
+    confidence_level: float = Field(0.95, gt=0, lt=1)  # 표준오차로 계산하는 신뢰구간 수준
+    # 수익률 모델: parametric (정규분포) / bootstrap (실제 수익률 블록 재표본)
+    method: Literal["parametric", "bootstrap"] = "parametric"
+    block_size: int = Field(5, gt=0, le=365)  # bootstrap 블록 길이 (캔들 수)
+    # 주면 같은 요청은 항상 같은 결과 (공유 링크/재현용)
+    seed: Optional[int] = Field(None, ge=0, le=2**63 - 1)
+
+    @model_validator(mode="after")
+    def validate_method_options(self):
+        if self.method == "bootstrap" and (
+            self.antithetic or self.control_variate or self.sampling != "random"
+        ):
+            raise ValueError(
+                "antithetic, control_variate and sobol sampling apply to the parametric method only."
+            )
+        return self
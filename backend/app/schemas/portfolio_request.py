@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional
+
+from app.core.config import settings
 
 
 class BacktestRequest(BaseModel):
@@ -39,3 +41,68 @@ class BacktestRequest(BaseModel):
                 f"Total asset allocation must sum to 100%, but got {total_weight * 100:.2f}%"
             )
         return value
+
+
+class PortfolioMonteCarloRequest(BacktestRequest):
+    """start_date~end_date 는 평균/공분산 추정 구간이고, end_date 이후 days 일을 시뮬레이션합니다."""
+
+    target_return: float = 0.10
+    days: int = Field(365, gt=0, le=settings.MONTE_CARLO_MAX_DAYS)
+    simulations: int = Field(1000, gt=0, le=settings.MONTE_CARLO_MAX_SIMULATIONS)
+    confidence_level: float = Field(0.95, gt=0, lt=1)
+    seed: Optional[int] = Field(None, ge=0, le=2**63 - 1)  # 주면 같은 요청은 항상 같은 결과
+
+
+class PortfolioWalkForwardRequest(BacktestRequest):
+    """start_date~end_date 안에서 window 기간짜리 창을 step 기간씩 옮기며 백테스트합니다.
+
+    기간 단위는 리밸런싱 주기의 날짜 격자입니다 (D: 일, W: 주, ME/YE: 월).
+    """
+
+    window: int = Field(..., ge=2, description="Window length in rebalance-grid periods")
+    step: int = Field(1, ge=1, description="Shift between window starts in periods")
+
+
+class SweepCombination(BaseModel):
+    weights: Dict[str, float] = Field(
+        ..., min_length=1, description="At least one asset must be provided."
+    )
+    rebalance_period: str = Field(
+        "ME",
+        pattern=r"^(D|W|ME|YE)$",
+        description="Rebalance period must be D, W, ME, or YE",
+    )
+    rebalance: bool = True
+    fee_rate: float = 0.001
+    slippage: float = 0.0005
+
+    @field_validator("weights")
+    def validate_weights(cls, value):
+        return BacktestRequest.validate_assets(value)
+
+
+class PortfolioSweepRequest(BaseModel):
+    initial_balance: float = Field(
+        ..., gt=0, description="Initial balance must be greater than zero"
+    )
+    start_date: str
+    end_date: str
+    combinations: List[SweepCombination] = Field(
+        ..., min_length=1, max_length=settings.PORTFOLIO_SWEEP_MAX_COMBINATIONS
+    )
+    top_n: int = Field(
+        0,
+        ge=0,
+        le=settings.PORTFOLIO_SWEEP_MAX_HISTORIES,
+        description="Number of best combinations to return full histories for",
+    )
+
+    @field_validator("start_date", "end_date")
+    def validate_date_format(cls, value):
+        return BacktestRequest.validate_date_format(value)
+
+    @model_validator(mode="after")
+    def validate_top_n(self):
+        if self.top_n > len(self.combinations):
+            raise ValueError("top_n cannot exceed the number of combinations")
+        return self
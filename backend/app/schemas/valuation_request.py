@@ -1,8 +1,24 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List
+
+from app.core.config import settings
 
 class ValuationRequest(BaseModel):
     burn_daily: float = 0.0  # 일일 소각 금액 (코인 단위)
     fees_daily: float = 0.0  # 일일 수수료 (코인 단위)
     active_wallets: float = 0.0  # 일일 활성 지갑 수 (단일 값)
     inflation: float = 0.0  # 연간 인플레이션율 (단일 값, 퍼센트 단위)
-    transaction_volume: float = 0.0  # 일일 온체인 거래량 (코인 단위)
\ No newline at end of file
+    transaction_volume: float = 0.0  # 일일 온체인 거래량 (코인 단위)
+
+
+class ValuationBatchItem(ValuationRequest):
+    coin_id: str  # CoinGecko 코인 ID
+
+
+class ValuationBatchRequest(BaseModel):
+    coins: List[ValuationBatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.VALUATION_BATCH_MAX_COINS,
+        description=f"Between 1 and {settings.VALUATION_BATCH_MAX_COINS} coins.",
+    )
@@ -2,64 +2,98 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from fastapi import HTTPException
-import ccxt
 
-exchange = ccxt.binance()
+from app.core.cancellation import check_cancelled, report_progress
+from app.core.config import settings
+from app.core.executor import Staged
+from app.services.market_data_service import load_ohlcv_many
 
 VALID_REBALANCE_PERIODS = ["D", "W", "ME", "YE"]
 
 def fetch_data(symbols, timeframe, start_date, end_date) -> dict:
+    # 모든 심볼을 동시에 가져오고, 오류는 기존처럼 심볼 순서대로 처리합니다
+    results = load_ohlcv_many(symbols, timeframe, start_date, end_date)
+
     data = {}
     for symbol in symbols:
-        try:
-            since = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
-            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since, limit=2000)
-
-            if not ohlcv:
-                continue
-
-            df = pd.DataFrame(
-                ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
-            )
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            df.set_index("timestamp", inplace=True)
-
-            df = df[(df.index >= start_date) & (df.index <= end_date)]
-            if df.empty:
-                continue
-
-            data[symbol] = df
-
-        except Exception as e:
+        df = results[symbol]
+        if isinstance(df, Exception):
             raise HTTPException(
-                status_code=400, detail=f"Error fetching {symbol}: {str(e)}"
+                status_code=400, detail=f"Error fetching {symbol}: {str(df)}"
             )
+        if df.empty:
+            continue
+
+        data[symbol] = df
 
     return data
 
-def get_period_label(date, period):
+def get_period_keys(dates: pd.DatetimeIndex, period: str) -> np.ndarray:
+    """날짜별 리밸런싱 기간 구분값을 정수 배열로 한 번에 계산합니다.
+
+    기존 strftime 레이블("%Y-%m-%d", "%Y-%W", "%Y-%m", "%Y")과 같은 경계를 가집니다.
+    """
+    year = dates.year.to_numpy()
     if period == "D":
-        return date.strftime("%Y-%m-%d")
+        return year * 10000 + dates.month.to_numpy() * 100 + dates.day.to_numpy()
     elif period == "W":
-        return date.strftime("%Y-%W")
+        # %W: 월요일 시작 주차, 그해 첫 월요일 이전은 0주차
+        week = (dates.dayofyear.to_numpy() - 1 + 7 - dates.weekday.to_numpy()) // 7
+        return year * 100 + week
     elif period == "ME":
-        return date.strftime("%Y-%m")
+        return year * 100 + dates.month.to_numpy()
     elif period == "YE":
-        return date.strftime("%Y")
+        return year
     else:
         raise ValueError("Invalid period")
 
-def calculate_portfolio_backtest(
-    symbols,
-    weights,
-    initial_balance,
-    start_date,
-    end_date,
-    rebalance_period="ME",
-    rebalance=True,
-    fee_rate=0.001,
-    slippage=0.0005,
-) -> dict:
+
+def simulate_portfolio(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    rebalance_mask: np.ndarray,
+    cost: float,
+    initial_balance: float,
+) -> np.ndarray:
+    """(날짜 × 자산) 수익률 행렬로 포트폴리오 가치 경로를 계산합니다.
+
+    rebalance_mask[i] 인 날은 그날 수익률을 반영한 뒤 총액을 목표 비중으로 재분배하고
+    (1 - cost) 를 곱합니다. 리밸런싱 사이 구간은 자산별 누적곱의 비율로 한 번에 계산합니다.
+    첫 행의 수익률은 사용하지 않습니다.
+
+    weights 가 (자산 × 조합) 행렬이고 cost 가 조합별 배열이면 모든 조합을 한 번에 계산해
+    (날짜 × 조합) 행렬을 반환합니다.
+    """
+    n = len(returns)
+    growth = np.ones_like(returns, dtype=float)
+    growth[1:] = np.cumprod(1 + returns[1:], axis=0)
+
+    rebalance_rows = np.flatnonzero(rebalance_mask[1:]) + 1
+    # 각 날짜가 속한 구간 번호 (그 이전 리밸런싱 횟수) 와 구간 시작 행
+    segment = np.searchsorted(rebalance_rows, np.arange(n), side="left")
+    segment_starts = np.concatenate(([0], rebalance_rows))
+
+    # 구간 시작 시점 대비 자산별 성장률을 목표 비중으로 합산
+    segment_growth = (growth / growth[segment_starts[segment]]) @ weights
+
+    # 구간 시작 평가액: 초기 잔액 × 이전 구간들의 (성장률 × 비용) 누적곱
+    end_factors = segment_growth[rebalance_rows] * (1 - cost)
+    base = initial_balance * np.concatenate(
+        (np.ones((1,) + end_factors.shape[1:]), np.cumprod(end_factors, axis=0))
+    )
+
+    # 리밸런싱 당일은 재분배한 총액 (기존 루프처럼 비중 합이 1 이 아니면 그만큼 늘거나 줄어듦)
+    values = base[segment] * segment_growth
+    values[rebalance_rows] *= (1 - cost) * weights.sum(axis=0)
+    values[0] = initial_balance
+    return values
+
+
+def load_returns(symbols, start_date, end_date, rebalance_period):
+    """리밸런싱 주기에 맞는 날짜 인덱스와 (날짜 × 자산) 수익률 행렬을 만듭니다.
+
+    반환값: (portfolio_dates, returns, effective_rebalance_period)
+    """
     # 날짜 파싱 및 유효성 검사
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
@@ -75,60 +109,75 @@ def calculate_portfolio_backtest(
     date_range_freq_map = {"D": "D", "W": "W-MON", "ME": "ME"}
     date_range_freq = date_range_freq_map[effective_rebalance_period]
     portfolio_dates = pd.date_range(start=start_date, end=end_date, freq=date_range_freq)
-    portfolio_df = pd.DataFrame(index=portfolio_dates)
 
     # 데이터 가져오기
     timeframe_map = {"D": "1d", "W": "1w", "ME": "1M"}
     timeframe = timeframe_map[effective_rebalance_period]
     data = fetch_data(symbols, timeframe, start_date, end_date)
 
-    # 각 자산의 수익률 계산 및 DataFrame 결합
-    for symbol in symbols:
+    # (날짜 × 자산) 수익률 행렬 구성. 데이터가 없는 자산은 수익률 0
+    returns = np.zeros((len(portfolio_dates), len(symbols)))
+    for j, symbol in enumerate(symbols):
         if symbol not in data or data[symbol].empty:
             continue
+        symbol_returns = data[symbol]["close"].pct_change().ffill()
+        returns[:, j] = symbol_returns.reindex(portfolio_dates, method="ffill").to_numpy()
+    returns = np.nan_to_num(returns)
+    return portfolio_dates, returns, effective_rebalance_period
+
+
+def get_rebalance_mask(dates: pd.DatetimeIndex, period: str, rebalance: bool) -> np.ndarray:
+    # 리밸런싱 시점: 기간 구분값이 바뀌는 날
+    rebalance_mask = np.zeros(len(dates), dtype=bool)
+    if rebalance:
+        period_keys = get_period_keys(dates, period)
+        rebalance_mask[1:] = period_keys[1:] != period_keys[:-1]
+    return rebalance_mask
 
-        df = data[symbol].copy()
-        df[f"{symbol}_return"] = df["close"].pct_change().ffill()
-        df = df.reindex(portfolio_df.index, method="ffill")
-        portfolio_df = portfolio_df.join(df[f"{symbol}_return"], how="left")
 
-    portfolio_df.fillna(0, inplace=True)
+def load_portfolio_returns(symbols, start_date, end_date, rebalance_period="ME", **_):
+    """포트폴리오 서비스의 로드 단계: 캔들을 가져와 (날짜, 수익률 행렬, 실제 주기) 를 만듭니다."""
+    return load_returns(symbols, start_date, end_date, rebalance_period)
+
+
+def compute_portfolio_backtest(
+    data,
+    symbols,
+    weights,
+    initial_balance,
+    start_date,
+    end_date,
+    rebalance_period="ME",
+    rebalance=True,
+    fee_rate=0.001,
+    slippage=0.0005,
+):
+    """불러온 수익률로 백테스트해 (요약 지표, 날짜별 포트폴리오 가치 Series) 를 반환합니다.
+
+    히스토리를 dict 로 만들지 응답으로 스트리밍할지는 호출하는 쪽이 정합니다.
+    """
+    portfolio_dates, returns, effective_rebalance_period = data
+
+    check_cancelled()
+    report_progress(0.5)
 
     # 가중치 유효성 검사
     for symbol in symbols:
         if symbol not in weights:
             raise ValueError(f"Weight not provided for symbol: {symbol}")
 
-    # 자산별 초기 가치 할당
-    asset_values = {symbol: initial_balance * weights[symbol] for symbol in symbols}
-    portfolio_df["Portfolio_Value"] = initial_balance
-    portfolio_df["Portfolio_Value"] = portfolio_df["Portfolio_Value"].astype(float)
-
-    # 초기 리밸런싱 기준 설정
-    prev_period = get_period_label(portfolio_df.index[0], effective_rebalance_period)
-
-    # 백테스트 진행
-    for i in range(1, len(portfolio_df)):
-        current_date = portfolio_df.index[i]
-        current_period = get_period_label(current_date, effective_rebalance_period)
-
-        # 각 자산의 가치 업데이트
-        for symbol in symbols:
-            daily_return = portfolio_df.iloc[i][f"{symbol}_return"]
-            if pd.isna(daily_return):
-                daily_return = 0
-            asset_values[symbol] *= 1 + daily_return
-
-        # 리밸런싱
-        if rebalance and current_period != prev_period:
-            total_value = sum(asset_values.values())
-            for symbol in symbols:
-                asset_values[symbol] = (total_value * weights[symbol]) * (1 - fee_rate - slippage)
-            prev_period = current_period
-
-        portfolio_df.iloc[i, portfolio_df.columns.get_loc("Portfolio_Value")] = float(
-            sum(asset_values.values())
-        )
+    rebalance_mask = get_rebalance_mask(
+        portfolio_dates, effective_rebalance_period, rebalance
+    )
+
+    values = simulate_portfolio(
+        returns,
+        np.array([weights[symbol] for symbol in symbols], dtype=float),
+        rebalance_mask,
+        fee_rate + slippage,
+        initial_balance,
+    )
+    portfolio_df = pd.DataFrame({"Portfolio_Value": values}, index=portfolio_dates)
 
     # MDD 계산
     peak = portfolio_df["Portfolio_Value"].cummax()
@@ -145,17 +194,336 @@ def calculate_portfolio_backtest(
     portfolio_returns = portfolio_df["Portfolio_Value"].pct_change().dropna()
     standard_deviation = np.std(portfolio_returns) * np.sqrt(365)  # 연율화
 
-    # 포트폴리오 가치 히스토리
-    portfolio_value_history = {
-        k.strftime("%Y-%m-%d"): v for k, v in portfolio_df["Portfolio_Value"].items()
-    }
-
-    return {
+    summary = {
         "initial_balance": initial_balance,
         "final_balance": round(end_value, 2),
         "roi": f"{roi:.2f}%",
         "mdd": round(mdd, 2),
         "cagr": f"{cagr * 100:.2f}%",
         "standard_deviation": round(standard_deviation, 4),  # 표준편차 추가
-        "portfolio_value_history": portfolio_value_history,
-    }
\ No newline at end of file
+    }
+    return summary, portfolio_df["Portfolio_Value"]
+
+
+run_portfolio_backtest = Staged(load_portfolio_returns, compute_portfolio_backtest)
+
+
+def compute_portfolio_backtest_dict(
+    data,
+    symbols,
+    weights,
+    initial_balance,
+    start_date,
+    end_date,
+    rebalance_period="ME",
+    rebalance=True,
+    fee_rate=0.001,
+    slippage=0.0005,
+) -> dict:
+    summary, history = compute_portfolio_backtest(
+        data,
+        symbols,
+        weights,
+        initial_balance,
+        start_date,
+        end_date,
+        rebalance_period,
+        rebalance,
+        fee_rate,
+        slippage,
+    )
+
+    # 포트폴리오 가치 히스토리
+    portfolio_value_history = {
+        k.strftime("%Y-%m-%d"): v for k, v in history.items()
+    }
+    return {**summary, "portfolio_value_history": portfolio_value_history}
+
+
+calculate_portfolio_backtest = Staged(load_portfolio_returns, compute_portfolio_backtest_dict)
+
+def summarize_values(
+    values: np.ndarray, dates: pd.DatetimeIndex, initial_balance, years=None
+) -> dict:
+    """(날짜 × 조합) 가치 행렬에서 조합별 요약 지표를 배열로 계산합니다.
+
+    calculate_portfolio_backtest 와 같은 방식 (MDD, ROI, CAGR, 연율화 표준편차) 입니다.
+    조합마다 기간이 다르면 (walk-forward 창) 조합별 연수 years 로 CAGR 을 계산합니다.
+    """
+    peak = np.maximum.accumulate(values, axis=0)
+    mdd = ((values - peak) / peak).min(axis=0) * 100
+
+    end_value = values[-1]
+    roi = (end_value - initial_balance) / initial_balance * 100
+    if years is None:
+        num_years = max((dates[-1] - dates[0]).days / 365.0, 0.01)
+    else:
+        num_years = np.maximum(years, 0.01)
+    cagr = (end_value / initial_balance) ** (1 / num_years) - 1
+
+    if len(values) > 1:
+        standard_deviation = np.std(values[1:] / values[:-1] - 1, axis=0) * np.sqrt(365)
+    else:
+        standard_deviation = np.full(values.shape[1], np.nan)
+
+    return {
+        "final_balance": end_value,
+        "roi": roi,
+        "mdd": mdd,
+        "cagr": cagr,
+        "standard_deviation": standard_deviation,
+    }
+
+
+def _effective_periods(combinations) -> list:
+    # YE 는 ME 데이터를 사용합니다
+    return [
+        "ME" if c["rebalance_period"] == "YE" else c["rebalance_period"]
+        for c in combinations
+    ]
+
+
+def load_sweep_returns(start_date, end_date, combinations, **_) -> dict:
+    """스윕의 로드 단계: 실제로 쓰는 주기별로 (날짜, 수익률 행렬) 을 한 번씩 만듭니다."""
+    symbols = list(dict.fromkeys(s for c in combinations for s in c["weights"]))
+    return {
+        period: load_returns(symbols, start_date, end_date, period)[:2]
+        for period in dict.fromkeys(_effective_periods(combinations))
+    }
+
+
+def compute_portfolio_sweep(
+    data,
+    initial_balance,
+    start_date,
+    end_date,
+    combinations,
+    top_n=0,
+) -> dict:
+    """여러 비중/파라미터 조합을 한 번의 데이터 로드와 행렬 연산으로 백테스트합니다.
+
+    combinations 는 weights, rebalance_period, rebalance, fee_rate, slippage 를 가진 dict 목록이며,
+    조합에 없는 자산의 비중은 0 으로 봅니다. 같은 주기의 조합은 같은 수익률 행렬을 공유하고,
+    같은 리밸런싱 시점을 가지는 조합끼리 묶어 simulate_portfolio 를 한 번만 호출합니다.
+    결과는 입력 순서대로 요약 지표를 돌려주고, 최종 잔액 기준 상위 top_n 조합의 히스토리를 함께 반환합니다.
+    """
+    symbols = list(dict.fromkeys(s for c in combinations for s in c["weights"]))
+    weight_matrix = np.array(
+        [[c["weights"].get(symbol, 0.0) for c in combinations] for symbol in symbols],
+        dtype=float,
+    )
+    costs = np.array([c["fee_rate"] + c["slippage"] for c in combinations], dtype=float)
+
+    final_balance = np.zeros(len(combinations))
+    metrics = {}
+    histories = {}
+
+    # 실제로 사용하는 주기별 (날짜, 수익률) 은 로드 단계에서 한 번씩만 만들어 둡니다
+    effective_periods = _effective_periods(combinations)
+    for step, (period, (dates, returns)) in enumerate(data.items()):
+        report_progress(step / len(data))
+        for rebalance in (True, False):
+            check_cancelled()
+            idx = np.array(
+                [
+                    i
+                    for i, c in enumerate(combinations)
+                    if effective_periods[i] == period and c["rebalance"] == rebalance
+                ],
+                dtype=int,
+            )
+            if len(idx) == 0:
+                continue
+
+            mask = get_rebalance_mask(dates, period, rebalance)
+            values = simulate_portfolio(
+                returns, weight_matrix[:, idx], mask, costs[idx], initial_balance
+            )
+            summary = summarize_values(values, dates, initial_balance)
+            for k, i in enumerate(idx):
+                metrics[i] = {name: column[k] for name, column in summary.items()}
+                final_balance[i] = summary["final_balance"][k]
+                histories[i] = (dates, values[:, k])
+
+    results = [
+        {
+            "index": i,
+            "final_balance": round(float(m["final_balance"]), 2),
+            "roi": f"{m['roi']:.2f}%",
+            "mdd": round(float(m["mdd"]), 2),
+            "cagr": f"{m['cagr'] * 100:.2f}%",
+            "standard_deviation": round(float(m["standard_deviation"]), 4),
+        }
+        for i, m in sorted(metrics.items())
+    ]
+
+    # 최종 잔액이 큰 순서 (같으면 입력 순서)
+    top = np.argsort(-final_balance, kind="stable")[:top_n]
+    top_histories = [
+        {
+            "index": int(i),
+            "portfolio_value_history": {
+                date.strftime("%Y-%m-%d"): float(value)
+                for date, value in zip(*histories[i])
+            },
+        }
+        for i in top
+    ]
+
+    return {
+        "symbols": symbols,
+        "initial_balance": initial_balance,
+        "results": results,
+        "top": top_histories,
+    }
+
+
+calculate_portfolio_sweep = Staged(load_sweep_returns, compute_portfolio_sweep)
+
+
+def simulate_windows(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    rebalance_mask: np.ndarray,
+    cost: float,
+    initial_balance: float,
+    starts: np.ndarray,
+    window: int,
+) -> np.ndarray:
+    """starts 의 각 행에서 시작해 window 행 동안 운용한 포트폴리오 가치를 (window × 창) 행렬로 계산합니다.
+
+    각 창은 그 구간만 simulate_portfolio 로 백테스트한 것과 같습니다. 창을 따로 시뮬레이션하지 않고
+    전체 구간의 자산별 누적곱(growth)과 전체 포트폴리오 경로(V) 하나로 계산합니다.
+    창의 첫 리밸런싱 r 전까지는 시작 행 대비 성장률을 목표 비중으로 합산하고,
+    r 부터는 목표 비중으로 돌아가므로 전체 경로와 비례합니다: value(t) = value(r) × V(t) / V(r).
+    """
+    growth = np.ones_like(returns, dtype=float)
+    growth[1:] = np.cumprod(1 + returns[1:], axis=0)
+    path = simulate_portfolio(returns, weights, rebalance_mask, cost, 1.0)
+
+    # 각 창이 시작한 뒤 첫 리밸런싱 행 (없으면 창 밖)
+    rebalance_rows = np.flatnonzero(rebalance_mask[1:]) + 1
+    following = np.searchsorted(rebalance_rows, starts, side="right")
+    first_rebalance = np.append(rebalance_rows, len(returns))[following]
+
+    offsets = np.arange(window)
+    rows = starts[:, None] + offsets
+    # 창 시작 시점 대비 성장률의 목표 비중 합: Σ_j w_j × growth[t, j] / growth[s, j]
+    values = np.einsum("kta,ka->kt", growth[rows], weights / growth[starts])
+
+    since = first_rebalance - starts
+    rebalanced = offsets >= since[:, None]
+    if rebalanced.any():
+        at_rebalance = values[np.arange(len(starts)), np.minimum(since, window - 1)]
+        at_rebalance *= (1 - cost) * weights.sum()
+        scale = at_rebalance / path[np.minimum(first_rebalance, len(returns) - 1)]
+        values = np.where(rebalanced, path[rows] * scale[:, None], values)
+    # 첫 행은 비중 합과 관계없이 초기 잔액 (simulate_portfolio 와 같음)
+    values[:, 0] = 1
+    return initial_balance * values.T
+
+
+def _distribution(values: np.ndarray) -> dict:
+    q = np.percentile(values, [5, 25, 50, 75, 95])
+    return {
+        "mean": round(float(np.mean(values)), 4),
+        "std": round(float(np.std(values)), 4),
+        "min": round(float(np.min(values)), 4),
+        "p5": round(float(q[0]), 4),
+        "p25": round(float(q[1]), 4),
+        "median": round(float(q[2]), 4),
+        "p75": round(float(q[3]), 4),
+        "p95": round(float(q[4]), 4),
+        "max": round(float(np.max(values)), 4),
+    }
+
+
+def compute_portfolio_walk_forward(
+    data,
+    symbols,
+    weights,
+    initial_balance,
+    start_date,
+    end_date,
+    rebalance_period="ME",
+    rebalance=True,
+    fee_rate=0.001,
+    slippage=0.0005,
+    window=12,
+    step=1,
+) -> dict:
+    """start_date~end_date 안에서 window 행짜리 창을 step 행씩 옮기며 백테스트하고 결과 분포를 반환합니다.
+
+    행은 리밸런싱 주기의 날짜 격자 (D: 일, W: 주, ME/YE: 월) 입니다. 데이터는 한 번만 불러와
+    모든 창이 같은 수익률 행렬을 쓰고, 창들은 simulate_windows 로 묶어서 계산합니다.
+    창별 지표 (ROI, CAGR, MDD, 연율화 표준편차) 와 지표별 분포 (평균, 분위수) 를 돌려줍니다.
+    """
+    portfolio_dates, returns, effective_rebalance_period = data
+    check_cancelled()
+
+    for symbol in symbols:
+        if symbol not in weights:
+            raise ValueError(f"Weight not provided for symbol: {symbol}")
+    if window > len(portfolio_dates):
+        raise HTTPException(
+            status_code=400,
+            detail=f"window ({window}) is longer than the date range ({len(portfolio_dates)} periods)",
+        )
+    starts = np.arange(0, len(portfolio_dates) - window + 1, step)
+    if len(starts) > settings.PORTFOLIO_WALK_FORWARD_MAX_WINDOWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many windows ({len(starts)}); increase step or window",
+        )
+
+    rebalance_mask = get_rebalance_mask(
+        portfolio_dates, effective_rebalance_period, rebalance
+    )
+    weight_vector = np.array([weights[symbol] for symbol in symbols], dtype=float)
+    cost = fee_rate + slippage
+    days = (portfolio_dates - portfolio_dates[0]).days.to_numpy()
+
+    # 임시 배열 (창 × 행 × 자산) 이 청크 크기를 넘지 않도록 창을 나눠 계산합니다
+    chunk = max(1, settings.PORTFOLIO_WALK_FORWARD_CHUNK_ELEMENTS // (window * len(symbols)))
+    summaries = []
+    for offset in range(0, len(starts), chunk):
+        check_cancelled()
+        report_progress(offset / len(starts))
+        chunk_starts = starts[offset : offset + chunk]
+        values = simulate_windows(
+            returns, weight_vector, rebalance_mask, cost, initial_balance, chunk_starts, window
+        )
+        years = (days[chunk_starts + window - 1] - days[chunk_starts]) / 365.0
+        summaries.append(summarize_values(values, portfolio_dates, initial_balance, years))
+    metrics = {
+        name: np.concatenate([summary[name] for summary in summaries])
+        for name in summaries[0]
+    }
+    metrics["cagr"] = metrics["cagr"] * 100
+
+    windows = [
+        {
+            "start_date": portfolio_dates[s].strftime("%Y-%m-%d"),
+            "end_date": portfolio_dates[s + window - 1].strftime("%Y-%m-%d"),
+            "final_balance": round(float(metrics["final_balance"][i]), 2),
+            "roi": f"{metrics['roi'][i]:.2f}%",
+            "mdd": round(float(metrics["mdd"][i]), 2),
+            "cagr": f"{metrics['cagr'][i]:.2f}%",
+            "standard_deviation": round(float(metrics["standard_deviation"][i]), 4),
+        }
+        for i, s in enumerate(starts)
+    ]
+
+    return {
+        "initial_balance": initial_balance,
+        "window": window,
+        "step": step,
+        "count": len(windows),
+        "positive_roi_ratio": round(float(np.mean(metrics["roi"] > 0)), 4),
+        # roi, cagr, mdd 는 % 단위
+        "distribution": {name: _distribution(column) for name, column in metrics.items()},
+        "windows": windows,
+    }
+
+
+calculate_portfolio_walk_forward = Staged(load_portfolio_returns, compute_portfolio_walk_forward)
@@ -0,0 +1,348 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from typing import Optional
+
+import ccxt.async_support as ccxt_async
+import numpy as np
+import pandas as pd
+
+from app.core.cancellation import TaskCancelled, is_cancelled
+from app.core.candle_store import OHLCV_COLUMNS, candle_store
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics, track_upstream
+from app.core.resample import (
+    TIMEFRAME_MILLIS,
+    bin_end,
+    bin_starts,
+    resample_ohlcv,
+    resample_sources,
+)
+from app.core.return_index import ReturnWindow, return_index
+
+logger = get_logger()
+
+# 바이낸스 현물 klines 한 번에 받을 수 있는 최대 캔들 수 (더 크게 요청해도 1000개로 잘립니다)
+PAGE_LIMIT = 1000
+# 시세를 기다리는 동안 작업 취소 여부를 확인하는 간격 (초)
+CANCEL_POLL_SECONDS = 0.1
+
+
+class RateLimiter:
+    """요청 시작 간격을 최소 interval 초로 벌려 주는 리미터 (클라이언트 이벤트 루프 안에서만 사용)."""
+
+    def __init__(self):
+        self._next_at = 0.0
+
+    async def wait(self, interval: float) -> None:
+        now = time.monotonic()
+        start_at = max(now, self._next_at)
+        self._next_at = start_at + interval
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 작업을 하나의 실행으로 합칩니다 (이벤트 루프 안에서만 사용)."""
+
+    def __init__(self):
+        self._inflight: dict = {}
+
+    async def do(self, key, factory):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 기다리던 요청 하나가 취소되어도 공유 작업은 계속 진행되도록 합니다
+        return await asyncio.shield(task)
+
+
+class MarketDataClient:
+    """프로세스당 하나의 거래소 인스턴스와 전용 이벤트 루프를 소유하는 시세 클라이언트.
+
+    모든 캔들 요청은 이 클라이언트를 거치므로 요청 간격(rate limit)과 동시 요청 수가
+    프로세스 전체에서 하나의 예산으로 관리되고, 같은 구간에 대한 동시 요청은 한 번만 실행됩니다.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        # 요청 간격은 rate_limiter 가 관리하므로 ccxt 자체 스로틀은 끕니다
+        self.exchange = ccxt_async.binance({"enableRateLimit": False})
+        self.rate_limiter = RateLimiter()
+        self.inflight = SingleFlight()
+        self._semaphore = None
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        threading.Thread(
+            target=self.loop.run_forever, name="market-data-loop", daemon=True
+        ).start()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.OHLCV_FETCH_CONCURRENCY)
+        return self._semaphore
+
+    def lock(self, symbol: str, timeframe: str) -> asyncio.Lock:
+        return self._locks.setdefault((symbol, timeframe), asyncio.Lock())
+
+    def run(self, coro):
+        """동기 코드(이벤트 루프 안에서 호출되는 경우 포함)에서 코루틴을 실행하고 결과를 기다립니다.
+
+        기다리는 작업이 취소되면 코루틴을 취소하고 TaskCancelled 를 발생시킵니다.
+        이미 다른 요청과 공유 중인 fetch 는 SingleFlight 가 보호하므로 계속 진행됩니다.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        while True:
+            done, _ = concurrent.futures.wait([future], timeout=CANCEL_POLL_SECONDS)
+            if done:
+                return future.result()
+            if is_cancelled():
+                future.cancel()
+                raise TaskCancelled()
+
+    async def run_async(self, coro):
+        """다른 이벤트 루프(예: uvicorn)에서 코루틴을 클라이언트 루프로 넘겨 기다립니다."""
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+        )
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MarketDataClient:
+    # 프로세스 풀 워커처럼 fork 된 프로세스에서는 루프 스레드가 없으므로 새로 만듭니다
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = MarketDataClient()
+            _client_pid = os.getpid()
+    return _client
+
+
+async def ensure_markets(client: MarketDataClient) -> None:
+    """마켓 정보를 아직 불러오지 못했으면 불러옵니다. 동시에 호출되어도 한 번만 요청합니다."""
+    if client.exchange.markets:
+        return
+
+    async def load():
+        with track_upstream("binance"):
+            await client.exchange.load_markets()
+
+    await client.inflight.do(("markets",), load)
+
+
+async def startup() -> None:
+    """앱 시작 시 마켓 정보를 미리 불러옵니다.
+
+    거래소에 연결할 수 없어도 앱은 뜨고, 첫 캔들 조회 때 ensure_markets 로 다시 시도합니다.
+    """
+    client = get_client()
+    try:
+        await client.run_async(ensure_markets(client))
+    except ccxt_async.BaseError as e:
+        logger.warning(f"Loading Binance markets failed, retrying on first request: {e}")
+
+
+async def shutdown() -> None:
+    client = get_client()
+    await client.run_async(client.exchange.close())
+
+
+def to_millis(date: str) -> int:
+    return int(pd.Timestamp(date).value // 1_000_000)
+
+
+def timeframe_millis(exchange, timeframe: str) -> int:
+    return exchange.parse_timeframe(timeframe) * 1000
+
+
+def last_closed_millis(exchange, timeframe: str) -> int:
+    """이미 마감된 캔들만 coverage 로 인정하기 위한 기준 시각 (ms)."""
+    duration = timeframe_millis(exchange, timeframe)
+    if timeframe.endswith("M"):
+        # 월봉은 최대 31일이므로 여유를 둡니다
+        duration = 31 * 24 * 60 * 60 * 1000
+    return int(time.time() * 1000) - duration
+
+
+def page_starts(exchange, timeframe: str, since: int, until: int) -> list[int]:
+    """[since, until] 을 PAGE_LIMIT 개 캔들 단위의 페이지 시작 시각으로 나눕니다."""
+    step = PAGE_LIMIT * timeframe_millis(exchange, timeframe)
+    return list(range(since, until + 1, step))
+
+
+def stitch_pages(exchange, timeframe: str, pages: list, until: int):
+    """페이지를 이어 붙이고 중복을 제거한 뒤, 실제로 확인된 구간의 끝 (마감된 캔들 기준) 을 함께 반환합니다."""
+    rows = np.concatenate(
+        [
+            np.asarray(page, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+            for page in pages
+        ]
+    )
+    _, first = np.unique(rows[:, 0], return_index=True)
+    rows = rows[first]
+
+    covered_until = min(until, last_closed_millis(exchange, timeframe))
+    return rows[rows[:, 0] <= until], covered_until
+
+
+def store_fetched(
+    symbol: str, timeframe: str, rows: np.ndarray, since: int, covered_until: int
+) -> None:
+    # 진행 중인 캔들만 받은 경우 저장은 하되 coverage 는 늘리지 않습니다
+    covered = (since, covered_until) if covered_until >= since else None
+    candle_store.merge(symbol, timeframe, rows, covered)
+
+
+def to_frame(rows: np.ndarray) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"].astype("int64"), unit="ms")
+    df.set_index("timestamp", inplace=True)
+    return df
+
+
+def resample_from_store(
+    exchange, symbol: str, timeframe: str, since: int, until: int
+) -> Optional[np.ndarray]:
+    """저장소에 [since, until] 을 빠짐없이 덮는 더 짧은 타임프레임이 있으면 합성한 캔들을 반환합니다.
+
+    마지막 캔들이 끝나는 시점 (진행 중이면 마감된 캔들까지) 이 coverage 안에 있어야 하며,
+    그런 타임프레임이 없으면 None 을 반환해 거래소에서 가져오도록 합니다.
+    """
+    last_start = int(bin_starts(np.array([until]), timeframe)[0])
+    if last_start < since:
+        return None
+    end = bin_end(last_start, timeframe)
+
+    for base in resample_sources(timeframe):
+        covered = candle_store.coverage(symbol, base)
+        if covered is None:
+            continue
+        needed = min(end - TIMEFRAME_MILLIS[base], last_closed_millis(exchange, base))
+        if covered[0] <= since and covered[1] >= needed:
+            rows = resample_ohlcv(candle_store.read(symbol, base, since, end - 1), timeframe)
+            return rows[(rows[:, 0] >= since) & (rows[:, 0] <= until)]
+    return None
+
+
+async def fetch_page(client: MarketDataClient, symbol: str, timeframe: str, since: int):
+    exchange = client.exchange
+
+    async def fetch():
+        async with client.semaphore:
+            await client.rate_limiter.wait(exchange.rateLimit / 1000)
+            with track_upstream("binance"):
+                return await exchange.fetch_ohlcv(
+                    symbol, timeframe, since, limit=PAGE_LIMIT
+                )
+
+    return await client.inflight.do(("page", symbol, timeframe, since), fetch)
+
+
+async def fetch_range(
+    client: MarketDataClient, symbol: str, timeframe: str, since: int, until: int
+):
+    """[since, until] 구간을 페이지로 나눠 동시에 가져옵니다."""
+    await ensure_markets(client)
+    exchange = client.exchange
+    pages = await asyncio.gather(
+        *(
+            fetch_page(client, symbol, timeframe, start)
+            for start in page_starts(exchange, timeframe, since, until)
+        )
+    )
+    return stitch_pages(exchange, timeframe, pages, until)
+
+
+async def load_ohlcv_async(
+    symbol: str, timeframe: str, start_date: str, end_date: str
+) -> pd.DataFrame:
+    """로컬 캔들 저장소를 우선 사용하고, 비어 있는 구간만 거래소에서 가져와 추가합니다.
+
+    요청한 타임프레임이 저장소에 없어도 더 짧은 타임프레임이 구간을 덮고 있으면
+    거래소를 호출하지 않고 그 캔들을 합쳐 만듭니다 (예: 일봉에서 월봉).
+
+    클라이언트 이벤트 루프 안에서 실행되어야 합니다.
+    """
+    client = get_client()
+    since, until = to_millis(start_date), to_millis(end_date)
+
+    async def load():
+        async with client.lock(symbol, timeframe):
+            missing = candle_store.missing_ranges(symbol, timeframe, since, until)
+            source = "upstream" if missing else "store"
+            if missing:
+                rows = resample_from_store(
+                    client.exchange, symbol, timeframe, since, until
+                )
+                if rows is not None:
+                    metrics.inc("candle_requests_total", {"source": "resampled"})
+                    return rows
+            metrics.inc("candle_requests_total", {"source": source})
+
+            for lo, hi in missing:
+                rows, covered_until = await fetch_range(
+                    client, symbol, timeframe, lo, hi
+                )
+                store_fetched(symbol, timeframe, rows, lo, covered_until)
+
+            return candle_store.read(symbol, timeframe, since, until)
+
+    rows = await client.inflight.do(("range", symbol, timeframe, since, until), load)
+    return to_frame(rows)
+
+
+def load_ohlcv(
+    symbol: str, timeframe: str, start_date: str, end_date: str
+) -> pd.DataFrame:
+    return get_client().run(load_ohlcv_async(symbol, timeframe, start_date, end_date))
+
+
+def load_return_window(
+    symbol: str, timeframe: str, start_date: str, end_date: str
+) -> Optional[ReturnWindow]:
+    """[start_date, end_date] 종가 수익률 통계를 수익률 인덱스에서 캔들을 읽지 않고 가져옵니다.
+
+    저장소가 구간을 덮고 있으면 거래소도 저장소 파일도 건드리지 않습니다. 빠진 구간이 있으면
+    load_ohlcv 로 채운 뒤 인덱스를 쓰고, 더 짧은 타임프레임에서 합성한 캔들처럼 저장소에 없는
+    캔들이면 받은 DataFrame 으로 통계를 만듭니다. 구간에 캔들이 없으면 None 을 반환합니다.
+    """
+    since, until = to_millis(start_date), to_millis(end_date)
+    if not candle_store.missing_ranges(symbol, timeframe, since, until):
+        metrics.inc("candle_requests_total", {"source": "index"})
+        return return_index.window(symbol, timeframe, since, until)
+
+    df = load_ohlcv(symbol, timeframe, start_date, end_date)
+    window = return_index.window(symbol, timeframe, since, until)
+    if window is not None and window.candles == len(df):
+        return window
+    return ReturnWindow.from_frame(df)
+
+
+def load_ohlcv_many(
+    symbols: list[str], timeframe: str, start_date: str, end_date: str
+) -> dict:
+    """여러 심볼을 동시에 가져옵니다.
+
+    심볼별 DataFrame 또는 발생한 예외를 담은 dict 를 반환하므로,
+    오류 처리 방식은 호출하는 쪽이 심볼 순서대로 정합니다.
+    """
+
+    async def gather():
+        results = await asyncio.gather(
+            *(
+                load_ohlcv_async(symbol, timeframe, start_date, end_date)
+                for symbol in symbols
+            ),
+            return_exceptions=True,
+        )
+        return dict(zip(symbols, results))
+
+    return get_client().run(gather())
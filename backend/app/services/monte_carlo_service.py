@@ -1,77 +1,538 @@
+import hashlib
+import warnings
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import ccxt
-
-exchange = ccxt.binance()
-
-def fetch_data(symbol: str, timeframe: str, start_date: str, end_date: str) -> pd.DataFrame:
-    since = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
-    ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since, limit=2000)
-    if not ohlcv:
-        raise ValueError(f"No data for {symbol}")
-    
-    df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    df.set_index("timestamp", inplace=True)
-    df = df[(df.index >= start_date) & (df.index <= end_date)]
-    if df.empty:
-        raise ValueError(f"Empty data for {symbol}")
-    return df
+from typing import Optional
+from fastapi import HTTPException
+from scipy.stats import norm, qmc, t
+
+from app.core.cache import result_cache
+from app.core.cancellation import check_cancelled, report_progress
+from app.core.config import settings
+from app.core.executor import Staged
+from app.services.backtest_service import get_rebalance_mask, load_returns
+from app.services.market_data_service import load_return_window
+
 
 def calculate_monte_carlo_stats(symbol: str, timeframe: str, start_date: str, end_date: str):
-    df = fetch_data(symbol, timeframe, start_date, end_date)
-    
-    df["returns"] = df["close"].pct_change().fillna(0)
-    daily_mean = df["returns"].mean()
-    daily_std = df["returns"].std()
-    current_price = df["close"].iloc[-1]
-    
+    """수익률 인덱스의 누적합으로 구간 평균/표준편차를 O(1) 에 구합니다.
+
+    기존 계산(pct_change().fillna(0) 의 mean/std)과 같도록 첫 캔들의 수익률을 0 으로 셉니다.
+    """
+    window = load_return_window(symbol, timeframe, start_date, end_date)
+    if window is None:
+        raise ValueError(f"Empty data for {symbol}")
+
+    n = window.candles
+    daily_mean = window.sum / n
+    daily_std = (
+        np.sqrt(max(window.sum_of_squares - window.sum**2 / n, 0.0) / (n - 1))
+        if n > 1
+        else float("nan")
+    )
+
     return {
         "daily_mean": daily_mean,
         "daily_std": daily_std,
-        "current_price": current_price
+        "current_price": window.last_price,
+        # 부트스트랩용 실제 수익률 이력 (첫 캔들의 빈 수익률 제외)
+        "returns": window.returns,
     }
 
-def monte_carlo_simulation(initial_price: float, daily_mean: float, daily_std: float, target_return: float, days: int = 30, simulations: int = 1000):
-    final_prices = []
-    for _ in range(simulations):
-        price = initial_price
-        for _ in range(days):
-            daily_return = np.random.normal(daily_mean, daily_std)
-            price *= (1 + daily_return)
-        final_prices.append(price)
-    
-    final_prices = np.array(final_prices)
-    predicted_price = np.mean(final_prices)
+class _Moments:
+    """표본 Y 와 대조 변수 C 의 합/제곱합/곱의 합을 청크마다 누적합니다 (그룹별).
+
+    그룹은 Sobol 의 독립 스크램블 반복마다 하나이고, 의사난수 표본은 그룹 하나입니다.
+    """
+
+    def __init__(self, groups: int):
+        self.sums = np.zeros((groups, 6))  # n, Σy, Σc, Σy², Σc², Σyc
+
+    def add(self, group: int, y: np.ndarray, c: np.ndarray) -> None:
+        self.sums[group] += (len(y), y.sum(), c.sum(), y @ y, c @ c, y @ c)
+
+    def estimate(self, control_mean: Optional[float]) -> tuple[float, float]:
+        """(추정값, 표준오차). control_mean 이 있으면 최적 계수로 대조 변수를 적용합니다."""
+        n, sy, sc, syy, scc, syc = self.sums.sum(axis=0)
+        var_y = syy / n - (sy / n) ** 2
+        var_c = scc / n - (sc / n) ** 2
+        cov = syc / n - (sy / n) * (sc / n)
+        beta = cov / var_c if control_mean is not None and var_c > 0 else 0.0
+
+        counts = self.sums[:, 0]
+        group_means = self.sums[:, 1] / counts
+        if beta:
+            group_means = group_means - beta * (self.sums[:, 2] / counts - control_mean)
+        estimate = float(np.average(group_means, weights=counts))
+
+        if len(counts) > 1:
+            # 무작위화한 준난수: 독립 반복들의 추정값 분산으로 오차를 계산합니다
+            error = np.std(group_means, ddof=1) / np.sqrt(len(counts))
+        else:
+            residual = max(var_y - 2 * beta * cov + beta**2 * var_c, 0.0)
+            error = np.sqrt(residual / max(n - 1, 1))
+        return estimate, float(error)
+
+
+def spawn_streams(seed, count: int) -> list[np.random.Generator]:
+    """seed (정수 또는 SeedSequence) 에서 서로 독립인 난수 스트림 count 개를 만듭니다.
+
+    청크/워커마다 자기 스트림을 쓰므로 실행 순서와 상관없이 같은 seed 는 같은 결과를 냅니다.
+    seed 가 None 이면 매번 새 엔트로피를 씁니다.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(count)]
+
+
+def _standard_normals(rng, engine, size: int, days: int, antithetic: bool) -> np.ndarray:
+    """(size, days) 표준정규 난수. antithetic 이면 앞 절반의 부호를 뒤집어 뒤 절반을 만듭니다."""
+    half = (size + 1) // 2 if antithetic else size
+    if engine is not None:
+        with warnings.catch_warnings():
+            # 청크 크기가 2의 거듭제곱이 아니어도 스크램블 Sobol 은 편향이 없습니다
+            warnings.simplefilter("ignore", UserWarning)
+            uniforms = engine.random(half)
+        z = norm.ppf(np.clip(uniforms, 1e-12, 1 - 1e-12))
+    else:
+        z = rng.standard_normal((half, days))
+    return np.concatenate([z, -z]) if antithetic else z
+
+
+def monte_carlo_simulation(
+    initial_price: float,
+    daily_mean: float,
+    daily_std: float,
+    target_return: float,
+    days: int = 30,
+    simulations: int = 1000,
+    antithetic: bool = False,
+    control_variate: bool = False,
+    sampling: str = "random",
+    confidence_level: float = 0.95,
+    seed: Optional[int] = None,
+):
+    """정규분포 일간 수익률로 최종 가격을 시뮬레이션합니다.
+
+    (경로 × 일수) 수익률 행렬을 한 번에 뽑아 곱으로 최종 가격을 구하고,
+    메모리 사용량이 simulations 에 비례하지 않도록 MONTE_CARLO_CHUNK_ELEMENTS 단위로 나눠 집계합니다.
+    요청이 취소되면 다음 청크를 시작하기 전에 멈춥니다.
+
+    분산 감소 기법은 함께 쓸 수 있습니다.
+    - antithetic: 난수 Z 와 -Z 로 만든 두 경로의 평균을 표본 하나로 씁니다.
+    - control_variate: 같은 난수로 만든 GBM 최종 가격(기댓값/목표 도달 확률의 닫힌 해가 있음)을
+      대조 변수로 써서 추정값을 보정합니다.
+    - sampling="sobol": 스크램블 Sobol 준난수를 MONTE_CARLO_SOBOL_REPLICATES 번 독립 반복하고,
+      반복 간 분산으로 표준오차를 계산합니다.
+    예측 가격과 목표 도달 확률에는 표준오차와 confidence_level 신뢰구간을 함께 반환합니다.
+    seed 를 주면 반복(그룹)과 청크마다 spawn 한 독립 스트림을 써서 결과가 재현됩니다.
+    """
     target_price = initial_price * (1 + target_return)
-    probability_above_target = np.mean(final_prices >= target_price)
-    min_price = np.min(final_prices)
-    max_price = np.max(final_prices)
-    
+    chunk_size = max(2, settings.MONTE_CARLO_CHUNK_ELEMENTS // days)
+    if antithetic:
+        chunk_size -= chunk_size % 2
+
+    # 대조 변수: 같은 Z 로 만든 GBM 최종 가격 S0·exp((μ - σ²/2)T + σΣZ)
+    drift = (daily_mean - daily_std**2 / 2) * days
+    use_control = control_variate and daily_std > 0 and initial_price > 0 and target_price > 0
+    if use_control:
+        with np.errstate(over="ignore"):
+            gbm_mean = initial_price * np.exp(daily_mean * days)
+        gbm_hit = norm.cdf((np.log(initial_price / target_price) + drift) / (daily_std * np.sqrt(days)))
+        use_control = bool(np.isfinite(gbm_mean))
+
+    groups = min(settings.MONTE_CARLO_SOBOL_REPLICATES, simulations) if sampling == "sobol" else 1
+    group_seeds = np.random.SeedSequence(seed).spawn(groups)
+    price_moments = _Moments(groups)
+    hit_moments = _Moments(groups)
+
+    done = 0
+    min_price = np.inf
+    max_price = -np.inf
+    for group, group_seed in enumerate(group_seeds):
+        group_size = simulations // groups + (group < simulations % groups)
+        chunk_starts = range(0, group_size, chunk_size)
+        streams = spawn_streams(group_seed, len(chunk_starts) + 1)
+        # Sobol 스크램블은 그룹 스트림 하나로, 의사난수는 청크마다 다른 스트림으로 만듭니다
+        engine = (
+            qmc.Sobol(d=days, scramble=True, seed=streams[-1]) if sampling == "sobol" else None
+        )
+        for start, rng in zip(chunk_starts, streams):
+            check_cancelled()
+            report_progress(done / simulations)
+            size = min(chunk_size, group_size - start)
+            z = _standard_normals(rng, engine, size, days, antithetic)
+            growth = z * daily_std
+            growth += 1 + daily_mean
+            final_prices = initial_price * np.prod(growth, axis=1)
+            hits = (final_prices >= target_price).astype(np.float64)
+            min_price = min(min_price, final_prices.min())
+            max_price = max(max_price, final_prices.max())
+
+            if use_control:
+                with np.errstate(over="ignore"):
+                    gbm = initial_price * np.exp(drift + daily_std * z.sum(axis=1))
+                gbm_hits = (gbm >= target_price).astype(np.float64)
+            else:
+                gbm = gbm_hits = np.zeros_like(final_prices)
+
+            if antithetic:
+                # 짝지은 두 경로의 평균이 서로 독립인 표본 하나입니다
+                pairs = len(final_prices) // 2
+                final_prices, hits, gbm, gbm_hits = (
+                    (a[:pairs] + a[pairs:]) / 2 for a in (final_prices, hits, gbm, gbm_hits)
+                )
+            price_moments.add(group, final_prices, gbm)
+            hit_moments.add(group, hits, gbm_hits)
+            done += size
+
+    predicted_price, price_error = price_moments.estimate(gbm_mean if use_control else None)
+    probability, probability_error = hit_moments.estimate(gbm_hit if use_control else None)
+    return _summarize(
+        predicted_price, price_error, probability, probability_error,
+        min_price, max_price, confidence_level, replicates=groups,
+    )
+
+
+def _summarize(
+    predicted_price: float,
+    price_error: float,
+    probability: float,
+    probability_error: float,
+    min_price: float,
+    max_price: float,
+    confidence_level: float,
+    name: str = "price",
+    replicates: int = 1,
+) -> dict:
+    """추정값/표준오차로 신뢰구간을 만들어 응답 형식으로 정리합니다. name 은 가격/가치 필드 이름입니다.
+
+    표준오차를 독립 반복 replicates 개 (Sobol 스크램블) 의 분산으로 구했으면 자유도 replicates - 1 의
+    t 분위수를, 경로별 표본으로 구했으면 정규 분위수를 씁니다.
+    """
+    probability = min(max(probability, 0.0), 1.0)
+    quantile = 0.5 + confidence_level / 2
+    z_score = t.ppf(quantile, replicates - 1) if replicates > 1 else norm.ppf(quantile)
+    price_ci = (predicted_price - z_score * price_error, predicted_price + z_score * price_error)
+    probability_ci = (
+        max(probability - z_score * probability_error, 0.0),
+        min(probability + z_score * probability_error, 1.0),
+    )
+
     return {
-        "predicted_price": round(predicted_price, 2),
-        "probability_above_target": round(probability_above_target * 100, 2),
-        "min_price": round(min_price, 2),
-        "max_price": round(max_price, 2)
+        f"predicted_{name}": round(predicted_price, 2),
+        "probability_above_target": round(probability * 100, 2),
+        f"min_{name}": round(min_price, 2),
+        f"max_{name}": round(max_price, 2),
+        f"predicted_{name}_se": round(price_error, 4),
+        f"predicted_{name}_ci": [round(v, 4) for v in price_ci],
+        "probability_above_target_se": round(probability_error * 100, 4),
+        "probability_above_target_ci": [round(v * 100, 4) for v in probability_ci],
+        "confidence_level": confidence_level,
+    }
+
+
+def bootstrap_simulation(
+    initial_price: float,
+    returns: np.ndarray,
+    target_return: float,
+    days: int = 30,
+    simulations: int = 1000,
+    block_size: int = 5,
+    confidence_level: float = 0.95,
+    seed: Optional[int] = None,
+):
+    """실제 수익률 이력을 block_size 길이의 블록으로 다시 뽑아 최종 가격을 시뮬레이션합니다 (원형 블록 부트스트랩).
+
+    블록 안의 연속된 수익률을 그대로 쓰므로 두꺼운 꼬리와 변동성 군집이 유지됩니다.
+    로그 수익률 누적합을 미리 구해 두면 블록 하나의 수익률 합은 시작 위치 두 곳의 차이이므로,
+    경로마다 (days / block_size) 개의 시작 위치만 뽑아 모으면 됩니다.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    if n < 2:
+        raise HTTPException(status_code=400, detail="Not enough return history for bootstrap.")
+    if block_size > n:
+        raise HTTPException(
+            status_code=400,
+            detail=f"block_size ({block_size}) exceeds the return history length ({n}).",
+        )
+
+    # 원형으로 이어 붙인 로그 수익률의 누적합: 시작 s, 길이 k 블록의 합 = cumulative[s + k] - cumulative[s]
+    log_returns = np.log1p(returns)
+    cumulative = np.concatenate([[0.0], np.cumsum(np.concatenate([log_returns, log_returns]))])
+    full_blocks, remainder = divmod(days, block_size)
+    block_sums = cumulative[block_size : block_size + n] - cumulative[:n]
+    remainder_sums = cumulative[remainder : remainder + n] - cumulative[:n]
+
+    target_price = initial_price * (1 + target_return)
+    chunk_size = max(1, settings.MONTE_CARLO_CHUNK_ELEMENTS // (full_blocks + 1))
+    chunk_starts = range(0, simulations, chunk_size)
+    price_moments = _Moments(1)
+    hit_moments = _Moments(1)
+
+    min_price = np.inf
+    max_price = -np.inf
+    for start, rng in zip(chunk_starts, spawn_streams(seed, len(chunk_starts))):
+        check_cancelled()
+        report_progress(start / simulations)
+        size = min(chunk_size, simulations - start)
+        starts = rng.integers(0, n, size=(size, full_blocks))
+        path_log_returns = block_sums[starts].sum(axis=1)
+        if remainder:
+            path_log_returns += remainder_sums[rng.integers(0, n, size=size)]
+        final_prices = initial_price * np.exp(path_log_returns)
+        hits = (final_prices >= target_price).astype(np.float64)
+
+        min_price = min(min_price, final_prices.min())
+        max_price = max(max_price, final_prices.max())
+        price_moments.add(0, final_prices, np.zeros_like(final_prices))
+        hit_moments.add(0, hits, np.zeros_like(hits))
+
+    predicted_price, price_error = price_moments.estimate(None)
+    probability, probability_error = hit_moments.estimate(None)
+    return _summarize(
+        predicted_price, price_error, probability, probability_error,
+        min_price, max_price, confidence_level,
+    )
+
+def stats_fingerprint(stats: dict, method: str) -> str:
+    """시뮬레이션 입력 통계의 해시. 부트스트랩은 수익률 이력 전체를, 정규분포 모델은 평균/표준편차/현재가만 씁니다."""
+    digest = hashlib.sha256()
+    digest.update(
+        np.array(
+            [stats["daily_mean"], stats["daily_std"], stats["current_price"]], dtype=np.float64
+        ).tobytes()
+    )
+    if method == "bootstrap":
+        digest.update(np.ascontiguousarray(stats["returns"], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def load_monte_carlo_stats(symbol: str, timeframe: str, start_date: str, end_date: str, **_):
+    """calculate_monte_carlo 의 로드 단계 (메인 프로세스에서 캔들 조회)."""
+    return calculate_monte_carlo_stats(symbol, timeframe, start_date, end_date)
+
+
+def compute_monte_carlo(
+    stats: dict,
+    symbol: str,
+    timeframe: str,
+    start_date: str,
+    end_date: str,
+    target_return: float,
+    days: int = 30,
+    simulations: int = 500,
+    antithetic: bool = False,
+    control_variate: bool = False,
+    sampling: str = "random",
+    confidence_level: float = 0.95,
+    method: str = "parametric",
+    block_size: int = 5,
+    seed: Optional[int] = None,
+) -> dict:
+    """seed 를 주면 결과가 재현되므로, 같은 입력 통계와 seed 의 결과는 결과 캐시에서 바로 돌려줍니다.
+
+    요청 단위 캐시와 달리 키가 통계 해시라서, 기간/심볼 표기가 달라도 같은 데이터면 다시 계산하지 않습니다.
+    """
+    memo_key = None
+    if seed is not None:
+        memo_key = {
+            "stats": stats_fingerprint(stats, method),
+            "seed": seed,
+            "days": days,
+            "simulations": simulations,
+            "target_return": target_return,
+            "method": method,
+            "block_size": block_size if method == "bootstrap" else None,
+            "antithetic": antithetic,
+            "control_variate": control_variate,
+            "sampling": sampling,
+            "confidence_level": confidence_level,
+            # 청크 크기가 바뀌면 스트림 배치가 달라지므로 키에 포함합니다
+            "chunk_elements": settings.MONTE_CARLO_CHUNK_ELEMENTS,
+        }
+        cached = result_cache.get("monte-carlo-seeded", memo_key)
+        if cached is not None:
+            return {"symbol": symbol, **cached}
+
+    if method == "bootstrap":
+        monte_carlo_result = bootstrap_simulation(
+            initial_price=stats["current_price"],
+            returns=stats["returns"],
+            target_return=target_return,
+            days=days,
+            simulations=simulations,
+            block_size=block_size,
+            confidence_level=confidence_level,
+            seed=seed,
+        )
+    else:
+        monte_carlo_result = monte_carlo_simulation(
+            initial_price=stats["current_price"],
+            daily_mean=stats["daily_mean"],
+            daily_std=stats["daily_std"],
+            target_return=target_return,
+            days=days,
+            simulations=simulations,
+            antithetic=antithetic,
+            control_variate=control_variate,
+            sampling=sampling,
+            confidence_level=confidence_level,
+            seed=seed,
+        )
+
+    if memo_key is not None:
+        result_cache.set("monte-carlo-seeded", memo_key, monte_carlo_result)
+    return {"symbol": symbol, **monte_carlo_result}
+
+
+calculate_monte_carlo = Staged(load_monte_carlo_stats, compute_monte_carlo)
+
+
+def cholesky_factor(cov: np.ndarray) -> np.ndarray:
+    """공분산 행렬의 인수 L (L @ L.T = cov).
+
+    데이터가 없는 자산(분산 0) 등으로 양의 정부호가 아니면 음수 고윳값을 0 으로 잘라 인수를 만듭니다.
+    """
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+
+def correlation(cov: np.ndarray) -> np.ndarray:
+    """공분산 행렬을 상관계수 행렬로 바꿉니다. 분산이 0 인 자산의 상관계수는 0 (대각은 1) 입니다."""
+    std = np.sqrt(np.diag(cov))
+    scale = np.outer(std, std)
+    corr = np.divide(cov, scale, out=np.zeros_like(cov), where=scale > 0)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def portfolio_monte_carlo_simulation(
+    initial_balance: float,
+    mean: np.ndarray,
+    cov: np.ndarray,
+    weights: np.ndarray,
+    rebalance_mask: np.ndarray,
+    cost: float,
+    target_return: float,
+    days: int = 365,
+    simulations: int = 1000,
+    confidence_level: float = 0.95,
+    seed: Optional[int] = None,
+):
+    """상관된 다자산 일간 수익률로 포트폴리오 최종 가치를 시뮬레이션합니다.
+
+    (경로 × 일수 × 자산) 표준정규 난수에 Cholesky 인수를 한 번의 행렬곱으로 곱해 상관 수익률을 만들고,
+    rebalance_mask (길이 days + 1, 0 번은 시작 시점) 로 나눈 구간마다 자산별 로그 수익률을 합산합니다.
+    구간이 끝나면 목표 비중으로 재분배하고 (1 - cost) 를 곱하는 방식은 simulate_portfolio 와 같습니다.
+    """
+    assets = len(mean)
+    factor = cholesky_factor(cov).T
+    target_value = initial_balance * (1 + target_return)
+
+    rebalance_rows = np.flatnonzero(rebalance_mask[1:]) + 1
+    # 구간 시작 위치 (0 번째 시뮬레이션 날 기준). 마지막 날의 리밸런싱은 비용만 반영합니다
+    segment_starts = np.concatenate(([0], rebalance_rows[rebalance_rows < days]))
+    cost_factor = (1 - cost) ** len(rebalance_rows)
+
+    chunk_size = max(1, settings.MONTE_CARLO_CHUNK_ELEMENTS // (days * assets))
+    value_moments = _Moments(1)
+    hit_moments = _Moments(1)
+    final_values = np.empty(simulations)
+    chunk_starts = range(0, simulations, chunk_size)
+    for start, rng in zip(chunk_starts, spawn_streams(seed, len(chunk_starts))):
+        check_cancelled()
+        report_progress(start / simulations)
+        size = min(chunk_size, simulations - start)
+        returns = rng.standard_normal((size, days, assets)) @ factor
+        returns += mean
+        log_growth = np.log1p(np.maximum(returns, -1 + 1e-12, out=returns), out=returns)
+
+        # (경로 × 구간 × 자산) 구간 성장률을 목표 비중으로 합산한 뒤 구간끼리 곱합니다
+        segment_growth = np.exp(np.add.reduceat(log_growth, segment_starts, axis=1)) @ weights
+        finals = initial_balance * cost_factor * np.prod(segment_growth, axis=1)
+
+        final_values[start : start + size] = finals
+        value_moments.add(0, finals, np.zeros_like(finals))
+        hit_moments.add(0, (finals >= target_value).astype(np.float64), np.zeros_like(finals))
+
+    predicted_value, value_error = value_moments.estimate(None)
+    probability, probability_error = hit_moments.estimate(None)
+    result = _summarize(
+        predicted_value, value_error, probability, probability_error,
+        final_values.min(), final_values.max(), confidence_level, name="value",
+    )
+    percentiles = np.percentile(final_values, [5, 25, 50, 75, 95])
+    result["percentiles"] = {
+        str(q): round(v, 2) for q, v in zip((5, 25, 50, 75, 95), percentiles.tolist())
     }
+    result["rebalances"] = len(rebalance_rows)
+    return result
+
+
+def load_portfolio_daily_returns(symbols, start_date, end_date, **_):
+    """calculate_portfolio_monte_carlo 의 로드 단계. 추정은 항상 일봉으로 합니다 (리밸런싱 주기는 시뮬레이션 날짜에 적용)."""
+    return load_returns(symbols, start_date, end_date, "D")[1]
+
+
+def compute_portfolio_monte_carlo(
+    returns,
+    symbols,
+    weights,
+    initial_balance,
+    start_date,
+    end_date,
+    rebalance_period="ME",
+    rebalance=True,
+    fee_rate=0.001,
+    slippage=0.0005,
+    target_return=0.10,
+    days=365,
+    simulations=1000,
+    confidence_level=0.95,
+    seed=None,
+) -> dict:
+    """start_date~end_date 의 일간 수익률로 평균/공분산을 추정하고 end_date 이후 days 일을 시뮬레이션합니다."""
+    for symbol in symbols:
+        if symbol not in weights:
+            raise ValueError(f"Weight not provided for symbol: {symbol}")
 
-def calculate_monte_carlo(symbol: str, timeframe: str, start_date: str, end_date: str, target_return: float, days: int = 30, simulations: int = 500) -> dict:
-    stats = calculate_monte_carlo_stats(symbol, timeframe, start_date, end_date)
-    
-    monte_carlo_result = monte_carlo_simulation(
-        initial_price=stats["current_price"],
-        daily_mean=stats["daily_mean"],
-        daily_std=stats["daily_std"],
+    returns = returns[1:]  # 첫 행은 수익률이 없습니다
+    if len(returns) < 2:
+        raise HTTPException(status_code=400, detail="Not enough history to estimate covariance.")
+    check_cancelled()
+
+    mean = returns.mean(axis=0)
+    cov = np.atleast_2d(np.cov(returns, rowvar=False))
+    future_dates = pd.date_range(end_date, periods=days + 1, freq="D")
+    rebalance_mask = get_rebalance_mask(future_dates, rebalance_period, rebalance)
+
+    result = portfolio_monte_carlo_simulation(
+        initial_balance=initial_balance,
+        mean=mean,
+        cov=cov,
+        weights=np.array([weights[symbol] for symbol in symbols], dtype=float),
+        rebalance_mask=rebalance_mask,
+        cost=fee_rate + slippage,
         target_return=target_return,
         days=days,
-        simulations=simulations
+        simulations=simulations,
+        confidence_level=confidence_level,
+        seed=seed,
     )
-    
     return {
-        "symbol": symbol,
-        "predicted_price": monte_carlo_result["predicted_price"],
-        "probability_above_target": monte_carlo_result["probability_above_target"],
-        "min_price": monte_carlo_result["min_price"],
-        "max_price": monte_carlo_result["max_price"]
-    }
\ No newline at end of file
+        "assets": weights,
+        "initial_balance": initial_balance,
+        "days": days,
+        "simulations": simulations,
+        **result,
+        "correlation": np.round(correlation(cov), 4).tolist(),
+    }
+
+
+calculate_portfolio_monte_carlo = Staged(load_portfolio_daily_returns, compute_portfolio_monte_carlo)
@@ -1,50 +1,52 @@
-import ccxt
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from fastapi import HTTPException
 from scipy import stats
 
-exchange = ccxt.binance({'enableRateLimit': True})
+from app.core.cancellation import TaskCancelled, check_cancelled
+from app.core.executor import Staged
+from app.core.return_index import ReturnWindow
+from app.services.market_data_service import load_return_window
 
-def fetch_data(symbol: str, timeframe: str, start_date: str, end_date: str) -> pd.Series:
-    since = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
+def fetch_window(symbol: str, timeframe: str, start_date: str, end_date: str) -> ReturnWindow:
     try:
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since, limit=2000)
-        if not ohlcv:
-            raise HTTPException(status_code=400, detail=f"No data available for {symbol}")
-
-        df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df.set_index("timestamp", inplace=True)
-        df = df[(df.index >= start_date) & (df.index <= end_date)]
-        if df.empty:
+        window = load_return_window(symbol, timeframe, start_date, end_date)
+        if window is None:
             raise HTTPException(status_code=400, detail=f"No data in range for {symbol}")
-        return df["close"]
+        return window
+    except TaskCancelled:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error fetching {symbol}: {str(e)}")
 
-def calculate_probability(symbol: str, timeframe: str, start_date: str, end_date: str, initial_balance: float, target_return: float) -> dict:
+def load_probability_window(symbol: str, timeframe: str, start_date: str, end_date: str, **_) -> ReturnWindow:
+    """확률 서비스의 로드 단계. 워커로 넘길 때는 구간 부분만 복사됩니다 (ReturnWindow pickle)."""
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
     if start >= end:
         raise ValueError("Start date must be before end date")
+    return fetch_window(symbol, timeframe, start_date, end_date)
 
-    prices = fetch_data(symbol, timeframe, start_date, end_date)
-    daily_returns = prices.pct_change().dropna()
-    expected_return = np.mean(daily_returns) * 365
-    standard_deviation = np.std(daily_returns) * np.sqrt(365)
+def compute_probability(window: ReturnWindow, symbol: str, timeframe: str, start_date: str, end_date: str, initial_balance: float, target_return: float):
+    """확률을 계산해 (요약 지표, 수익률 Series, 가치 히스토리 Series) 를 반환합니다.
+
+    평균/표준편차/누적 수익률은 수익률 인덱스의 누적합으로 O(1) 에 구하고,
+    응답에 담는 시계열만 구간 길이에 비례해 만듭니다.
+    """
+    check_cancelled()
+    expected_return = window.mean() * 365
+    standard_deviation = window.std() * np.sqrt(365)
     z_score = (target_return - expected_return) / standard_deviation
     probability = 1 - stats.norm.cdf(z_score)
 
-    value = initial_balance
-    value_history = [initial_balance]
-    for ret in daily_returns[1:]:
-        value *= (1 + ret)
-        value_history.append(value)
-    value_history_dict = {dt.strftime("%Y-%m-%d"): val for dt, val in zip(prices.index, value_history)}
+    daily_returns = pd.Series(window.returns, index=window.index(1))
+    # 초기 잔액에서 두 번째 수익률부터 누적 (기존 반복문과 같은 값): 누적곱 = 종가 / 두 번째 종가
+    closes = window.closes
+    values = initial_balance * np.concatenate(([1.0], closes[2:] / closes[1:2]))
+    value_history = pd.Series(values, index=window.index(0, len(values)))
 
-    return {
+    summary = {
         "symbol": symbol,
         "timeframe": timeframe,
         "start_date": start_date,
@@ -53,8 +55,25 @@ def calculate_probability(symbol: str, timeframe: str, start_date: str, end_date
         "expected_return": float(expected_return),
         "standard_deviation": float(standard_deviation),
         "target_return": target_return,
+        "total_return": window.total_return,
         "z_score": float(z_score),
         "probability": float(probability),
+    }
+    return summary, daily_returns, value_history
+
+
+run_probability = Staged(load_probability_window, compute_probability)
+
+def compute_probability_dict(window: ReturnWindow, symbol: str, timeframe: str, start_date: str, end_date: str, initial_balance: float, target_return: float) -> dict:
+    summary, daily_returns, value_history = compute_probability(
+        window, symbol, timeframe, start_date, end_date, initial_balance, target_return
+    )
+    value_history_dict = {dt.strftime("%Y-%m-%d"): val for dt, val in zip(value_history.index, value_history.tolist())}
+
+    return {
+        **summary,
         "daily_returns": daily_returns.tolist(),
         "value_history": value_history_dict
-    }
\ No newline at end of file
+    }
+
+calculate_probability = Staged(load_probability_window, compute_probability_dict)
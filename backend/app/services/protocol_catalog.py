@@ -0,0 +1,141 @@
+import threading
+import time
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import track_upstream
+
+logger = get_logger()
+
+# 가치평가에 쓰는 필드만 남겨 목록 전체(수 MB)를 메모리에 들고 있지 않도록 합니다
+PROTOCOL_FIELDS = ("id", "name", "slug", "chain", "gecko_id", "tvl")
+
+
+class ProtocolCatalog:
+    """DeFi Llama 프로토콜 목록을 메모리에 두고 체인/프로토콜 ID 로 찾는 카탈로그.
+
+    목록은 refresh_seconds 마다 백그라운드 스레드가 새로 받습니다. 조회 시점에 목록이
+    refresh_seconds 보다 오래되었으면 기존 목록으로 바로 응답하고 갱신은 뒤에서 진행하며
+    (stale-while-revalidate), max_stale_seconds 보다 오래되었거나 아직 없을 때만 그 자리에서 받습니다.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_seconds: float,
+        max_stale_seconds: float,
+        timeout: float = 10.0,
+    ):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.timeout = timeout
+        self._by_chain: dict[str, dict] = {}
+        self._by_id: dict[str, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()  # 동시에 한 번만 받도록 합니다
+        self._revalidating = threading.Lock()  # 백그라운드 갱신은 하나만 띄웁니다
+        self._stopped = threading.Event()
+
+    @property
+    def age(self) -> Optional[float]:
+        return None if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+    def start(self) -> None:
+        """주기적으로 목록을 갱신하는 백그라운드 스레드를 시작합니다 (앱 시작 시 호출)."""
+        self._stopped.clear()
+        threading.Thread(target=self._refresh_loop, name="protocol-catalog", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except HTTPException:
+                pass  # refresh 가 이미 로그를 남겼고, 다음 주기에 다시 시도합니다
+            if self._stopped.wait(self.refresh_seconds):
+                return
+
+    def _fetch(self) -> list:
+        try:
+            with track_upstream("defillama"):
+                response = httpx.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"DeFi Llama API error: {str(e)}")
+
+    def refresh(self) -> None:
+        """목록을 받아 색인을 새로 만듭니다. 다른 스레드가 받는 중이면 끝날 때까지 기다립니다."""
+        started = time.monotonic()
+        with self._lock:
+            if self._loaded_at is not None and self._loaded_at >= started:
+                return  # 기다리는 동안 다른 스레드가 이미 받았습니다
+            try:
+                protocols = self._fetch()
+            except HTTPException as e:
+                logger.warning(f"Protocol catalog refresh failed: {e.detail}")
+                raise
+
+            by_chain: dict[str, dict] = {}
+            by_id: dict[str, dict] = {}
+            for raw in protocols:
+                protocol = {field: raw.get(field) for field in PROTOCOL_FIELDS}
+                if protocol["tvl"] is None:
+                    protocol["tvl"] = 0
+                chain = protocol["chain"]
+                # 같은 체인이 여러 번 나오면 목록에서 먼저 나온 프로토콜을 씁니다 (기존 순차 검색과 같은 결과)
+                if chain and chain.lower() not in by_chain:
+                    by_chain[chain.lower()] = protocol
+                for key in (protocol["id"], protocol["slug"]):
+                    if key:
+                        by_id[str(key).lower()] = protocol
+
+            # 참조를 한 번에 바꾸므로 조회하는 쪽은 잠금 없이 항상 완성된 색인을 봅니다
+            self._by_chain, self._by_id = by_chain, by_id
+            self._loaded_at = time.monotonic()
+            logger.info(f"Protocol catalog refreshed: {len(protocols)} protocols")
+
+    def _refresh_in_background(self) -> None:
+        if not self._revalidating.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh()
+            except HTTPException:
+                pass
+            finally:
+                self._revalidating.release()
+
+        threading.Thread(target=run, name="protocol-catalog-revalidate", daemon=True).start()
+
+    def _ensure_fresh(self) -> None:
+        age = self.age
+        if age is None or age > self.max_stale_seconds:
+            self.refresh()
+        elif age > self.refresh_seconds:
+            self._refresh_in_background()
+
+    def by_chain(self, chain: str) -> Optional[dict]:
+        self._ensure_fresh()
+        return self._by_chain.get(chain.lower())
+
+    def by_id(self, protocol_id: str) -> Optional[dict]:
+        """DeFi Llama 프로토콜 ID 또는 slug 로 찾습니다."""
+        self._ensure_fresh()
+        return self._by_id.get(str(protocol_id).lower())
+
+
+protocol_catalog = ProtocolCatalog(
+    settings.DEFILLAMA_PROTOCOLS_URL,
+    settings.PROTOCOL_CATALOG_REFRESH_SECONDS,
+    settings.PROTOCOL_CATALOG_MAX_STALE_SECONDS,
+    settings.PROTOCOL_CATALOG_TIMEOUT,
+)
@@ -1,14 +1,20 @@
-import requests
+import asyncio
+import httpx
 from fastapi import HTTPException
 from app.schemas.valuation_request import ValuationRequest
+from app.core.config import settings
+from app.core.http_client import http_client
+from app.core.metrics import track_upstream
+from app.services.protocol_catalog import protocol_catalog
 from typing import Dict
 
-def fetch_coin_data(coin_id: str) -> Dict[str, float]:
+async def fetch_coin_data(coin_id: str) -> Dict[str, float]:
     """CoinGecko에서 코인의 실시간 데이터를 가져옵니다."""
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
+    url = f"{settings.COINGECKO_API_URL}/coins/{coin_id}"
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        with track_upstream("coingecko"):
+            response = await http_client.get().get(url)
+            response.raise_for_status()
         data = response.json()
         return {
             "market_cap": data["market_data"]["market_cap"]["usd"],
@@ -16,20 +22,13 @@ def fetch_coin_data(coin_id: str) -> Dict[str, float]:
             "circulating_supply": data["market_data"]["circulating_supply"],
             "daily_volume": data["market_data"]["total_volume"]["usd"]
         }
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=400, detail=f"CoinGecko API error: {str(e)}")
 
 def fetch_tvl(coin_id: str) -> float:
-    """DeFi Llama에서 코인의 TVL을 가져옵니다."""
-    url = "https://api.llama.fi/protocols"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        protocol = next((p for p in data if p["chain"].lower() == coin_id), None)
-        return protocol["tvl"] if protocol else 0
-    except requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"DeFi Llama API error: {str(e)}")
+    """DeFi Llama 프로토콜 카탈로그에서 코인 체인의 TVL을 찾습니다."""
+    protocol = protocol_catalog.by_chain(coin_id)
+    return protocol["tvl"] if protocol else 0
 
 def calculate_nvt(market_cap: float, transaction_volume_usd: float) -> float:
     """NVT 비율을 계산합니다: 시가총액 / 거래량 (USD 기준)."""
@@ -64,16 +63,19 @@ def calculate_fair_price(
 
     return f"{min_price:.4f}-{max_price:.4f}"
 
-def valuate_coin(coin_id: str, static_data: ValuationRequest) -> Dict:
+async def valuate_coin(coin_id: str, static_data: ValuationRequest) -> Dict:
     """코인의 가치평가 데이터를 계산하고 반환합니다."""
     try:
-        coin_data = fetch_coin_data(coin_id)
+        # 카탈로그가 비어 있으면 그 자리에서 목록을 받으므로 TVL 조회는 스레드에서 실행하고,
+        # CoinGecko 호출과 동시에 진행합니다
+        coin_data, tvl = await asyncio.gather(
+            fetch_coin_data(coin_id), asyncio.to_thread(fetch_tvl, coin_id)
+        )
         market_cap = coin_data["market_cap"]
         price = coin_data["price"]
         circulating_supply = coin_data["circulating_supply"]
         daily_volume = coin_data["daily_volume"]
-        
-        tvl = fetch_tvl(coin_id)
+
         transaction_volume_mnt = static_data.transaction_volume if static_data.transaction_volume > 0 else daily_volume / price
         nvt = calculate_nvt(market_cap, transaction_volume_mnt * price)
         fair_price_range = calculate_fair_price(
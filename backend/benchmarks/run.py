@@ -0,0 +1,148 @@
+"""백테스트/확률/몬테카를로 핫패스 벤치마크.
+
+    python -m benchmarks.run --profile quick --output benchmarks/baselines/quick.json
+    python -m benchmarks.run --profile quick --compare benchmarks/baselines/quick.json
+
+거래소 호출은 합성 캔들을 돌려주는 SyntheticExchange 로 대체하고, 시나리오마다 빈 임시
+캔들 저장소에서 시작합니다. 첫 실행(cold: 합성 캔들 수신 + 저장소 기록 포함)을 따로 재고,
+이후 repeat 번 실행(warm: 저장소에서 읽기)의 중앙값을 wall_seconds 로 기록합니다.
+최대 메모리는 tracemalloc 을 켠 별도 실행에서 측정합니다.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from app.core.candle_store import candle_store
+from app.services.market_data_service import get_client
+from benchmarks.scenarios import build_scenarios
+from benchmarks.synthetic import SyntheticExchange
+
+# 기준값보다 이 비율 이상 느려지거나 메모리를 더 쓰면 회귀로 봅니다
+DEFAULT_THRESHOLD = 0.25
+COMPARED_METRICS = ("wall_seconds", "peak_memory_bytes")
+
+
+def measure(scenario: dict, repeat: int) -> dict:
+    exchange = SyntheticExchange()
+    get_client().exchange = exchange
+
+    with tempfile.TemporaryDirectory() as root:
+        candle_store.root = root
+
+        started = time.perf_counter()
+        scenario["run"]()
+        cold = time.perf_counter() - started
+        upstream_calls = exchange.calls
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            scenario["run"]()
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            scenario["run"]()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    wall = statistics.median(timings)
+    return {
+        "group": scenario["group"],
+        "params": scenario["params"],
+        "items": scenario["items"],
+        "cold_seconds": cold,
+        "wall_seconds": wall,
+        "min_seconds": min(timings),
+        "peak_memory_bytes": peak,
+        "throughput_per_second": scenario["items"] / wall if wall > 0 else None,
+        "upstream_calls": upstream_calls,
+    }
+
+
+def run(profile: str, repeat: int, name_filter: str = "") -> dict:
+    results = {}
+    for scenario in build_scenarios(profile):
+        if name_filter not in scenario["name"]:
+            continue
+        result = measure(scenario, repeat)
+        results[scenario["name"]] = result
+        print(
+            f"{scenario['name']:<40} {result['wall_seconds'] * 1000:>10.1f} ms"
+            f" {result['peak_memory_bytes'] / 2**20:>9.1f} MiB"
+            f" {result['throughput_per_second']:>14,.0f} items/s",
+            flush=True,
+        )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "profile": profile,
+        "repeat": repeat,
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """기준값 대비 threshold 이상 나빠진 (시나리오, 지표) 목록을 반환합니다."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if not base[metric]:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} {metric}: {ratio:.2f}x of baseline")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=["quick", "full"], default="quick")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run scenarios containing this")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = run(args.profile, args.repeat, args.filter)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import ccxt
+import numpy as np
+import pandas as pd
+
+from app.services.backtest_service import calculate_portfolio_backtest
+from app.services.backtest_service import calculate_portfolio_walk_forward
+from app.services.backtest_service import get_rebalance_mask
+from app.services.monte_carlo_service import (
+    bootstrap_simulation,
+    monte_carlo_simulation,
+    portfolio_monte_carlo_simulation,
+)
+from app.services.probability_service import calculate_probability
+
+# 합성 데이터 구간의 끝 날짜 (고정해 두어야 실행마다 같은 캔들을 사용합니다)
+END_DATE = "2024-01-01"
+SPAN_DAYS = {"7d": 7, "30d": 30, "90d": 90, "1y": 365, "2y": 730, "10y": 3650, "20y": 7300}
+PERIOD_TIMEFRAMES = {"D": "1d", "W": "1w", "ME": "1M"}
+
+
+def start_date(span: str) -> str:
+    start = pd.Timestamp(END_DATE) - pd.Timedelta(days=SPAN_DAYS[span])
+    return start.strftime("%Y-%m-%d")
+
+
+def bar_count(timeframe: str, span: str) -> int:
+    duration = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+    return SPAN_DAYS[span] * 86_400_000 // duration + 1
+
+
+def portfolio(symbols: int, span: str, period: str) -> dict:
+    names = [f"SYN{i:03d}/USDT" for i in range(symbols)]
+    weights = {name: 1 / symbols for name in names}
+    return {
+        "name": f"portfolio/{symbols}sym/{span}/{period}",
+        "group": "portfolio",
+        "params": {"symbols": symbols, "span": span, "rebalance_period": period},
+        # 처리량 단위: 심볼 × 캔들 수
+        "items": symbols * bar_count(PERIOD_TIMEFRAMES[period], span),
+        "run": lambda: calculate_portfolio_backtest(
+            symbols=names,
+            weights=weights,
+            initial_balance=10_000,
+            start_date=start_date(span),
+            end_date=END_DATE,
+            rebalance_period=period,
+            rebalance=True,
+        ),
+    }
+
+
+def walk_forward(symbols: int, span: str, window: int, step: int) -> dict:
+    names = [f"SYN{i:03d}/USDT" for i in range(symbols)]
+    weights = {name: 1 / symbols for name in names}
+    windows = (bar_count("1d", span) - window) // step + 1
+    return {
+        "name": f"walk_forward/{symbols}sym/{span}/{window}w{step}s",
+        "group": "portfolio",
+        "params": {"symbols": symbols, "span": span, "window": window, "step": step},
+        # 처리량 단위: 창 × 창 길이 × 심볼
+        "items": windows * window * symbols,
+        "run": lambda: calculate_portfolio_walk_forward(
+            symbols=names,
+            weights=weights,
+            initial_balance=10_000,
+            start_date=start_date(span),
+            end_date=END_DATE,
+            rebalance_period="D",
+            rebalance=True,
+            window=window,
+            step=step,
+        ),
+    }
+
+
+def probability(timeframe: str, span: str) -> dict:
+    return {
+        "name": f"probability/{timeframe}/{span}",
+        "group": "probability",
+        "params": {"timeframe": timeframe, "span": span},
+        "items": bar_count(timeframe, span),
+        "run": lambda: calculate_probability(
+            symbol="SYN000/USDT",
+            timeframe=timeframe,
+            start_date=start_date(span),
+            end_date=END_DATE,
+            initial_balance=10_000,
+            target_return=0.1,
+        ),
+    }
+
+
+def monte_carlo(days: int, simulations: int) -> dict:
+    return {
+        "name": f"monte_carlo/{days}d/{simulations}sims",
+        "group": "monte_carlo",
+        "params": {"days": days, "simulations": simulations},
+        # 처리량 단위: 생성한 일간 수익률 수
+        "items": days * simulations,
+        "run": lambda: monte_carlo_simulation(
+            initial_price=100.0,
+            daily_mean=0.001,
+            daily_std=0.03,
+            target_return=0.1,
+            days=days,
+            simulations=simulations,
+        ),
+    }
+
+
+def monte_carlo_bootstrap(days: int, simulations: int, block_size: int = 5) -> dict:
+    # 10년치 일간 수익률 이력 (t 분포, 두꺼운 꼬리)
+    returns = np.random.default_rng(0).standard_t(3, 3650) * 0.02 + 0.001
+    return {
+        "name": f"monte_carlo_bootstrap/{days}d/{simulations}sims/b{block_size}",
+        "group": "monte_carlo",
+        "params": {"days": days, "simulations": simulations, "block_size": block_size},
+        "items": days * simulations,
+        "run": lambda: bootstrap_simulation(
+            initial_price=100.0,
+            returns=returns,
+            target_return=0.1,
+            days=days,
+            simulations=simulations,
+            block_size=block_size,
+        ),
+    }
+
+
+def portfolio_monte_carlo(assets: int, days: int, simulations: int) -> dict:
+    rng = np.random.default_rng(0)
+    loadings = rng.normal(0, 0.01, (assets, assets))
+    cov = loadings @ loadings.T + np.eye(assets) * 1e-4
+    mask = get_rebalance_mask(pd.date_range(END_DATE, periods=days + 1, freq="D"), "ME", True)
+    return {
+        "name": f"portfolio_monte_carlo/{assets}sym/{days}d/{simulations}sims",
+        "group": "monte_carlo",
+        "params": {"assets": assets, "days": days, "simulations": simulations},
+        # 처리량 단위: 생성한 자산별 일간 수익률 수
+        "items": assets * days * simulations,
+        "run": lambda: portfolio_monte_carlo_simulation(
+            initial_balance=10_000,
+            mean=np.full(assets, 0.0005),
+            cov=cov,
+            weights=np.full(assets, 1 / assets),
+            rebalance_mask=mask,
+            cost=0.0015,
+            target_return=0.1,
+            days=days,
+            simulations=simulations,
+        ),
+    }
+
+
+def build_scenarios(profile: str) -> list[dict]:
+    """quick: 변경마다 돌릴 수 있는 작은 구성, full: 1~500 심볼, 7일~20년, 1m~1d 전체 격자."""
+    if profile == "quick":
+        return [
+            portfolio(1, "1y", "D"),
+            portfolio(10, "1y", "D"),
+            portfolio(10, "10y", "ME"),
+            portfolio(100, "1y", "W"),
+            walk_forward(10, "10y", 365, 1),
+            probability("1d", "10y"),
+            probability("1h", "1y"),
+            probability("1m", "7d"),
+            monte_carlo(30, 1_000),
+            monte_carlo(365, 100_000),
+            monte_carlo_bootstrap(365, 100_000),
+            portfolio_monte_carlo(20, 365, 10_000),
+        ]
+
+    scenarios = [
+        portfolio(symbols, span, period)
+        for symbols in (1, 10, 100, 500)
+        for span in ("90d", "1y", "10y", "20y")
+        for period in ("D", "W", "ME")
+    ]
+    scenarios += [
+        walk_forward(symbols, "10y", window, 1)
+        for symbols in (1, 10, 100)
+        for window in (30, 365)
+    ]
+    scenarios += [
+        probability(timeframe, span)
+        for timeframe, span in (
+            ("1m", "30d"),
+            ("1m", "1y"),
+            ("5m", "90d"),
+            ("15m", "1y"),
+            ("1h", "2y"),
+            ("4h", "10y"),
+            ("1d", "20y"),
+        )
+    ]
+    scenarios += [
+        monte_carlo(days, simulations)
+        for days in (30, 365, 3650)
+        for simulations in (1_000, 100_000, 1_000_000)
+    ]
+    scenarios += [
+        monte_carlo_bootstrap(days, 1_000_000, block_size)
+        for days in (30, 365, 3650)
+        for block_size in (1, 20)
+    ]
+    scenarios += [
+        portfolio_monte_carlo(assets, 365, simulations)
+        for assets in (2, 20, 100)
+        for simulations in (1_000, 10_000)
+    ]
+    return scenarios
@@ -0,0 +1,72 @@
+import zlib
+
+import ccxt
+import numpy as np
+
+# splitmix64 상수: 캔들 인덱스마다 독립적인 난수를 만들기 위해 사용
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _uniform(index: np.ndarray, seed: int) -> np.ndarray:
+    """(seed, 캔들 인덱스) 만으로 정해지는 [0, 1) 균등 난수."""
+    x = (index.astype(np.uint64) + np.uint64((seed & 0xFFFFFFFF) << 32)) * _GOLDEN
+    x ^= x >> np.uint64(30)
+    x *= _MIX_1
+    x ^= x >> np.uint64(27)
+    x *= _MIX_2
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def symbol_seed(symbol: str, timeframe: str) -> int:
+    return zlib.crc32(f"{symbol}:{timeframe}".encode("utf-8"))
+
+
+def synthetic_ohlcv(symbol: str, timeframe: str, since: int, limit: int) -> np.ndarray:
+    """since 부터 limit 개의 합성 OHLCV 캔들을 (n, 6) 배열로 만듭니다.
+
+    값은 (심볼, 타임프레임, 캔들 시작 시각) 으로만 정해지므로 페이지를 어떻게 나눠
+    요청해도 같은 캔들은 항상 같은 값입니다. 로그 가격은 완만한 추세 + 주기 + 잡음입니다.
+    """
+    duration = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+    first = -(-since // duration)
+    index = np.arange(first, first + limit, dtype=np.int64)
+    timestamps = index * duration
+
+    seed = symbol_seed(symbol, timeframe)
+    scale = np.sqrt(duration / 86_400_000)  # 일봉 기준 변동성을 타임프레임 길이에 맞춤
+    days = timestamps / 86_400_000
+    noise = _uniform(index, seed) + _uniform(index, seed + 1) - 1.0
+    log_close = (
+        4.0
+        + (seed % 7) * 0.5
+        + days * 0.0004
+        + 0.3 * np.sin(days / (90 + seed % 60))
+        + 0.04 * scale * noise
+    )
+    close = np.exp(log_close)
+    open_ = np.exp(log_close - 0.02 * scale * (_uniform(index, seed + 2) - 0.5))
+    spread = 1 + 0.01 * scale * _uniform(index, seed + 3)
+    high = np.maximum(open_, close) * spread
+    low = np.minimum(open_, close) / spread
+    volume = 1_000 + 10_000 * _uniform(index, seed + 4)
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+class SyntheticExchange:
+    """공용 시세 클라이언트의 거래소 자리에 넣는 대역. fetch_ohlcv 가 합성 캔들을 돌려줍니다."""
+
+    rateLimit = 0
+    parse_timeframe = staticmethod(ccxt.Exchange.parse_timeframe)
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+        return synthetic_ohlcv(symbol, timeframe, since, limit or 500).tolist()
+
+    async def close(self):
+        pass
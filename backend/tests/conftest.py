@@ -0,0 +1,120 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import ccxt
+import pytest
+
+from app.core.cache import result_cache
+from app.core.candle_store import candle_store
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.market_data_service import get_client
+from app.services.protocol_catalog import ProtocolCatalog, protocol_catalog
+
+
+class FakeRedis:
+    """
+    테스트용 인메모리 Redis 대역. ResultCache 가 사용하는 명령만 구현합니다.
+    """
+
+    def __init__(self):
+        self.store = {}
+
+    def _alive(self, key):
+        item = self.store.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at < time.monotonic():
+            del self.store[key]
+            return None
+        return value
+
+    def get(self, key):
+        return self._alive(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and self._alive(key) is not None:
+            return None
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        expires_at = time.monotonic() + ex if ex else None
+        self.store[key] = (value, expires_at)
+        return True
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def ttl(self, key):
+        item = self.store.get(key)
+        if item is None:
+            return -2
+        return -1 if item[1] is None else int(item[1] - time.monotonic())
+
+
+@pytest.fixture(autouse=True)
+def isolated_candle_store(tmp_path, monkeypatch):
+    """
+    테스트마다 비어 있는 캔들 저장소를 사용하도록 경로를 임시 디렉터리로 바꿉니다.
+    """
+    monkeypatch.setattr(candle_store, "root", str(tmp_path / "candles"))
+    return candle_store
+
+
+@pytest.fixture(autouse=True)
+def isolated_metrics(tmp_path, monkeypatch):
+    """
+    메트릭 파일을 테스트마다 임시 디렉터리에 기록해 다른 테스트/프로세스의 값이 섞이지 않도록 합니다.
+    """
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path / "metrics"))
+    metrics.clear()
+    yield metrics
+    metrics.clear()
+
+
+@pytest.fixture(autouse=True)
+def fake_redis():
+    """
+    결과 캐시가 실제 Redis 대신 테스트마다 새로 만든 FakeRedis 를 사용하도록 합니다.
+    """
+    redis = FakeRedis()
+    result_cache.client = redis
+    result_cache.local.clear()
+    yield redis
+    result_cache.local.clear()
+
+
+@pytest.fixture(autouse=True)
+def inline_cpu_executor(monkeypatch):
+    """
+    계산 작업도 스레드 풀에서 실행해 테스트의 mock/patch 가 그대로 적용되도록 합니다.
+    """
+    monkeypatch.setattr(settings, "EXECUTOR_PROCESS_WORKERS", 0)
+
+
+@pytest.fixture(autouse=True)
+def isolated_protocol_catalog(monkeypatch):
+    """
+    프로토콜 카탈로그를 비운 상태로 시작하고, 앱 시작 시의 백그라운드 갱신이 실제 DeFi Llama 대신
+    닫힌 로컬 포트로 요청하도록 합니다.
+    """
+    fresh = ProtocolCatalog("http://127.0.0.1:9/protocols", 600, 3600, timeout=1.0)
+    for name, value in vars(fresh).items():
+        monkeypatch.setattr(protocol_catalog, name, value)
+    yield protocol_catalog
+    protocol_catalog.stop()
+
+
+@pytest.fixture
+def mock_exchange(monkeypatch):
+    """
+    공용 시세 클라이언트의 거래소를 목 객체로 바꿉니다. fetch_ohlcv 는 AsyncMock 입니다.
+    """
+    exchange = MagicMock()
+    exchange.parse_timeframe = ccxt.Exchange.parse_timeframe
+    exchange.rateLimit = 0
+    exchange.fetch_ohlcv = AsyncMock()
+    exchange.load_markets = AsyncMock()
+    exchange.close = AsyncMock()
+    monkeypatch.setattr(get_client(), "exchange", exchange)
+    return exchange
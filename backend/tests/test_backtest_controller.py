@@ -1,5 +1,9 @@
+import json
+
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
+from app.core.config import settings
 from app.main import app
 from app.services.backtest_service import calculate_portfolio_backtest
 
@@ -78,3 +82,73 @@ def test_run_portfolio_backtest_missing_field():
     response = client.post("/backtest/portfolio", json=payload)
 
     assert response.status_code == 422
+
+
+def test_run_portfolio_backtest_ndjson_stream(mocker, monkeypatch):
+    """
+    Accept: application/x-ndjson 요청 시 요약 지표를 먼저 보내고 히스토리를 배치로 나눠 스트리밍하는지 확인
+    """
+    monkeypatch.setattr(settings, "STREAM_BATCH_ROWS", 2)
+    history = pd.Series(
+        [10000.0, 10500.0, 11000.0, 12000.0, 15000.0],
+        index=pd.date_range("2024-01-01", periods=5, freq="D"),
+    )
+    mocker.patch(
+        "app.controllers.portfolio_controller.run_backtest",
+        return_value=({"initial_balance": 10000, "final_balance": 15000}, history),
+    )
+    payload = {
+        "assets": {"BTC/USDT": 1.0},
+        "initial_balance": 10000,
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-05",
+        "rebalance_period": "D",
+        "rebalance": "true",
+        "fee_rate": 0.001,
+        "slippage": 0.0005,
+    }
+
+    response = client.post(
+        "/backtest/portfolio",
+        json=payload,
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {
+        "type": "summary",
+        "data": {"initial_balance": 10000, "final_balance": 15000},
+    }
+    assert [len(line["rows"]) for line in lines[1:-1]] == [2, 2, 1]
+    assert lines[1]["rows"][0] == ["2024-01-01", 10000.0]
+    assert lines[-1] == {"type": "end", "rows": {"portfolio_value_history": 5}}
+
+
+def test_run_portfolio_walk_forward(mocker):
+    """
+    walk-forward 요청이 창 길이/간격을 서비스로 넘기고, 창 길이가 2 미만이면 422 를 반환하는지 확인
+    """
+    walk_forward = mocker.patch(
+        "app.controllers.portfolio_controller.calculate_portfolio_walk_forward",
+        return_value={"count": 3, "windows": [], "distribution": {}},
+    )
+    payload = {
+        "assets": {"BTC/USDT": 1.0},
+        "initial_balance": 10000,
+        "start_date": "2024-01-01",
+        "end_date": "2024-12-31",
+        "rebalance_period": "D",
+        "rebalance": True,
+        "fee_rate": 0.001,
+        "slippage": 0.0005,
+    }
+
+    response = client.post("/backtest/portfolio/walk-forward", json={**payload, "window": 90, "step": 30})
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "Calculated 3 Walk-Forward Portfolio Backtests"
+    assert walk_forward.call_args.kwargs["window"] == 90
+    assert walk_forward.call_args.kwargs["step"] == 30
+    assert client.post("/backtest/portfolio/walk-forward", json={**payload, "window": 1}).status_code == 422
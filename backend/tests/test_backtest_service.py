@@ -1,8 +1,18 @@
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch
 from datetime import datetime
-from app.services.backtest_service import fetch_data, calculate_portfolio_backtest
+from app.services.backtest_service import (
+    fetch_data,
+    calculate_portfolio_backtest,
+    calculate_portfolio_sweep,
+    calculate_portfolio_walk_forward,
+    get_rebalance_mask,
+    simulate_portfolio,
+    simulate_windows,
+)
+from fastapi import HTTPException
 
 
 @pytest.fixture
@@ -18,13 +28,12 @@ def mock_binance_ohlcv():
     ]
 
 
-@patch("app.services.backtest_service.exchange.fetch_ohlcv")
-def test_fetch_data(mock_fetch_ohlcv, mock_binance_ohlcv):
+def test_fetch_data(mock_exchange, mock_binance_ohlcv):
     """
     fetch_data가 정상적으로 데이터를 가져오고 날짜 필터링이 작동하는지 테스트합니다.
     (2024-01-01 ~ 2024-02-28 범위 내 데이터 반환)
     """
-    mock_fetch_ohlcv.return_value = mock_binance_ohlcv
+    mock_exchange.fetch_ohlcv.return_value = mock_binance_ohlcv
 
     result = fetch_data(["BTC/USDT"], "1M", "2024-01-01", "2024-02-28")
 
@@ -181,3 +190,189 @@ def test_calculate_portfolio_backtest_long_period(mock_fetch_data):
     assert float(result["cagr"].strip("%")) == pytest.approx(
         expected_cagr * 100, rel=1e-2
     )
+
+
+# ---------------------------------------------------------------------------------
+# 벡터화 엔진 검증
+# ---------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("weights", [[0.5, 0.3, 0.2], [0.5, 0.3, 0.21], [0.4, 0.3, 0.2]])
+def test_simulate_portfolio_matches_daily_loop(weights):
+    """
+    벡터화된 simulate_portfolio 가 하루씩 자산 가치를 갱신하는 기존 방식과 같은 결과를 내는지 테스트합니다.
+    비중 합이 1 이 아닌 경우와, 여러 조합을 한 번에 계산하는 (자산 × 조합) 비중 행렬도 확인합니다.
+    """
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.001, 0.03, size=(200, 3))
+    weights = np.array(weights)
+    rebalance_mask = np.zeros(200, dtype=bool)
+    rebalance_mask[::7] = True
+    cost = 0.0015
+
+    asset_values = 10000 * weights
+    expected = [10000.0]
+    for i in range(1, 200):
+        asset_values = asset_values * (1 + returns[i])
+        if rebalance_mask[i]:
+            asset_values = asset_values.sum() * weights * (1 - cost)
+        expected.append(asset_values.sum())
+
+    values = simulate_portfolio(returns, weights, rebalance_mask, cost, 10000)
+
+    np.testing.assert_allclose(values, expected, rtol=1e-10)
+
+    matrix = np.column_stack([weights, [0.5, 0.3, 0.2]])
+    combined = simulate_portfolio(returns, matrix, rebalance_mask, np.array([cost, cost]), 10000)
+    np.testing.assert_allclose(combined[:, 0], expected, rtol=1e-10)
+
+
+@patch("app.services.backtest_service.fetch_data")
+def test_portfolio_sweep_matches_single_backtests(mock_fetch_data):
+    """
+    스윕 결과가 같은 조합을 하나씩 백테스트한 결과와 같고, 상위 조합의 히스토리를 돌려주는지 테스트합니다.
+    """
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2023-01-01", "2024-06-30", freq="D")
+    mock_fetch_data.return_value = {
+        symbol: pd.DataFrame(
+            {"close": 100 * np.cumprod(1 + rng.normal(0.001, 0.03, len(dates)))},
+            index=dates,
+        )
+        for symbol in ["BTC/USDT", "ETH/USDT"]
+    }
+    combinations = [
+        {"weights": {"BTC/USDT": w, "ETH/USDT": 1 - w}, "rebalance_period": period,
+         "rebalance": rebalance, "fee_rate": fee, "slippage": 0.0005}
+        for w in (0.2, 0.5, 1.0)
+        for period in ("D", "W", "ME")
+        for rebalance in (True, False)
+        for fee in (0.0, 0.001)
+    ]
+    combinations.append(
+        {"weights": {"BTC/USDT": 1.0}, "rebalance_period": "YE",
+         "rebalance": True, "fee_rate": 0.001, "slippage": 0.0}
+    )
+
+    sweep = calculate_portfolio_sweep(10000, "2023-01-01", "2024-06-30", combinations, top_n=3)
+    # 같은 주기의 데이터는 한 번만 불러옵니다 (D, W, ME/YE)
+    assert mock_fetch_data.call_count == 3
+
+    for combination, result in zip(combinations, sweep["results"]):
+        single = calculate_portfolio_backtest(
+            symbols=list(combination["weights"]),
+            weights=combination["weights"],
+            initial_balance=10000,
+            start_date="2023-01-01",
+            end_date="2024-06-30",
+            rebalance_period=combination["rebalance_period"],
+            rebalance=combination["rebalance"],
+            fee_rate=combination["fee_rate"],
+            slippage=combination["slippage"],
+        )
+        assert result["final_balance"] == pytest.approx(single["final_balance"])
+        assert result["roi"] == single["roi"]
+        assert result["mdd"] == pytest.approx(single["mdd"])
+        assert result["cagr"] == single["cagr"]
+        assert result["standard_deviation"] == pytest.approx(single["standard_deviation"])
+
+    balances = [r["final_balance"] for r in sweep["results"]]
+    assert [t["index"] for t in sweep["top"]] == sorted(
+        range(len(balances)), key=lambda i: -balances[i]
+    )[:3]
+
+
+@pytest.mark.parametrize(
+    "rebalance_period, rebalance, window, step",
+    [("D", False, 40, 9), ("D", True, 40, 9), ("W", True, 10, 3), ("ME", True, 4, 1)],
+)
+@patch("app.services.backtest_service.fetch_data")
+def test_walk_forward_matches_single_backtests(
+    mock_fetch_data, rebalance_period, rebalance, window, step
+):
+    """
+    walk-forward 의 창별 결과가 그 창을 하나씩 백테스트한 결과와 같고, 데이터는 한 번만 불러오는지 테스트합니다.
+    """
+    rng = np.random.default_rng(11)
+    dates = pd.date_range("2023-01-01", "2023-12-31", freq="D")
+    mock_fetch_data.return_value = {
+        symbol: pd.DataFrame(
+            {"close": 100 * np.cumprod(1 + rng.normal(0.001, 0.03, len(dates)))},
+            index=dates,
+        )
+        for symbol in ["BTC/USDT", "ETH/USDT"]
+    }
+    params = dict(
+        symbols=["BTC/USDT", "ETH/USDT"],
+        weights={"BTC/USDT": 0.6, "ETH/USDT": 0.4},
+        initial_balance=10000,
+        rebalance_period=rebalance_period,
+        rebalance=rebalance,
+        fee_rate=0.001,
+        slippage=0.0005,
+    )
+
+    result = calculate_portfolio_walk_forward(
+        **params, start_date="2023-01-01", end_date="2023-12-31", window=window, step=step
+    )
+    assert mock_fetch_data.call_count == 1
+    assert result["count"] == len(result["windows"]) > 0
+
+    # 일봉 격자에서는 창 구간만 따로 백테스트한 결과와 같아야 합니다
+    if rebalance_period == "D":
+        for row in result["windows"]:
+            single = calculate_portfolio_backtest(
+                **params, start_date=row["start_date"], end_date=row["end_date"]
+            )
+            assert row["final_balance"] == pytest.approx(single["final_balance"])
+            assert row["roi"] == single["roi"]
+            assert row["mdd"] == pytest.approx(single["mdd"])
+            assert row["cagr"] == single["cagr"]
+            assert row["standard_deviation"] == pytest.approx(single["standard_deviation"])
+
+    rois = [float(w["roi"].rstrip("%")) for w in result["windows"]]
+    distribution = result["distribution"]["roi"]
+    assert distribution["min"] <= distribution["median"] <= distribution["max"]
+    assert distribution["mean"] == pytest.approx(np.mean(rois), abs=0.01)
+    assert result["positive_roi_ratio"] == pytest.approx(np.mean(np.array(rois) > 0), abs=0.01)
+
+
+@patch("app.services.backtest_service.fetch_data")
+def test_walk_forward_rejects_window_longer_than_range(mock_fetch_data):
+    """
+    창이 전체 기간보다 길면 400 오류를 반환하는지 테스트합니다.
+    """
+    dates = pd.date_range("2024-01-01", "2024-01-10", freq="D")
+    mock_fetch_data.return_value = {
+        "BTC/USDT": pd.DataFrame({"close": np.linspace(100, 110, len(dates))}, index=dates)
+    }
+
+    with pytest.raises(HTTPException) as error:
+        calculate_portfolio_walk_forward(
+            ["BTC/USDT"], {"BTC/USDT": 1.0}, 10000, "2024-01-01", "2024-01-10",
+            rebalance_period="D", window=11,
+        )
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("weights", [[0.5, 0.3, 0.2], [0.5, 0.3, 0.21]])
+@pytest.mark.parametrize("rebalance", [True, False])
+def test_simulate_windows_matches_each_window(rebalance, weights):
+    """
+    공유 수익률 행렬로 한 번에 계산한 창별 가치 경로가 창 구간만 잘라 simulate_portfolio 로 계산한 경로와 같은지 테스트합니다.
+    비중 합이 1 이 아닌 경우도 확인합니다.
+    """
+    rng = np.random.default_rng(5)
+    returns = rng.normal(0.001, 0.03, (400, 3))
+    weights = np.array(weights)
+    mask = get_rebalance_mask(pd.date_range("2023-01-01", periods=400), "W", rebalance)
+    starts = np.arange(0, 351, 7)
+
+    values = simulate_windows(returns, weights, mask, 0.0015, 1000, starts, 50)
+
+    assert values.shape == (50, len(starts))
+    for k, start in enumerate(starts):
+        expected = simulate_portfolio(
+            returns[start : start + 50], weights, mask[start : start + 50], 0.0015, 1000
+        )
+        np.testing.assert_allclose(values[:, k], expected, rtol=1e-10)
@@ -0,0 +1,43 @@
+from benchmarks.run import compare
+from benchmarks.synthetic import synthetic_ohlcv
+
+DAY = 24 * 60 * 60 * 1000
+JAN_1 = 1704067200000  # 2024-01-01
+
+
+def test_synthetic_ohlcv_is_deterministic_across_pages():
+    """
+    합성 캔들이 페이지를 나누는 방식과 상관없이 같은 시각에 같은 값을 가지는지 테스트합니다.
+    """
+    whole = synthetic_ohlcv("BTC/USDT", "1d", JAN_1, 10)
+    pages = [synthetic_ohlcv("BTC/USDT", "1d", JAN_1 + i * DAY, 5) for i in (0, 5)]
+
+    assert (whole[:5] == pages[0]).all()
+    assert (whole[5:] == pages[1]).all()
+    assert (whole[:, 2] >= whole[:, [1, 4]].max(axis=1)).all()
+    assert (whole[:, 3] <= whole[:, [1, 4]].min(axis=1)).all()
+    assert not (whole == synthetic_ohlcv("ETH/USDT", "1d", JAN_1, 10)).all()
+
+
+def test_compare_reports_regressions_over_threshold():
+    """
+    기준값 대비 threshold 를 넘게 느려지거나 메모리를 더 쓴 항목만 회귀로 보고하는지 테스트합니다.
+    """
+    baseline = {
+        "results": {
+            "a": {"wall_seconds": 1.0, "peak_memory_bytes": 100},
+            "b": {"wall_seconds": 1.0, "peak_memory_bytes": 100},
+        }
+    }
+    current = {
+        "results": {
+            "a": {"wall_seconds": 1.2, "peak_memory_bytes": 200},
+            "b": {"wall_seconds": 1.5, "peak_memory_bytes": 90},
+            "new": {"wall_seconds": 9.0, "peak_memory_bytes": 900},
+        }
+    }
+
+    assert compare(baseline, current, threshold=0.25) == [
+        "a peak_memory_bytes: 2.00x of baseline",
+        "b wall_seconds: 1.50x of baseline",
+    ]
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+import pytest
+import redis
+
+from app.core.cache import LocalLRUCache, ResultCache, make_cache_key
+from app.schemas.portfolio_request import BacktestRequest
+
+
+class UnreachableRedis:
+    def get(self, key):
+        raise redis.ConnectionError("Connection refused")
+
+    def set(self, key, value, ex=None):
+        raise redis.ConnectionError("Connection refused")
+
+
+@pytest.fixture
+def backtest_request():
+    return BacktestRequest(
+        assets={"BTC/USDT": 0.5, "ETH/USDT": 0.5},
+        initial_balance=10000,
+        start_date="2024-01-01",
+        end_date="2024-12-31",
+        rebalance_period="ME",
+        rebalance=True,
+        fee_rate=0.001,
+        slippage=0.0005,
+    )
+
+
+def test_cache_key_ignores_field_order(backtest_request):
+    """
+    같은 요청이면 자산 순서와 상관없이 같은 캐시 키가 만들어지는지 테스트합니다.
+    """
+    reordered = backtest_request.model_copy(
+        update={"assets": {"ETH/USDT": 0.5, "BTC/USDT": 0.5}}
+    )
+
+    assert make_cache_key("portfolio", backtest_request) == make_cache_key(
+        "portfolio", reordered
+    )
+    assert make_cache_key("portfolio", backtest_request) != make_cache_key(
+        "portfolio", backtest_request.model_copy(update={"fee_rate": 0.002})
+    )
+
+
+def test_get_or_compute_uses_redis(fake_redis, backtest_request):
+    """
+    두 번째 요청부터는 계산 없이 Redis 에 저장된 결과를 반환하는지 테스트합니다.
+    """
+    cache = ResultCache(client=fake_redis)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"final_balance": 12345.67}
+
+    first = asyncio.run(cache.get_or_compute("portfolio", backtest_request, compute))
+    second = asyncio.run(cache.get_or_compute("portfolio", backtest_request, compute))
+
+    assert first == second == {"final_balance": 12345.67}
+    assert len(calls) == 1
+    key = make_cache_key("portfolio", backtest_request)
+    assert 0 < fake_redis.ttl(key) <= 3600
+
+
+def test_falls_back_to_local_cache_when_redis_is_down(backtest_request):
+    """
+    Redis 에 연결할 수 없으면 프로세스 내 LRU 캐시로 동작하는지 테스트합니다.
+    """
+    cache = ResultCache(client=UnreachableRedis())
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"roi": "10.00%"}
+
+    asyncio.run(cache.get_or_compute("portfolio", backtest_request, compute))
+    result = asyncio.run(cache.get_or_compute("portfolio", backtest_request, compute))
+
+    assert result == {"roi": "10.00%"}
+    assert len(calls) == 1
+
+
+def test_get_or_compute_keeps_redis_off_the_event_loop(fake_redis, backtest_request):
+    """
+    비동기 경로의 Redis 조회/저장이 이벤트 루프 스레드가 아닌 스레드에서 실행되는지 테스트합니다.
+    """
+    threads = []
+    get, set_ = fake_redis.get, fake_redis.set
+
+    def record(fn):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    fake_redis.get, fake_redis.set = record(get), record(set_)
+    cache = ResultCache(client=fake_redis)
+
+    async def compute():
+        return {"roi": "10.00%"}
+
+    async def run():
+        await cache.get_or_compute("portfolio", backtest_request, compute)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+def test_local_cache_evicts_by_size():
+    """
+    로컬 LRU 캐시가 전체 바이트 크기를 넘으면 가장 오래 쓰지 않은 항목부터 제거하는지 테스트합니다.
+    """
+    cache = LocalLRUCache(max_bytes=10)
+    cache.set("a", b"1234", ttl=60)
+    cache.set("b", b"1234", ttl=60)
+    cache.get("a")
+    cache.set("c", b"1234", ttl=60)
+
+    assert cache.get("a") == b"1234"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"1234"
+
+    cache.set("big", b"x" * 11, ttl=60)
+    assert cache.get("big") is None
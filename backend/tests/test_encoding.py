@@ -0,0 +1,179 @@
+import json
+
+import msgpack
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import encoding
+from app.core.encoding import (
+    ARROW_MEDIA_TYPE,
+    COLUMNAR_JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    encode,
+    negotiate,
+)
+from app.core.executor import Staged
+from app.core.streaming import NDJSON_MEDIA_TYPE
+from app.main import app
+
+client = TestClient(app)
+
+JAN_1 = 1704067200000  # 2024-01-01
+DAY = 86_400_000
+
+SUMMARY = {"initial_balance": 10000, "final_balance": 15000.0, "roi": "50.00%"}
+HISTORY = pd.Series(
+    [10000.0, 10500.0, 11000.0, 12000.0, 15000.0],
+    index=pd.date_range("2024-01-01", periods=5, freq="D"),
+)
+PAYLOAD = {
+    "assets": {"BTC/USDT": 1.0},
+    "initial_balance": 10000,
+    "start_date": "2024-01-01",
+    "end_date": "2024-01-05",
+    "rebalance_period": "D",
+    "rebalance": "true",
+    "fee_rate": 0.001,
+    "slippage": 0.0005,
+}
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("application/json", None),
+        ("*/*", None),
+        ("application/x-ndjson", NDJSON_MEDIA_TYPE),
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        (f"application/json;q=0.5, {COLUMNAR_JSON_MEDIA_TYPE}", COLUMNAR_JSON_MEDIA_TYPE),
+        (f"{MSGPACK_MEDIA_TYPE};q=0.2, application/json;q=0.9", None),
+        (f"text/html, {MSGPACK_MEDIA_TYPE};q=0", None),
+        ("text/html, application/x-msgpack", MSGPACK_MEDIA_TYPE),
+    ],
+)
+def test_negotiate(accept, expected):
+    """
+    Accept 헤더의 q 값과 순서에 따라 응답 형식을 고르고, 기본 JSON 을 고르면 None 을 반환하는지 테스트합니다.
+    """
+    assert negotiate(accept) == expected
+
+
+def test_columnar_json_and_msgpack_round_trip():
+    """
+    열 형식 JSON 과 MessagePack 이 같은 구조로 epoch ms 와 값 배열을 담는지 테스트합니다.
+    """
+    expected_t = [JAN_1 + i * DAY for i in range(5)]
+
+    body = json.loads(encode(COLUMNAR_JSON_MEDIA_TYPE, "done", SUMMARY, {"history": HISTORY}))
+    assert body["success"] is True
+    assert body["message"] == "done"
+    assert body["data"]["roi"] == "50.00%"
+    assert body["data"]["history"] == {"t": expected_t, "v": HISTORY.tolist()}
+
+    packed = msgpack.unpackb(encode(MSGPACK_MEDIA_TYPE, "done", SUMMARY, {"history": HISTORY}))
+    history = packed["data"]["history"]
+    assert packed["data"]["final_balance"] == 15000.0
+    assert np.frombuffer(history["t"], "<i8").tolist() == expected_t
+    assert np.frombuffer(history["v"], "<f8").tolist() == HISTORY.tolist()
+
+
+def test_columnar_json_fallback_matches_orjson(monkeypatch):
+    """
+    orjson 이 없을 때의 표준 json 인코딩이 orjson 과 같은 바이트를 내는지 (NaN/inf 는 null) 테스트합니다.
+    아주 작은 수는 지수 표기만 다르므로 값이 같은지만 확인합니다.
+    """
+    pytest.importorskip("orjson")
+    summary = {**SUMMARY, "sharpe": np.float64("nan"), "trades": np.int64(3), "note": "리밸런싱"}
+    series = {"history": HISTORY.where(HISTORY < 12000, np.inf), "returns": HISTORY.pct_change()}
+    tiny = {"history": HISTORY * 1e-12}
+
+    fast = encode(COLUMNAR_JSON_MEDIA_TYPE, "완료", summary, series)
+    fast_tiny = encode(COLUMNAR_JSON_MEDIA_TYPE, "완료", {}, tiny)
+    monkeypatch.setattr(encoding, "orjson", None)
+    fallback = encode(COLUMNAR_JSON_MEDIA_TYPE, "완료", summary, series)
+
+    assert fallback == fast
+    body = json.loads(fallback)
+    assert body["data"]["sharpe"] is None
+    assert body["data"]["history"]["v"][-1] is None
+    assert json.loads(encode(COLUMNAR_JSON_MEDIA_TYPE, "완료", {}, tiny)) == json.loads(fast_tiny)
+
+
+def test_arrow_stream_round_trip():
+    """
+    Arrow IPC 스트림에 시계열이 (series, t, v) 행으로, 요약 지표가 메타데이터로 담기는지 테스트합니다.
+    """
+    pa = pytest.importorskip("pyarrow")
+    returns = HISTORY.pct_change().dropna()
+
+    raw = encode(ARROW_MEDIA_TYPE, "done", SUMMARY, {"history": HISTORY, "returns": returns})
+    table = pa.ipc.open_stream(raw).read_all()
+
+    assert json.loads(table.schema.metadata[b"summary"]) == SUMMARY
+    rows = table.to_pandas()
+    assert rows["series"].tolist() == ["history"] * 5 + ["returns"] * 4
+    assert rows["v"].tolist()[:5] == HISTORY.tolist()
+
+
+def test_portfolio_endpoint_negotiates_and_caches_encoded_body(mocker):
+    """
+    백테스트 엔드포인트가 Accept 에 맞는 형식으로 응답하고, 형식별로 인코딩된 본문을 캐시하는지 테스트합니다.
+    """
+    run = mocker.Mock(return_value=(SUMMARY, HISTORY))
+    mocker.patch(
+        "app.controllers.portfolio_controller.run_backtest", Staged(lambda **_: None, run)
+    )
+
+    for _ in range(2):
+        response = client.post(
+            "/backtest/portfolio", json=PAYLOAD, headers={"Accept": COLUMNAR_JSON_MEDIA_TYPE}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == COLUMNAR_JSON_MEDIA_TYPE
+        assert response.headers["vary"] == "Accept"
+        history = response.json()["data"]["portfolio_value_history"]
+        assert history["t"][0] == JAN_1
+        assert history["v"][-1] == 15000.0
+    assert run.call_count == 1
+
+    response = client.post(
+        "/backtest/portfolio", json=PAYLOAD, headers={"Accept": "application/msgpack"}
+    )
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    body = msgpack.unpackb(response.content)
+    assert np.frombuffer(body["data"]["portfolio_value_history"]["v"], "<f8")[-1] == 15000.0
+    assert run.call_count == 2
+
+
+def test_probability_endpoint_columnar(mocker):
+    """
+    확률 엔드포인트의 daily_returns 와 value_history 가 열 형식으로 바뀌는지 테스트합니다.
+    """
+    returns = HISTORY.pct_change().dropna()
+    run = mocker.Mock(return_value=({"probability": 0.4}, returns, HISTORY))
+    mocker.patch(
+        "app.controllers.probability_controller.run_probability", Staged(lambda **_: None, run)
+    )
+
+    response = client.post(
+        "/backtest/probability",
+        json={
+            "symbol": "BTC/USDT",
+            "timeframe": "1d",
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-05",
+            "initial_balance": 10000,
+            "target_return": 10,
+        },
+        headers={"Accept": COLUMNAR_JSON_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["probability"] == 0.4
+    assert data["daily_returns"]["t"][0] == JAN_1 + DAY
+    assert len(data["daily_returns"]["v"]) == 4
+    assert data["value_history"]["t"] == [JAN_1 + i * DAY for i in range(5)]
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.cancellation import check_cancelled, report_progress
+from app.core.config import settings
+from app.core.executor import Staged, TaskExecutor
+
+
+def reject(detail):
+    raise HTTPException(status_code=400, detail=detail)
+
+
+def test_run_cpu_uses_process_pool(monkeypatch):
+    """
+    계산 작업이 별도 프로세스에서 실행되고, 워커에서 발생한 HTTPException 이 그대로 전달되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "EXECUTOR_PROCESS_WORKERS", 1)
+    executor = TaskExecutor()
+
+    async def run():
+        pid = await executor.run_cpu(os.getpid)
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run_cpu(reject, "Invalid symbol")
+        return pid, exc_info.value
+
+    try:
+        pid, error = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert pid != os.getpid()
+    assert error.status_code == 400
+    assert error.detail == "Invalid symbol"
+
+
+def load_pid(**_):
+    return os.getpid()
+
+
+def pair_with_pid(loaded, tag):
+    return loaded, tag, os.getpid()
+
+
+def test_staged_loads_in_main_process(monkeypatch):
+    """
+    Staged 의 load 는 메인 프로세스에서, compute 만 워커 프로세스에서 실행되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "EXECUTOR_PROCESS_WORKERS", 1)
+    executor = TaskExecutor()
+
+    try:
+        loaded, tag, pid = asyncio.run(
+            executor.run_cpu(Staged(load_pid, pair_with_pid), "btc")
+        )
+    finally:
+        executor.shutdown()
+
+    assert loaded == os.getpid()
+    assert tag == "btc"
+    assert pid != os.getpid()
+
+
+def test_rejects_when_queue_is_full(monkeypatch):
+    """
+    대기 중인 작업이 EXECUTOR_MAX_PENDING 에 도달하면 503 으로 바로 거절하는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "EXECUTOR_MAX_PENDING", 2)
+    executor = TaskExecutor()
+    release = threading.Event()
+
+    async def run():
+        blocked = [
+            asyncio.ensure_future(executor.run_io(release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run_io(release.wait)
+        release.set()
+        await asyncio.gather(*blocked)
+        return exc_info.value
+
+    try:
+        error = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert error.status_code == 503
+
+
+def spin_until_cancelled(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        check_cancelled()
+        time.sleep(0.01)
+    return "finished"
+
+
+@pytest.mark.parametrize("process_workers", [0, 1])
+def test_cancelled_task_stops_worker(monkeypatch, process_workers):
+    """
+    기다리던 요청이 취소되면 스레드/프로세스 워커의 계산도 멈춰 작업 칸이 바로 반납되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "EXECUTOR_PROCESS_WORKERS", process_workers)
+    executor = TaskExecutor()
+
+    async def run():
+        # 프로세스 풀을 미리 띄워 둬 spawn 시간이 타임아웃에 포함되지 않도록 합니다
+        await executor.run_cpu(os.getpid)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run_cpu(spin_until_cancelled, 30), 0.3)
+
+        started = time.monotonic()
+        while executor._pending:
+            assert time.monotonic() - started < 5
+            await asyncio.sleep(0.05)
+        return await executor.run_cpu(spin_until_cancelled, 0)
+
+    try:
+        assert asyncio.run(run()) == "finished"
+    finally:
+        executor.shutdown()
+
+
+def report_half_then_wait():
+    report_progress(0.5)
+    time.sleep(0.3)
+    return "finished"
+
+
+def test_run_cpu_with_progress_reads_worker_progress(monkeypatch):
+    """
+    프로세스 워커가 report_progress() 로 기록한 진행률이 on_progress 콜백으로 전달되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "EXECUTOR_PROCESS_WORKERS", 1)
+    monkeypatch.setattr(settings, "JOB_PROGRESS_POLL_SECONDS", 0.02)
+    executor = TaskExecutor()
+    reported = []
+
+    try:
+        result = asyncio.run(
+            executor.run_cpu_with_progress(reported.append, report_half_then_wait)
+        )
+    finally:
+        executor.shutdown()
+
+    assert result == "finished"
+    assert reported == [0.5]
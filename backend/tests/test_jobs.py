@@ -0,0 +1,209 @@
+import json
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.cancellation import report_progress
+from app.core.config import settings
+from app.core.jobs import job_manager
+from app.main import app
+from app.schemas.monte_carlo_request import BacktestMonteCarloRequest
+
+MONTE_CARLO_REQUEST = {
+    "symbol": "BTC/USDT",
+    "timeframe": "1d",
+    "start_date": "2024-01-01",
+    "end_date": "2024-12-31",
+    "target_return": 0.1,
+    "days": 30,
+    "simulations": 1000,
+}
+
+
+@pytest.fixture
+def client(mock_exchange, monkeypatch):
+    """
+    한 이벤트 루프에서 백그라운드 작업이 계속 돌도록 lifespan 을 포함한 TestClient 를 사용합니다.
+    """
+    monkeypatch.setattr(settings, "JOB_PROGRESS_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "JOB_PROGRESS_SAVE_SECONDS", 0.02)
+    monkeypatch.setattr(job_manager, "_semaphore", None)
+    with TestClient(app) as client:
+        yield client
+
+
+def wait_for_job(client, job_id, predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}").json()["data"]
+        if predicate(job):
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.02)
+
+
+def test_job_reports_progress_and_deduplicates(client, mocker):
+    """
+    작업이 백그라운드에서 실행되며 진행률을 보고하고, 같은 요청은 같은 작업으로 합쳐지는지 테스트합니다.
+    완료된 결과는 동기 엔드포인트의 캐시로도 사용되어야 합니다.
+    """
+    release = threading.Event()
+    calls = []
+
+    def fake_monte_carlo(**kwargs):
+        calls.append(kwargs)
+        report_progress(0.5)
+        release.wait(5)
+        return {"symbol": kwargs["symbol"], "predicted_price": 123.0}
+
+    mocker.patch(
+        "app.controllers.jobs_controller.calculate_monte_carlo", fake_monte_carlo
+    )
+
+    first = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST)
+    second = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST)
+
+    assert first.status_code == second.status_code == 202
+    job_id = first.json()["data"]["id"]
+    assert second.json()["data"]["id"] == job_id
+
+    running = wait_for_job(client, job_id, lambda job: job["progress"] == 0.5)
+    assert running["status"] == "running"
+    assert client.get(f"/jobs/{job_id}/result").status_code == 202
+
+    release.set()
+    wait_for_job(client, job_id, lambda job: job["status"] == "done")
+
+    result = client.get(f"/jobs/{job_id}/result")
+    assert result.status_code == 200
+    assert result.json()["data"] == {"symbol": "BTC/USDT", "predicted_price": 123.0}
+    assert len(calls) == 1
+
+    cached = client.post("/backtest/monte-carlo", json=MONTE_CARLO_REQUEST)
+    assert cached.json()["data"]["predicted_price"] == 123.0
+
+
+def test_failed_job_returns_error_and_can_be_resubmitted(client, mocker):
+    """
+    실패한 작업은 결과 조회 시 원래 오류를 돌려주고, 다시 제출하면 새로 실행되는지 테스트합니다.
+    """
+    body = mocker.patch(
+        "app.controllers.jobs_controller.calculate_monte_carlo",
+        side_effect=HTTPException(status_code=400, detail="Error fetching BTC/USDT"),
+    )
+
+    job_id = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST).json()[
+        "data"
+    ]["id"]
+    wait_for_job(client, job_id, lambda job: job["status"] == "failed")
+
+    result = client.get(f"/jobs/{job_id}/result")
+    assert result.status_code == 400
+    assert result.json()["detail"] == "Error fetching BTC/USDT"
+
+    body.side_effect = None
+    body.return_value = {"predicted_price": 1.0}
+    client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST)
+    wait_for_job(client, job_id, lambda job: job["status"] == "done")
+    assert body.call_count == 2
+
+
+def test_job_fails_when_result_is_too_large(client, mocker, monkeypatch):
+    """
+    결과가 JOB_RESULT_MAX_BYTES 를 넘어 저장되지 않으면 완료 대신 413 으로 실패 처리되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "JOB_RESULT_MAX_BYTES", 100)
+    mocker.patch(
+        "app.controllers.jobs_controller.calculate_monte_carlo",
+        return_value={"paths": [1.0] * 100},
+    )
+
+    job_id = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST).json()[
+        "data"
+    ]["id"]
+    job = wait_for_job(client, job_id, lambda job: job["status"] in ("done", "failed"))
+    assert job["status"] == "failed"
+
+    result = client.get(f"/jobs/{job_id}/result")
+    assert result.status_code == 413
+    assert "too large" in result.json()["detail"]
+
+
+def orphan_job(job_id, status):
+    job = {
+        "id": job_id,
+        "type": "monte-carlo",
+        "status": status,
+        "progress": 0.3,
+        "error": None,
+        "owner": "dead-host:1234",
+        "created_at": time.time() - 600,
+        "updated_at": time.time() - 600,
+    }
+    job_manager.cache.set_raw(job_manager._job_key(job_id), json.dumps(job).encode("utf-8"))
+
+
+def test_job_left_by_dead_worker_is_resubmitted(client, mocker):
+    """
+    죽은 워커가 running 으로 남긴 작업은 lease 가 만료되면 다시 제출할 때 새로 실행되고,
+    lease 를 갱신 중인 다른 워커의 작업은 그대로 돌려주는지 테스트합니다.
+    """
+    body = mocker.patch(
+        "app.controllers.jobs_controller.calculate_monte_carlo",
+        return_value={"predicted_price": 1.0},
+    )
+    job_id = job_manager.job_id("monte-carlo", BacktestMonteCarloRequest(**MONTE_CARLO_REQUEST))
+
+    orphan_job(job_id, "running")
+    job_manager.cache.set_raw(job_manager._owner_key(job_id), b"live-host:1", ttl=30)
+    response = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST)
+    assert response.json()["data"]["owner"] == "dead-host:1234"
+    assert body.call_count == 0
+
+    job_manager.cache.delete_raw(job_manager._owner_key(job_id))
+    response = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST)
+    assert response.json()["data"]["owner"] == job_manager.owner()
+    wait_for_job(client, job_id, lambda job: job["status"] == "done")
+    assert body.call_count == 1
+    assert job_manager.cache.get_raw(job_manager._owner_key(job_id)) is None
+
+
+def test_progress_saves_are_throttled(client, mocker, monkeypatch, fake_redis):
+    """
+    진행률이 자주 바뀌어도 작업 레코드는 JOB_PROGRESS_SAVE_SECONDS 간격으로만 기록되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "JOB_PROGRESS_POLL_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "JOB_PROGRESS_SAVE_SECONDS", 0.2)
+    writes = []
+    set_ = fake_redis.set
+
+    def record(key, value, **kwargs):
+        if ":job:" in key:
+            writes.append(json.loads(value)["status"])
+        return set_(key, value, **kwargs)
+
+    fake_redis.set = record
+
+    def fake_monte_carlo(**kwargs):
+        for step in range(100):
+            report_progress(step / 100)
+            time.sleep(0.005)
+        return {"predicted_price": 1.0}
+
+    mocker.patch("app.controllers.jobs_controller.calculate_monte_carlo", fake_monte_carlo)
+
+    job_id = client.post("/jobs/backtest/monte-carlo", json=MONTE_CARLO_REQUEST).json()[
+        "data"
+    ]["id"]
+    wait_for_job(client, job_id, lambda job: job["status"] == "done")
+
+    assert writes[0] == "queued"
+    assert writes[-1] == "done"
+    assert len(writes) <= 2 + 0.5 / 0.2 + 2
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get("/jobs/does-not-exist").status_code == 404
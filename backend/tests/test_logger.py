@@ -0,0 +1,125 @@
+import logging
+import queue
+import socket
+import threading
+import time
+import msgpack
+
+from app.core.log_handlers import (
+    BatchingFluentHandler,
+    DroppingQueueHandler,
+    LogListener,
+)
+
+
+class StubCollector:
+    """
+    Fluent Forward 메시지를 받아 (tag, entries) 목록으로 모으는 로컬 수집기.
+    """
+
+    def __init__(self):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.messages = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self.server.accept()
+        unpacker = msgpack.Unpacker()
+        while chunk := conn.recv(65536):
+            unpacker.feed(chunk)
+            self.messages.extend(unpacker)
+
+    def close(self):
+        self.server.close()
+
+
+def make_record(message):
+    return logging.LogRecord("app_logger", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_fluent_handler_sends_batches_to_collector():
+    """
+    로그가 batch_size 단위의 Forward 메시지로 묶여 수집기에 전달되는지 테스트합니다.
+    """
+    collector = StubCollector()
+    handler = BatchingFluentHandler(
+        "test.tag", "127.0.0.1", collector.port, batch_size=5, flush_interval=60
+    )
+    try:
+        for i in range(12):
+            handler.handle(make_record(f"message {i}"))
+        handler.flush()
+
+        deadline = time.monotonic() + 2
+        while sum(len(m[1]) for m in collector.messages) < 12:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        handler.close()
+        collector.close()
+
+    assert [len(entries) for _, entries in collector.messages] == [5, 5, 2]
+    assert collector.messages[0][0] == "test.tag"
+    assert collector.messages[2][1][-1][1]["message"] == "message 11"
+    assert handler.dropped == 0
+
+
+def test_fluent_handler_drops_when_collector_is_missing():
+    """
+    수집기가 없으면 예외 없이 배치를 버리고, 재시도 대기 중에는 연결을 시도하지 않는지 테스트합니다.
+    """
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    server.close()
+
+    handler = BatchingFluentHandler(
+        "test.tag", "127.0.0.1", port, batch_size=2, flush_interval=60, retry_interval=60
+    )
+    try:
+        for i in range(6):
+            handler.handle(make_record(f"message {i}"))
+        handler.flush()
+
+        # 첫 배치 전송에 실패하면 나머지는 재시도 대기 동안 버퍼에 남음
+        assert handler.dropped == 2
+    finally:
+        handler.close()
+
+    assert handler.dropped == 6
+
+
+def test_logging_does_not_wait_for_slow_handlers():
+    """
+    기록 스레드가 멈춰 있어도 로그 호출은 바로 반환되고, 큐를 넘는 로그는 버려지는지 테스트합니다.
+    """
+
+    class BlockedHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.unblock = threading.Event()
+
+        def emit(self, record):
+            self.unblock.wait()
+
+    blocked = BlockedHandler()
+    log_queue = queue.Queue(maxsize=10)
+    queue_handler = DroppingQueueHandler(log_queue)
+    listener = LogListener(log_queue, blocked)
+    test_logger = logging.getLogger("test_slow_logger")
+    test_logger.propagate = False
+    test_logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        started = time.monotonic()
+        for i in range(1000):
+            test_logger.warning(f"message {i}")
+        elapsed = time.monotonic() - started
+    finally:
+        blocked.unblock.set()
+        listener.stop()
+        test_logger.removeHandler(queue_handler)
+
+    assert elapsed < 0.5
+    # 리스너가 꺼낸 1개 + 큐 10개를 제외하면 버려짐
+    assert 1000 - 11 <= queue_handler.dropped <= 1000 - 10
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import ccxt
+import numpy as np
+
+from app.services.market_data_service import (
+    PAGE_LIMIT,
+    load_ohlcv,
+    load_ohlcv_many,
+    startup,
+)
+
+DAY = 24 * 60 * 60 * 1000
+JAN_1 = 1704067200000  # 2024-01-01
+
+
+def make_candles(start, count):
+    return [[start + i * DAY, 100 + i, 101 + i, 99 + i, 100 + i, 10] for i in range(count)]
+
+
+def test_load_ohlcv_serves_repeat_requests_from_store(mock_exchange):
+    """
+    같은 구간을 다시 요청하면 거래소를 호출하지 않고 저장소에서 읽어오는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1, 10)
+
+    first = load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-10")
+    second = load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-10")
+
+    assert mock_exchange.fetch_ohlcv.call_count == 1
+    assert len(first) == len(second) == 10
+    assert second["close"].iloc[-1] == 109
+
+
+def test_load_ohlcv_fetches_only_missing_tail(mock_exchange):
+    """
+    구간이 늘어나면 저장된 구간 이후만 거래소에서 가져와 이어 붙이는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1, 10)
+    load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-10")
+
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1 + 10 * DAY, 5)
+    df = load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-15")
+
+    since = mock_exchange.fetch_ohlcv.await_args.args[2]
+    assert JAN_1 + 9 * DAY < since <= JAN_1 + 10 * DAY
+    assert len(df) == 15
+    assert df.index.is_monotonic_increasing
+
+
+def test_load_ohlcv_keeps_timeframes_separate(mock_exchange):
+    """
+    1m 과 1M 처럼 대소문자만 다른 타임프레임이 서로 다른 파일에 저장되는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1, 3)
+    load_ohlcv("BTC/USDT", "1M", "2024-01-01", "2024-01-03")
+
+    mock_exchange.fetch_ohlcv.return_value = []
+    df = load_ohlcv("BTC/USDT", "1m", "2024-01-01", "2024-01-03")
+
+    assert df.empty
+
+
+def test_load_ohlcv_paginates_long_ranges(mock_exchange):
+    """
+    한 번에 받을 수 있는 캔들 수를 넘는 구간을 페이지로 나눠 빠짐없이 가져오는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.side_effect = (
+        lambda symbol, timeframe, since, limit: make_candles(since, limit)
+    )
+
+    df = load_ohlcv("BTC/USDT", "1d", "2017-01-01", "2024-01-01")
+
+    expected = (JAN_1 - 1483228800000) // DAY + 1  # 2017-01-01 ~ 2024-01-01
+    assert mock_exchange.fetch_ohlcv.call_count == -(-expected // PAGE_LIMIT)
+    assert len(df) == expected
+    assert df.index.is_unique
+
+
+def test_load_ohlcv_many_fetches_symbols_concurrently(mock_exchange):
+    """
+    여러 심볼을 동시에 가져와, 전체 시간이 심볼별 지연의 합이 아닌 최댓값 수준인지 테스트합니다.
+    심볼별 오류는 예외 객체로 반환되어야 합니다.
+    """
+
+    async def fetch_ohlcv(symbol, timeframe, since, limit):
+        await asyncio.sleep(0.2)
+        if symbol == "BAD/USDT":
+            raise ccxt.BadSymbol("binance does not have market symbol BAD/USDT")
+        return make_candles(JAN_1, 10)
+
+    mock_exchange.fetch_ohlcv = fetch_ohlcv
+    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "BAD/USDT"]
+
+    started = time.monotonic()
+    results = load_ohlcv_many(symbols, "1d", "2024-01-01", "2024-01-10")
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.6
+    assert list(results) == symbols
+    assert len(results["ETH/USDT"]) == 10
+    assert isinstance(results["BAD/USDT"], ccxt.BadSymbol)
+
+
+def test_load_ohlcv_coalesces_identical_requests(mock_exchange):
+    """
+    같은 심볼/구간에 대한 동시 요청이 거래소 호출 한 번으로 합쳐지는지 테스트합니다.
+    """
+
+    async def fetch_ohlcv(symbol, timeframe, since, limit):
+        await asyncio.sleep(0.1)
+        return make_candles(JAN_1, 10)
+
+    mock_exchange.fetch_ohlcv = AsyncMock(side_effect=fetch_ohlcv)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        frames = list(
+            pool.map(
+                lambda _: load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-10"),
+                range(20),
+            )
+        )
+
+    assert mock_exchange.fetch_ohlcv.await_count == 1
+    assert all(len(df) == 10 for df in frames)
+
+
+def test_load_ohlcv_resamples_coarser_timeframe_from_store(mock_exchange):
+    """
+    일봉이 저장된 구간의 월봉/주봉 요청은 거래소를 호출하지 않고 일봉을 합쳐 만드는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.side_effect = (
+        lambda symbol, timeframe, since, limit: make_candles(since, 91)
+    )
+    load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-03-31")
+    assert mock_exchange.fetch_ohlcv.call_count == 1
+
+    monthly = load_ohlcv("BTC/USDT", "1M", "2024-01-01", "2024-03-31")
+    weekly = load_ohlcv("BTC/USDT", "1w", "2024-01-01", "2024-03-31")
+
+    assert mock_exchange.fetch_ohlcv.call_count == 1
+    assert list(monthly.index.strftime("%Y-%m-%d")) == [
+        "2024-01-01",
+        "2024-02-01",
+        "2024-03-01",
+    ]
+    # 2월: 1월 31일 이후 31번째 ~ 59번째 일봉
+    assert monthly["open"].iloc[1] == 131
+    assert monthly["high"].iloc[1] == 160
+    assert monthly["low"].iloc[1] == 130
+    assert monthly["close"].iloc[1] == 159
+    assert monthly["volume"].iloc[1] == 290
+    # 2024-01-01 은 월요일이므로 주봉 13개가 모두 7일치
+    assert len(weekly) == 13
+    assert (weekly["volume"] == 70).all()
+
+
+def test_load_ohlcv_fetches_when_finer_series_does_not_cover(mock_exchange):
+    """
+    저장된 일봉이 요청 구간을 다 덮지 못하면 월봉을 거래소에서 가져오는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1, 20)
+    load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-20")
+
+    mock_exchange.fetch_ohlcv.return_value = [[JAN_1, 1, 2, 0.5, 1.5, 100]]
+    monthly = load_ohlcv("BTC/USDT", "1M", "2024-01-01", "2024-01-31")
+
+    assert mock_exchange.fetch_ohlcv.call_count == 2
+    assert mock_exchange.fetch_ohlcv.await_args.args[1] == "1M"
+    assert monthly["volume"].iloc[0] == 100
+
+
+def test_concurrent_merges_keep_all_candles(isolated_candle_store):
+    """
+    여러 워커가 같은 심볼을 동시에 병합해도 서로 덮어써 캔들이 빠지지 않는지 테스트합니다.
+    """
+    chunks = [np.array(make_candles(i * 10 * DAY, 10), dtype=float) for i in range(8)]
+
+    def merge(chunk):
+        isolated_candle_store.merge("BTC/USDT", "1d", chunk)
+
+    for _ in range(5):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(merge, chunks))
+
+    rows = isolated_candle_store.load("BTC/USDT", "1d")
+    assert len(rows) == 80
+
+
+def test_startup_survives_unreachable_exchange_and_loads_markets_lazily(mock_exchange):
+    """
+    시작 시 거래소에 연결할 수 없어도 앱이 뜨고, 첫 캔들 조회 때 마켓 정보를 한 번만 불러오는지 테스트합니다.
+    """
+    mock_exchange.markets = None
+    mock_exchange.load_markets.side_effect = ccxt.NetworkError("binance unreachable")
+    asyncio.run(startup())
+    assert mock_exchange.load_markets.call_count == 1
+
+    def loaded():
+        mock_exchange.markets = {"BTC/USDT": {}, "ETH/USDT": {}}
+
+    mock_exchange.load_markets.side_effect = loaded
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1, 5)
+    result = load_ohlcv_many(["BTC/USDT", "ETH/USDT"], "1d", "2024-01-01", "2024-01-05")
+
+    assert all(len(df) == 5 for df in result.values())
+    assert mock_exchange.load_markets.call_count == 2
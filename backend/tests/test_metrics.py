@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, track_upstream
+from app.main import app
+from app.services.market_data_service import load_ohlcv
+
+client = TestClient(app)
+
+JAN_1 = 1704067200000  # 2024-01-01
+
+
+def test_render_histogram_and_counters(tmp_path):
+    """
+    히스토그램은 누적 버킷/합계/개수로, 카운터는 라벨별 값으로 Prometheus 형식에 맞게 출력되는지 테스트합니다.
+    """
+    registry = MetricsRegistry(str(tmp_path))
+    registry.observe("service_compute_seconds", 0.003, {"function": "f"})
+    registry.observe("service_compute_seconds", 0.2, {"function": "f"})
+    registry.inc("cache_requests_total", {"namespace": "portfolio", "result": "hit"})
+
+    text = registry.render()
+
+    assert 'service_compute_seconds_bucket{function="f",le="0.005"} 1' in text
+    assert 'service_compute_seconds_bucket{function="f",le="0.25"} 2' in text
+    assert 'service_compute_seconds_bucket{function="f",le="+Inf"} 2' in text
+    assert 'service_compute_seconds_count{function="f"} 2' in text
+    assert 'cache_requests_total{namespace="portfolio",result="hit"} 1' in text
+
+
+def test_collect_merges_other_processes(tmp_path):
+    """
+    다른 워커가 남긴 메트릭 파일을 합치되, 종료된 프로세스의 게이지는 제외하는지 테스트합니다.
+    """
+    registry = MetricsRegistry(str(tmp_path))
+    registry.inc("upstream_requests_total", {"service": "binance", "outcome": "ok"}, 2)
+    registry.add("http_requests_in_flight", {"method": "GET"})
+
+    dead_worker = {
+        "pid": 2**22 + 1,  # pid_max 를 넘는 값이라 존재하지 않는 프로세스
+        "counters": [
+            ["upstream_requests_total", {"service": "binance", "outcome": "ok"}, 3]
+        ],
+        "gauges": [["http_requests_in_flight", {"method": "GET"}, 5]],
+        "histograms": [],
+    }
+    with open(os.path.join(tmp_path, "dead.json"), "w", encoding="utf-8") as f:
+        json.dump(dead_worker, f)
+
+    counters, gauges, _ = registry.collect()
+
+    key = ("upstream_requests_total", (("outcome", "ok"), ("service", "binance")))
+    assert counters[key] == 5
+    assert gauges[("http_requests_in_flight", (("method", "GET"),))] == 1
+
+
+def test_metrics_endpoint_reports_routes_cache_and_upstream(mock_exchange):
+    """
+    요청 후 /metrics 에 라우트 템플릿별 지연 시간, 캐시 조회, 거래소 호출이 기록되는지 테스트합니다.
+    """
+    mock_exchange.fetch_ohlcv.return_value = [[JAN_1, 1, 1, 1, 1, 1]]
+    load_ohlcv("BTC/USDT", "1d", "2024-01-01", "2024-01-01")
+    with track_upstream("coingecko"):
+        pass
+
+    client.get("/check")
+    client.get("/does-not-exist")
+    text = client.get("/metrics").text
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/check",status="200"} 1'
+        in text
+    )
+    assert 'route="unmatched",status="404"' in text
+    assert 'upstream_requests_total{outcome="ok",service="binance"} 1' in text
+    assert 'upstream_requests_total{outcome="ok",service="coingecko"} 1' in text
+    assert 'candle_requests_total{source="upstream"} 1' in text
+    assert 'http_requests_in_flight{method="GET"} 1' in text
+
+
+def pid_files(directory):
+    return sorted(name for name in os.listdir(directory) if name[0].isdigit())
+
+
+def test_flush_follows_setting_and_close_archives_file(tmp_path, monkeypatch):
+    """
+    기록 위치를 기록할 때마다 현재 설정에서 읽고, 종료(close) 시 자기 파일을 지우되
+    카운터는 archive 에 남기는지 테스트합니다.
+    """
+    key = ("cache_requests_total", (("namespace", "portfolio"), ("result", "hit")))
+    registry = MetricsRegistry()
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path / "a"))
+    registry.inc("cache_requests_total", {"namespace": "portfolio", "result": "hit"})
+    registry.flush()
+    assert pid_files(tmp_path / "a") == [f"{os.getpid()}.json"]
+
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path / "b"))
+    registry.flush()
+    assert pid_files(tmp_path / "a") == []
+    assert pid_files(tmp_path / "b") == [f"{os.getpid()}.json"]
+
+    registry.close()
+    assert pid_files(tmp_path / "b") == []
+    assert MetricsRegistry(str(tmp_path / "b")).collect()[0][key] == 1
+
+
+def test_counters_do_not_decrease_when_a_worker_exits(tmp_path):
+    """
+    다른 프로세스가 기록 후 종료해도 합친 카운터/히스토그램이 줄지 않고 (카운터 리셋으로 보이지 않도록)
+    그 프로세스의 게이지만 빠지는지 테스트합니다.
+    """
+    code = (
+        "import sys\n"
+        "from app.core.metrics import metrics\n"
+        "metrics.inc('cache_requests_total', {'namespace': 'x', 'result': 'hit'}, 2)\n"
+        "metrics.observe('service_compute_seconds', 0.2, {'function': 'f'})\n"
+        "metrics.add('http_requests_in_flight', {'method': 'GET'})\n"
+        "metrics.flush()\n"
+        "print('flushed', flush=True)\n"
+        "sys.stdin.readline()\n"
+    )
+    env = {**os.environ, "METRICS_DIR": str(tmp_path)}
+    worker = subprocess.Popen(
+        [sys.executable, "-c", code],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert worker.stdout.readline().strip() == "flushed"
+
+    registry = MetricsRegistry(str(tmp_path))
+    registry.inc("cache_requests_total", {"namespace": "x", "result": "hit"})
+    counter = ("cache_requests_total", (("namespace", "x"), ("result", "hit")))
+    histogram = ("service_compute_seconds", (("function", "f"),))
+    gauge = ("http_requests_in_flight", (("method", "GET"),))
+
+    counters, gauges, histograms = registry.collect()
+    assert counters[counter] == 3
+    assert gauges[gauge] == 1
+
+    worker.communicate("\n", timeout=10)
+    assert worker.returncode == 0
+
+    after, gauges, after_histograms = registry.collect()
+    assert after[counter] == 3
+    assert after_histograms[histogram] == histograms[histogram]
+    assert gauge not in gauges
+    assert pid_files(tmp_path) == [f"{os.getpid()}.json"]
+
+
+def test_collect_ignores_gauges_of_stale_files(tmp_path):
+    """
+    pid 가 (재사용되어) 살아 있어도 오래 갱신되지 않은 파일의 게이지는 합치지 않는지 테스트합니다.
+    """
+    registry = MetricsRegistry(str(tmp_path))
+    crashed_worker = {
+        "pid": os.getppid(),
+        "counters": [],
+        "gauges": [["http_requests_in_flight", {"method": "GET"}, 5]],
+        "histograms": [],
+    }
+    path = os.path.join(tmp_path, f"{os.getppid()}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(crashed_worker, f)
+    old = time.time() - 10 * settings.METRICS_FLUSH_SECONDS
+    os.utime(path, (old, old))
+
+    _, gauges, _ = registry.collect()
+
+    assert ("http_requests_in_flight", (("method", "GET"),)) not in gauges
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.cancellation import TaskCancelled, check_cancelled
+from app.core.executor import executor
+from app.core.middleware.logging_middleware import LoggingMiddleware
+from app.core.middleware.timeout_middleware import TimeoutMiddleware
+
+
+def test_timeout_returns_408_and_stops_computation():
+    """
+    타임아웃 시 408 JSON 응답을 보내고, 실행 중이던 계산이 취소 지점에서 멈추는지 테스트합니다.
+    """
+    stopped = threading.Event()
+
+    def long_computation():
+        try:
+            for _ in range(3000):
+                check_cancelled()
+                time.sleep(0.01)
+        except TaskCancelled:
+            stopped.set()
+            raise
+
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        return await executor.run_cpu(long_computation)
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    app.add_middleware(TimeoutMiddleware, timeout=0.2)
+    app.add_middleware(LoggingMiddleware)
+    client = TestClient(app)
+
+    response = client.get("/slow")
+
+    assert response.status_code == 408
+    assert response.json() == {"detail": "Request Timeout: The request took too long."}
+    assert stopped.wait(2)
+    assert client.get("/fast").json() == {"ok": True}
@@ -0,0 +1,371 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from scipy.stats import norm, t
+
+from app.core.config import settings
+from app.schemas.monte_carlo_request import BacktestMonteCarloRequest
+from app.services.backtest_service import get_rebalance_mask, simulate_portfolio
+from app.services.monte_carlo_service import (
+    bootstrap_simulation,
+    calculate_monte_carlo,
+    calculate_portfolio_monte_carlo,
+    cholesky_factor,
+    monte_carlo_simulation,
+    portfolio_monte_carlo_simulation,
+)
+
+
+def test_monte_carlo_simulation_matches_expected_price(monkeypatch):
+    """
+    청크로 나눠 계산해도 평균 예측 가격이 이론값 S0 × (1 + μ)^days 에 수렴하는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "MONTE_CARLO_CHUNK_ELEMENTS", 30 * 1000)
+
+    result = monte_carlo_simulation(
+        initial_price=100,
+        daily_mean=0.001,
+        daily_std=0.02,
+        target_return=0.0,
+        days=30,
+        simulations=50_000,
+    )
+
+    expected = 100 * (1.001**30)
+    assert result["predicted_price"] == pytest.approx(expected, rel=0.01)
+    assert result["min_price"] < result["predicted_price"] < result["max_price"]
+    assert 50 < result["probability_above_target"] < 60
+
+
+def test_monte_carlo_request_limits():
+    """
+    시뮬레이션 횟수와 기간이 설정된 범위를 벗어나면 요청 검증에서 거부되는지 테스트합니다.
+    """
+    base = {"start_date": "2024-01-01", "end_date": "2024-12-31"}
+
+    assert BacktestMonteCarloRequest(**base, simulations=100_000).simulations == 100_000
+    with pytest.raises(ValidationError):
+        BacktestMonteCarloRequest(
+            **base, simulations=settings.MONTE_CARLO_MAX_SIMULATIONS + 1
+        )
+    with pytest.raises(ValidationError):
+        BacktestMonteCarloRequest(**base, days=0)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"antithetic": True},
+        {"control_variate": True},
+        {"sampling": "sobol"},
+        {"sampling": "sobol", "antithetic": True, "control_variate": True},
+    ],
+)
+def test_variance_reduction_shrinks_standard_error(monkeypatch, options):
+    """
+    분산 감소 기법을 쓰면 같은 경로 수에서 표준오차가 줄고, 신뢰구간이 이론값을 포함하는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "MONTE_CARLO_CHUNK_ELEMENTS", 365 * 1000)
+    params = dict(
+        initial_price=100,
+        daily_mean=0.001,
+        daily_std=0.03,
+        target_return=0.1,
+        days=365,
+        simulations=10_000,
+        seed=2024,
+    )
+
+    plain = monte_carlo_simulation(**params)
+    reduced = monte_carlo_simulation(**params, **options)
+
+    expected = 100 * (1.001**365)
+    assert reduced["predicted_price_se"] < plain["predicted_price_se"]
+    assert reduced["probability_above_target_se"] < plain["probability_above_target_se"]
+    # 신뢰구간은 표준오차 4배 (대략 99.99%) 여유를 두고 확인합니다
+    margin = 4 * reduced["predicted_price_se"] + 0.01
+    assert abs(reduced["predicted_price"] - expected) < margin
+    low, high = reduced["predicted_price_ci"]
+    assert low < reduced["predicted_price"] < high
+    assert reduced["confidence_level"] == 0.95
+
+
+def test_sobol_interval_uses_t_quantile_of_replicates(monkeypatch):
+    """
+    Sobol 반복 그룹으로 구한 표준오차에는 자유도 (그룹 수 - 1) 의 t 분위수를,
+    일반 표본에는 정규 분위수를 써서 신뢰구간을 만드는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "MONTE_CARLO_SOBOL_REPLICATES", 8)
+    params = dict(initial_price=10_000, daily_mean=0.001, daily_std=0.03, target_return=0.1, days=30, simulations=4_096)
+
+    def half_width_ratio(result):
+        low, high = result["predicted_price_ci"]
+        return (high - low) / 2 / result["predicted_price_se"]
+
+    sobol = monte_carlo_simulation(**params, sampling="sobol")
+    plain = monte_carlo_simulation(**params)
+
+    assert half_width_ratio(sobol) == pytest.approx(t.ppf(0.975, 7), rel=1e-3)
+    assert half_width_ratio(plain) == pytest.approx(norm.ppf(0.975), rel=1e-3)
+
+
+def test_interval_keeps_precision_when_standard_error_is_tiny(monkeypatch):
+    """
+    표준오차가 소수 둘째 자리보다 작아도 신뢰구간이 한 점으로 뭉개지지 않고 추정값을 포함하는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "MONTE_CARLO_SOBOL_REPLICATES", 8)
+    result = monte_carlo_simulation(
+        initial_price=100,
+        daily_mean=0.001,
+        daily_std=0.01,
+        target_return=0.0,
+        days=5,
+        simulations=4_096,
+        sampling="sobol",
+    )
+
+    low, high = result["predicted_price_ci"]
+    assert 0 < result["predicted_price_se"] < 0.005
+    assert low < high
+    # 추정값은 소수 둘째 자리로 반올림되므로 그만큼의 여유를 둡니다
+    assert low - 0.005 <= result["predicted_price"] <= high + 0.005
+    assert (high - low) / 2 == pytest.approx(t.ppf(0.975, 7) * result["predicted_price_se"], rel=0.2)
+
+
+def test_control_variate_matches_precision_with_fewer_paths():
+    """
+    대조 변수를 쓰면 1/5 경로 수로도 일반 표본보다 작은 표준오차를 얻는지 테스트합니다.
+    """
+    params = dict(initial_price=100, daily_mean=0.001, daily_std=0.03, target_return=0.1, days=365)
+
+    plain = monte_carlo_simulation(**params, simulations=20_000)
+    reduced = monte_carlo_simulation(**params, simulations=4_000, control_variate=True)
+
+    assert reduced["predicted_price_se"] < plain["predicted_price_se"]
+    assert reduced["probability_above_target_se"] < plain["probability_above_target_se"]
+
+
+def test_monte_carlo_request_sampling_options():
+    """
+    샘플링 방식과 신뢰 수준이 허용 범위를 벗어나면 요청 검증에서 거부되는지 테스트합니다.
+    """
+    base = {"start_date": "2024-01-01", "end_date": "2024-12-31"}
+
+    assert BacktestMonteCarloRequest(**base, sampling="sobol").sampling == "sobol"
+    with pytest.raises(ValidationError):
+        BacktestMonteCarloRequest(**base, sampling="halton")
+    with pytest.raises(ValidationError):
+        BacktestMonteCarloRequest(**base, confidence_level=1.0)
+
+
+def test_bootstrap_keeps_blocks_of_consecutive_returns():
+    """
+    부트스트랩이 연속된 수익률 블록을 그대로 이어 붙이는지 테스트합니다.
+    +10%/-10% 가 번갈아 나오면 길이 2 블록의 누적 수익은 항상 1.1 × 0.9 입니다.
+    """
+    returns = np.array([0.1, -0.1] * 50)
+
+    whole = bootstrap_simulation(100, returns, 0.0, days=4, simulations=2_000, block_size=2)
+    assert whole["min_price"] == whole["max_price"] == round(100 * 0.99**2, 2)
+    assert whole["predicted_price_se"] == pytest.approx(0, abs=1e-6)
+
+    # 블록으로 나누어떨어지지 않는 마지막 하루는 임의 위치에서 한 칸만 가져옵니다
+    partial = bootstrap_simulation(100, returns, 0.0, days=3, simulations=2_000, block_size=2)
+    assert partial["min_price"] == round(99 * 0.9, 2)
+    assert partial["max_price"] == round(99 * 1.1, 2)
+    assert 40 < partial["probability_above_target"] < 60
+
+
+def test_bootstrap_rejects_blocks_longer_than_history():
+    """
+    블록 길이가 수익률 이력보다 길면 400 오류를 내는지 테스트합니다.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        bootstrap_simulation(100, np.full(10, 0.01), 0.1, days=30, block_size=20)
+    assert exc_info.value.status_code == 400
+
+
+def test_calculate_monte_carlo_bootstrap_uses_candle_returns(mocker):
+    """
+    method=bootstrap 이면 가져온 캔들의 실제 수익률로 시뮬레이션하는지 테스트합니다.
+    """
+    mocker.patch(
+        "app.services.monte_carlo_service.calculate_monte_carlo_stats",
+        return_value={
+            "daily_mean": 0.0,
+            "daily_std": 0.1,
+            "current_price": 50.0,
+            "returns": np.full(30, 0.01),
+        },
+    )
+
+    result = calculate_monte_carlo(
+        "BTC/USDT", "1d", "2024-01-01", "2024-01-31",
+        target_return=0.1, days=10, simulations=100, method="bootstrap", block_size=3,
+    )
+
+    assert result["symbol"] == "BTC/USDT"
+    assert result["predicted_price"] == round(50 * 1.01**10, 2)
+    assert result["probability_above_target"] == 100.0
+
+
+def test_bootstrap_request_rejects_parametric_options():
+    """
+    부트스트랩에는 분산 감소 옵션을 함께 쓸 수 없는지 테스트합니다.
+    """
+    base = {"start_date": "2024-01-01", "end_date": "2024-12-31", "method": "bootstrap"}
+
+    assert BacktestMonteCarloRequest(**base, block_size=10).block_size == 10
+    with pytest.raises(ValidationError):
+        BacktestMonteCarloRequest(**base, antithetic=True)
+    with pytest.raises(ValidationError):
+        BacktestMonteCarloRequest(**base, block_size=0)
+
+
+def test_portfolio_monte_carlo_matches_backtest_rebalancing(monkeypatch):
+    """
+    공분산이 0 이면 모든 경로가 simulate_portfolio 로 계산한 리밸런싱 포트폴리오와 같은 가치가 되는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "MONTE_CARLO_CHUNK_ELEMENTS", 100 * 2 * 7)
+    days = 100
+    mean = np.array([0.01, -0.005])
+    weights = np.array([0.6, 0.4])
+    mask = get_rebalance_mask(pd.date_range("2024-01-31", periods=days + 1, freq="D"), "W", True)
+
+    result = portfolio_monte_carlo_simulation(
+        10_000, mean, np.zeros((2, 2)), weights, mask, 0.002, 0.1, days=days, simulations=20
+    )
+
+    returns = np.vstack([np.zeros(2), np.tile(mean, (days, 1))])
+    expected = simulate_portfolio(returns, weights, mask, 0.002, 10_000)[-1]
+    assert result["predicted_value"] == pytest.approx(expected, abs=0.01)
+    assert result["min_value"] == result["max_value"] == round(expected, 2)
+    assert result["rebalances"] == mask.sum() > 0
+
+
+def test_cholesky_factor_handles_singular_covariance():
+    """
+    완전히 상관된 자산이나 데이터가 없는 자산(분산 0)이 있어도 공분산을 재현하는 인수를 만드는지 테스트합니다.
+    """
+    cov = np.array([[4.0, 4.0, 0.0], [4.0, 4.0, 0.0], [0.0, 0.0, 0.0]]) * 1e-4
+
+    factor = cholesky_factor(cov)
+
+    assert np.allclose(factor @ factor.T, cov)
+
+
+def test_calculate_portfolio_monte_carlo_estimates_correlated_paths(mocker):
+    """
+    정렬된 일간 수익률 행렬에서 공분산을 추정해 상관계수를 보고하고,
+    음의 상관을 가진 자산을 섞으면 단일 자산보다 결과 분포가 좁아지는지 테스트합니다.
+    """
+    rng = np.random.default_rng(7)
+    base = rng.normal(0.001, 0.02, 1000)
+    returns = np.column_stack([base, -base + rng.normal(0, 0.002, 1000)])
+    load = mocker.patch(
+        "app.services.monte_carlo_service.load_returns",
+        return_value=(None, np.vstack([np.zeros(2), returns]), "D"),
+    )
+    params = dict(
+        initial_balance=10_000,
+        start_date="2021-01-01",
+        end_date="2024-01-01",
+        rebalance_period="ME",
+        days=180,
+        simulations=2_000,
+    )
+
+    hedged = calculate_portfolio_monte_carlo(
+        ["BTC/USDT", "ETH/USDT"], {"BTC/USDT": 0.5, "ETH/USDT": 0.5}, **params
+    )
+    single = calculate_portfolio_monte_carlo(
+        ["BTC/USDT", "ETH/USDT"], {"BTC/USDT": 1.0, "ETH/USDT": 0.0}, **params
+    )
+
+    load.assert_called_with(["BTC/USDT", "ETH/USDT"], "2021-01-01", "2024-01-01", "D")
+    assert hedged["correlation"][0][1] < -0.99
+    assert hedged["rebalances"] == 5  # 2월~6월 1일
+    spread = lambda r: r["percentiles"]["95"] - r["percentiles"]["5"]
+    assert spread(hedged) < spread(single) / 5
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"antithetic": True, "control_variate": True},
+        {"sampling": "sobol"},
+    ],
+)
+def test_seeded_simulation_is_reproducible(monkeypatch, options):
+    """
+    같은 seed 는 청크를 나눠 계산해도 같은 결과를, 다른 seed 는 다른 결과를 내는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "MONTE_CARLO_CHUNK_ELEMENTS", 30 * 300)
+    run = lambda seed: monte_carlo_simulation(
+        initial_price=100, daily_mean=0.001, daily_std=0.02, target_return=0.05,
+        days=30, simulations=2000, seed=seed, **options,
+    )
+
+    assert run(7) == run(7)
+    assert run(7) != run(8)
+
+
+def test_seeded_bootstrap_and_portfolio_are_reproducible():
+    """
+    부트스트랩과 포트폴리오 시뮬레이션도 seed 가 같으면 같은 결과를 내는지 테스트합니다.
+    """
+    returns = np.random.default_rng(0).normal(0.001, 0.02, 200)
+    bootstrap = lambda seed: bootstrap_simulation(
+        initial_price=100, returns=returns, target_return=0.05,
+        days=30, simulations=1000, block_size=5, seed=seed,
+    )
+    assert bootstrap(3) == bootstrap(3)
+    assert bootstrap(3) != bootstrap(4)
+
+    cov = np.array([[4e-4, 1e-4], [1e-4, 9e-4]])
+    portfolio = lambda seed: portfolio_monte_carlo_simulation(
+        initial_balance=10_000, mean=np.array([0.001, 0.002]), cov=cov,
+        weights=np.array([0.5, 0.5]), rebalance_mask=np.zeros(31, dtype=bool), cost=0.0,
+        target_return=0.1, days=30, simulations=1000, seed=seed,
+    )
+    assert portfolio(3) == portfolio(3)
+
+
+def test_calculate_monte_carlo_memoizes_seeded_results(mocker):
+    """
+    seed 가 있는 요청은 입력 통계와 옵션이 같으면 시뮬레이션을 다시 돌리지 않고,
+    seed 가 없거나 다르면 매번 시뮬레이션하는지 테스트합니다.
+    """
+    mocker.patch(
+        "app.services.monte_carlo_service.calculate_monte_carlo_stats",
+        return_value={
+            "daily_mean": 0.001,
+            "daily_std": 0.02,
+            "current_price": 100.0,
+            "returns": np.full(30, 0.01),
+        },
+    )
+    simulate = mocker.patch(
+        "app.services.monte_carlo_service.monte_carlo_simulation",
+        wraps=monte_carlo_simulation,
+    )
+    run = lambda symbol, **kwargs: calculate_monte_carlo(
+        symbol, "1d", "2024-01-01", "2024-12-31",
+        target_return=0.05, days=30, simulations=500, **kwargs,
+    )
+
+    first = run("BTC/USDT", seed=11)
+    again = run("BTC/USDT", seed=11)
+    other_symbol = run("ETH/USDT", seed=11)
+    assert simulate.call_count == 1
+    assert again == first
+    assert other_symbol == {**first, "symbol": "ETH/USDT"}
+
+    run("BTC/USDT", seed=12)
+    run("BTC/USDT", seed=11, antithetic=True)
+    run("BTC/USDT")
+    run("BTC/USDT")
+    assert simulate.call_count == 5
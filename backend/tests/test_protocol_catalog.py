@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.protocol_catalog import ProtocolCatalog
+from app.services.valuation_service import fetch_tvl
+
+PROTOCOLS = [
+    {"id": "1", "name": "Lido", "slug": "lido", "chain": "Ethereum", "tvl": 30.5, "gecko_id": "lido-dao"},
+    {"id": "2", "name": "Aave", "slug": "aave", "chain": "Ethereum", "tvl": 20.0, "gecko_id": "aave"},
+    {"id": "3", "name": "Mantle LSP", "slug": "mantle-lsp", "chain": "Mantle", "tvl": 5.0},
+]
+
+
+class LlamaStandIn:
+    """/protocols 만 흉내 내는 로컬 HTTP 서버. 받은 요청 수와 응답할 목록을 바꿀 수 있습니다."""
+
+    def __init__(self):
+        self.protocols = PROTOCOLS
+        self.requests = 0
+        self.status = 200
+        self.delay = 0.0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                body = json.dumps(stand_in.protocols).encode("utf-8")
+                self.send_response(stand_in.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/protocols"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def llama():
+    stand_in = LlamaStandIn()
+    yield stand_in
+    stand_in.close()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_lookup_by_chain_and_id_downloads_once(llama):
+    """
+    체인과 프로토콜 ID/slug 로 찾을 수 있고, 여러 번 조회해도 목록은 한 번만 받는지 테스트합니다.
+    """
+    catalog = ProtocolCatalog(llama.url, refresh_seconds=600, max_stale_seconds=3600)
+
+    assert catalog.by_chain("ethereum")["name"] == "Lido"  # 기존 순차 검색처럼 첫 항목
+    assert catalog.by_chain("MANTLE")["tvl"] == 5.0
+    assert catalog.by_chain("solana") is None
+    assert catalog.by_id("2")["slug"] == "aave"
+    assert catalog.by_id("mantle-lsp")["id"] == "3"
+    assert llama.requests == 1
+
+
+def test_stale_catalog_is_served_while_revalidating(llama):
+    """
+    갱신 주기가 지난 목록은 기다리지 않고 그대로 쓰고, 갱신은 뒤에서 진행되는지 테스트합니다.
+    """
+    catalog = ProtocolCatalog(llama.url, refresh_seconds=600, max_stale_seconds=3600)
+    catalog.refresh()
+    catalog._loaded_at -= 601
+    llama.protocols = [{**PROTOCOLS[0], "tvl": 99.0}]
+    llama.delay = 0.3
+
+    started = time.monotonic()
+    assert catalog.by_chain("ethereum")["tvl"] == 30.5
+    assert time.monotonic() - started < 0.2
+
+    wait_until(lambda: catalog.age < 600)
+    assert catalog.by_chain("ethereum")["tvl"] == 99.0
+    assert catalog.by_chain("mantle") is None
+    assert llama.requests == 2
+
+
+def test_expired_catalog_is_refreshed_inline_and_errors_surface(llama):
+    """
+    허용 기간을 넘긴 목록은 그 자리에서 다시 받고, 받지 못하면 DeFi Llama 오류(400)를 내는지 테스트합니다.
+    """
+    catalog = ProtocolCatalog(llama.url, refresh_seconds=600, max_stale_seconds=3600)
+    catalog.refresh()
+    catalog._loaded_at -= 3601
+    llama.status = 503
+
+    with pytest.raises(HTTPException) as exc_info:
+        catalog.by_chain("ethereum")
+
+    assert exc_info.value.status_code == 400
+    assert "DeFi Llama API error" in exc_info.value.detail
+    assert llama.requests == 2
+
+
+def test_background_refresh_loop(llama):
+    """
+    start() 로 띄운 스레드가 주기마다 목록을 다시 받는지 테스트합니다.
+    """
+    catalog = ProtocolCatalog(llama.url, refresh_seconds=0.05, max_stale_seconds=3600)
+    catalog.start()
+    try:
+        wait_until(lambda: llama.requests >= 3)
+    finally:
+        catalog.stop()
+    assert catalog.by_id("lido")["tvl"] == 30.5
+
+
+def test_fetch_tvl_uses_shared_catalog(llama, isolated_protocol_catalog):
+    """
+    가치평가의 TVL 조회가 공용 카탈로그를 쓰고 요청마다 목록을 받지 않는지 테스트합니다.
+    """
+    isolated_protocol_catalog.url = llama.url
+
+    assert fetch_tvl("mantle") == 5.0
+    assert fetch_tvl("ethereum") == 30.5
+    assert fetch_tvl("unknown") == 0
+    assert llama.requests == 1
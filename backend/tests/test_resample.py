@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from app.core.resample import bin_end, bin_starts, resample_ohlcv, resample_sources
+
+
+def to_millis(dates):
+    return (pd.to_datetime(dates).asi8 // 1_000_000).astype(np.int64)
+
+
+def test_bin_starts_follow_exchange_boundaries():
+    """
+    주봉은 월요일 00:00, 월봉은 매월 1일, 4시간봉은 00:00 UTC 기준으로 구간이 나뉘는지 테스트합니다.
+    """
+    timestamps = to_millis(["2024-01-03 05:00", "2024-02-29 23:59", "2024-03-10 13:30"])
+
+    assert list(bin_starts(timestamps, "1w")) == list(
+        to_millis(["2024-01-01", "2024-02-26", "2024-03-04"])
+    )
+    assert list(bin_starts(timestamps, "1M")) == list(
+        to_millis(["2024-01-01", "2024-02-01", "2024-03-01"])
+    )
+    assert list(bin_starts(timestamps, "4h")) == list(
+        to_millis(["2024-01-03 04:00", "2024-02-29 20:00", "2024-03-10 12:00"])
+    )
+    assert bin_end(to_millis(["2024-02-01"])[0], "1M") == to_millis(["2024-03-01"])[0]
+
+
+def test_resample_ohlcv_aggregates_each_bin():
+    """
+    시가/고가/저가/종가/거래량이 구간별로 첫 값/최댓값/최솟값/마지막 값/합계로 합쳐지는지 테스트합니다.
+    """
+    hours = to_millis(pd.date_range("2024-01-01", periods=8, freq="h"))
+    rows = np.column_stack(
+        [
+            hours,
+            np.arange(8) + 10,  # open
+            [12, 15, 11, 13, 20, 18, 17, 16],  # high
+            [9, 8, 10, 7, 15, 14, 12, 13],  # low
+            np.arange(8) + 11,  # close
+            np.ones(8),  # volume
+        ]
+    )
+
+    bars = resample_ohlcv(rows, "4h")
+
+    assert bars.tolist() == [
+        [hours[0], 10, 15, 7, 14, 4],
+        [hours[4], 14, 20, 12, 18, 4],
+    ]
+
+
+def test_resample_sources_only_include_aligned_timeframes():
+    """
+    구간 경계가 맞지 않는 조합 (주봉 → 월봉, 1시간봉 → 4시간봉 이상만) 을 제외하는지 테스트합니다.
+    """
+    assert resample_sources("1M") == ["1d", "4h", "1h", "15m", "5m", "1m"]
+    assert resample_sources("4h") == ["1h", "15m", "5m", "1m"]
+    assert resample_sources("1m") == []
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.return_index import ReturnSeries, return_index
+from app.services.monte_carlo_service import calculate_monte_carlo_stats
+from app.services.probability_service import run_probability
+
+DAY = 24 * 60 * 60 * 1000
+JAN_1 = 1704067200000  # 2024-01-01
+
+
+def make_candles(start, closes):
+    return np.array(
+        [[start + i * DAY, c, c * 1.01, c * 0.99, c, 10.0] for i, c in enumerate(closes)]
+    )
+
+
+def random_closes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0.001, 0.03, count))
+
+
+@pytest.fixture
+def index():
+    return_index.clear()
+    yield return_index
+    return_index.clear()
+
+
+def test_window_stats_match_pandas(index, isolated_candle_store):
+    """
+    임의의 구간에서 누적합으로 구한 평균/표준편차/누적 수익률이 pandas 로 다시 계산한 값과 같은지 테스트합니다.
+    """
+    closes = random_closes(2000)
+    isolated_candle_store.merge("BTC/USDT", "1d", make_candles(JAN_1, closes))
+    rng = np.random.default_rng(1)
+
+    for _ in range(20):
+        lo, hi = sorted(rng.choice(len(closes), 2, replace=False))
+        window = index.window("BTC/USDT", "1d", JAN_1 + lo * DAY, JAN_1 + hi * DAY)
+        expected = pd.Series(closes[lo : hi + 1]).pct_change().dropna()
+
+        assert window.candles == hi - lo + 1
+        assert window.mean() == pytest.approx(expected.mean(), rel=1e-9)
+        assert window.std() == pytest.approx(np.std(expected), rel=1e-9)
+        assert window.std(ddof=1) == pytest.approx(expected.std(), rel=1e-9)
+        assert window.total_return == pytest.approx(closes[hi] / closes[lo] - 1, rel=1e-9)
+        assert window.last_price == closes[hi]
+        np.testing.assert_allclose(window.returns, expected.to_numpy(), rtol=1e-12)
+
+
+def test_index_updates_only_after_store_changes(index, isolated_candle_store):
+    """
+    저장소가 그대로면 같은 누적합을 재사용하고, 캔들이 추가/갱신/앞쪽에 채워지면
+    처음부터 다시 만든 누적합과 같은 값으로 갱신되는지 테스트합니다.
+    """
+    closes = random_closes(300)
+    isolated_candle_store.merge("BTC/USDT", "1d", make_candles(JAN_1 + 100 * DAY, closes[100:250]))
+    first = index.series("BTC/USDT", "1d")
+    assert index.series("BTC/USDT", "1d") is first
+
+    # 진행 중이던 마지막 캔들 갱신 + 새 캔들 추가
+    updated = closes.copy()
+    updated[249] *= 1.05
+    isolated_candle_store.merge("BTC/USDT", "1d", make_candles(JAN_1 + 249 * DAY, updated[249:]))
+    appended = index.series("BTC/USDT", "1d")
+    assert appended is not first
+    np.testing.assert_array_equal(appended.sums[:149], first.sums[:149])
+
+    # 앞쪽 구간을 나중에 채운 경우
+    isolated_candle_store.merge("BTC/USDT", "1d", make_candles(JAN_1, updated[:100]))
+    backfilled = index.series("BTC/USDT", "1d")
+
+    rebuilt = ReturnSeries(JAN_1 + np.arange(300) * DAY, updated)
+    np.testing.assert_array_equal(backfilled.closes, updated)
+    for name in ("returns", "sums", "squares", "logs"):
+        np.testing.assert_allclose(getattr(backfilled, name), getattr(rebuilt, name), rtol=1e-12)
+
+
+def test_services_answer_repeat_ranges_from_index(index, mock_exchange, mocker):
+    """
+    확률/몬테카를로 통계가 기존 pandas 계산과 같고, 저장소가 구간을 덮으면
+    거래소도 저장소 파일도 읽지 않고 인덱스로 답하는지 테스트합니다.
+    """
+    closes = random_closes(60, seed=2)
+    mock_exchange.fetch_ohlcv.return_value = make_candles(JAN_1, closes).tolist()
+    summary, _, _ = run_probability("BTC/USDT", "1d", "2024-01-01", "2024-02-29", 10_000, 0.1)
+    assert mock_exchange.fetch_ohlcv.call_count == 1
+
+    load = mocker.patch("app.core.candle_store.CandleStore.load", side_effect=AssertionError)
+    summary, daily_returns, value_history = run_probability(
+        "BTC/USDT", "1d", "2024-01-11", "2024-01-31", 10_000, 0.1
+    )
+    stats = calculate_monte_carlo_stats("BTC/USDT", "1d", "2024-01-11", "2024-01-31")
+    assert mock_exchange.fetch_ohlcv.call_count == 1
+    assert load.call_count == 0
+
+    prices = pd.Series(closes[10:31])
+    returns = prices.pct_change().dropna()
+    assert summary["expected_return"] == pytest.approx(np.mean(returns) * 365, rel=1e-9)
+    assert summary["standard_deviation"] == pytest.approx(np.std(returns) * np.sqrt(365), rel=1e-9)
+    assert summary["total_return"] == pytest.approx(closes[30] / closes[10] - 1, rel=1e-9)
+    assert daily_returns.index[0] == pd.Timestamp("2024-01-12")
+    growth = np.cumprod(1 + returns.to_numpy()[1:])
+    np.testing.assert_allclose(value_history.to_numpy(), 10_000 * np.concatenate(([1.0], growth)))
+    assert value_history.index[-1] == pd.Timestamp("2024-01-30")
+
+    filled = prices.pct_change().fillna(0)
+    assert stats["daily_mean"] == pytest.approx(filled.mean(), rel=1e-9)
+    assert stats["daily_std"] == pytest.approx(filled.std(), rel=1e-9)
+    assert stats["current_price"] == closes[30]
+    np.testing.assert_allclose(stats["returns"], returns.to_numpy())
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+COINS = {
+    "mantle": {"market_cap": 2_000_000_000, "price": 0.8, "supply": 2_500_000_000, "volume": 100_000_000},
+    "ethereum": {"market_cap": 400_000_000_000, "price": 3000, "supply": 120_000_000, "volume": 20_000_000_000},
+    "solana": {"market_cap": 80_000_000_000, "price": 150, "supply": 450_000_000, "volume": 3_000_000_000},
+}
+PROTOCOLS = [
+    {"id": "1", "name": "Lido", "slug": "lido", "chain": "Ethereum", "tvl": 30.5},
+    {"id": "3", "name": "Mantle LSP", "slug": "mantle-lsp", "chain": "Mantle", "tvl": 5.0},
+]
+
+
+class UpstreamStandIn:
+    """CoinGecko /coins/{id} 와 DeFi Llama /protocols 를 흉내 내는 로컬 HTTP/1.1 서버.
+
+    동시에 처리 중인 요청 수의 최댓값과, 요청을 보낸 클라이언트 연결(포트) 수를 기록합니다.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = set()
+        self.coin_requests = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                with stand_in.lock:
+                    stand_in.connections.add(self.client_address)
+                    stand_in.active += 1
+                    stand_in.max_active = max(stand_in.max_active, stand_in.active)
+                try:
+                    time.sleep(stand_in.delay)
+                    self.respond()
+                finally:
+                    with stand_in.lock:
+                        stand_in.active -= 1
+
+            def respond(self):
+                status, payload = 404, {"error": "coin not found"}
+                if self.path == "/protocols":
+                    status, payload = 200, PROTOCOLS
+                elif self.path.startswith("/coins/"):
+                    with stand_in.lock:
+                        stand_in.coin_requests += 1
+                    coin = COINS.get(self.path.rsplit("/", 1)[1])
+                    if coin is not None:
+                        status, payload = 200, {
+                            "market_data": {
+                                "market_cap": {"usd": coin["market_cap"]},
+                                "current_price": {"usd": coin["price"]},
+                                "circulating_supply": coin["supply"],
+                                "total_volume": {"usd": coin["volume"]},
+                            }
+                        }
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def upstream(monkeypatch, isolated_protocol_catalog, mock_exchange):
+    stand_in = UpstreamStandIn()
+    monkeypatch.setattr(settings, "COINGECKO_API_URL", stand_in.url)
+    monkeypatch.setattr(isolated_protocol_catalog, "url", f"{stand_in.url}/protocols")
+    yield stand_in
+    stand_in.close()
+
+
+def test_valuation_reuses_pooled_connection(upstream):
+    """
+    여러 번 평가해도 공용 클라이언트가 CoinGecko 연결을 재사용하는지 테스트합니다.
+    """
+    with TestClient(app) as client:
+        for coin_id in ("mantle", "ethereum", "solana"):
+            response = client.post(f"/valuation/{coin_id}", json={"burn_daily": 10})
+            assert response.status_code == 200
+
+    data = response.json()["data"]
+    assert data["price"] == "$150.00"
+    assert data["tvl"] == "$0.00"
+    assert upstream.coin_requests == 3
+    # 카탈로그 다운로드 연결 1개 + CoinGecko 요청 3건이 함께 쓴 연결 1개
+    assert len(upstream.connections) == 2
+
+
+def test_upstream_calls_run_concurrently(upstream):
+    """
+    CoinGecko 호출과 DeFi Llama 카탈로그 조회가 순서대로가 아니라 동시에 진행되는지 테스트합니다.
+    """
+    upstream.delay = 0.3
+
+    with TestClient(app) as client:
+        started = time.monotonic()
+        response = client.post("/valuation/mantle", json={})
+        elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert response.json()["data"]["tvl"] == "$5.00"
+    assert upstream.max_active == 2
+    assert elapsed < 0.55
+
+
+def test_batch_valuation_bounds_fan_out_and_reports_failures(upstream, monkeypatch):
+    """
+    배치 평가가 요청 순서대로 결과를 돌려주고, 실패한 코인은 오류로 표시하며,
+    동시에 평가하는 코인 수를 설정값으로 제한하는지 테스트합니다.
+    """
+    monkeypatch.setattr(settings, "VALUATION_BATCH_CONCURRENCY", 2)
+    upstream.delay = 0.05
+    coins = ["mantle", "ethereum", "unknown-coin", "solana", "ethereum"]
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/valuation/batch",
+            json={"coins": [{"coin_id": c, "inflation": 1.5} for c in coins]},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert body["message"] == "valuation done for 4/5 coins"
+    assert [r["coin_id"] for r in body["data"]] == coins
+    assert [r["success"] for r in body["data"]] == [True, True, False, True, True]
+    assert body["data"][2]["error"]["status_code"] == 500
+    assert body["data"][1]["data"]["tvl"] == "$30.50"
+    # 카탈로그 다운로드 1건 + 동시에 평가 중인 코인 2개
+    assert upstream.max_active <= 3
+
+
+def test_batch_valuation_validates_size():
+    """
+    빈 배치와 최대 개수를 넘는 배치는 422 로 거절되는지 테스트합니다.
+    """
+    client = TestClient(app)
+    too_many = [{"coin_id": f"coin-{i}"} for i in range(settings.VALUATION_BATCH_MAX_COINS + 1)]
+
+    assert client.post("/valuation/batch", json={"coins": []}).status_code == 422
+    assert client.post("/valuation/batch", json={"coins": too_many}).status_code == 422